@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Кожна папка лабораторної - окремий набір скриптів, і назви модулів у різних папках збігаються
+# (rsa_core, crypto_utils, analysis...). Тести імпортують модулі своєї папки за простою назвою,
+# тому перед збиранням і запуском тестів папки з sys.modules прибираються однойменні модулі з інших папок.
+_folder_modules = {}
+
+# Скрипти ручної перевірки на сайті лабораторної (мережеві запити), а не тести pytest
+collect_ignore = [
+    'lab4/Vodianyk_fb-32_Krasnook_fb-32_cp4/lab4_test.py',
+    'lab4/pinkas_fb-32_drachuk_fb-32_cp4/test_site.py',
+]
+
+def _module_folder(module):
+    path = getattr(module, '__file__', None)
+    return os.path.dirname(os.path.abspath(path)) if path else None
+
+def _activate(folder):
+    names = {os.path.splitext(name)[0] for name in os.listdir(folder) if name.endswith('.py')}
+    for name in names:
+        module = sys.modules.get(name)
+        if module is not None and _module_folder(module) != folder:
+            del sys.modules[name]
+    sys.modules.update(_folder_modules.get(folder, {}))
+    if folder in sys.path:
+        sys.path.remove(folder)
+    sys.path.insert(0, folder)
+
+def _remember(folder):
+    _folder_modules[folder] = {name: module for name, module in list(sys.modules.items())
+                               if _module_folder(module) == folder}
+
+def pytest_collectstart(collector):
+    if collector.__class__.__name__ == 'Module':
+        _activate(str(collector.path.parent))
+
+def pytest_itemcollected(item):
+    _remember(str(item.path.parent))
+
+def pytest_runtest_setup(item):
+    _activate(str(item.path.parent))
@@ -0,0 +1,138 @@
+# corpus_stream.py
+import codecs
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+
+import ngram_engine
+
+CHUNK_SIZE = 1 << 22  # 4 МіБ сирих байтів за одне читання
+LETTERS = "абвгдежзийклмнопрстуфхцчшщъыьэюяё"
+FULL_ALPHABET = sorted(" " + LETTERS)
+
+_SPACES = re.compile(" {2,}")
+
+
+class _CleanTable(dict):
+    """Таблиця для str.translate: літера -> мала літера, решта -> пробіл (або видалення).
+
+    Заповнюється ліниво: кожен новий символ обробляється один раз, далі
+    str.translate бере значення прямо зі словника.
+    """
+
+    def __init__(self, keep_spaces: bool):
+        super().__init__()
+        self.filler = " " if keep_spaces else None
+
+    def __missing__(self, codepoint: int):
+        ch = chr(codepoint).lower()
+        value = ch if len(ch) == 1 and ch in LETTERS else self.filler
+        self[codepoint] = value
+        return value
+
+
+class TextNormalizer:
+    """Потокова версія TextStatistics._clean_text.
+
+    Між чанками зберігається, чи був уже виведений текст і чи треба вставити
+    пробіл перед наступним словом, тож результат збігається з очищенням
+    всього тексту одразу.
+    """
+
+    def __init__(self, keep_spaces: bool = True):
+        self.keep_spaces = keep_spaces
+        self.table = _CleanTable(keep_spaces)
+        self.started = False
+        self.pending_space = False
+
+    def feed(self, chunk: str) -> str:
+        text = chunk.translate(self.table)
+        if not self.keep_spaces:
+            return text
+        text = _SPACES.sub(" ", text)
+        core = text.strip(" ")
+        if not core:
+            self.pending_space = self.pending_space or bool(text)
+            return ""
+        prefix = " " if self.started and (self.pending_space or text[0] == " ") else ""
+        self.started = True
+        self.pending_space = text[-1] == " "
+        return prefix + core
+
+
+def normalize(text: str, keep_spaces: bool = True) -> str:
+    return TextNormalizer(keep_spaces).feed(text)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    """utf-8, якщо перший блок коректно декодується, інакше cp1251."""
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1251"
+
+
+def _iter_raw_chunks(path: str, chunk_size: int, use_mmap: bool):
+    with open(path, "rb") as f:
+        if not use_mmap:
+            yield from iter(lambda: f.read(chunk_size), b"")
+            return
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # порожній файл
+            return
+        with mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                yield mapped[offset:offset + chunk_size]
+
+
+def iter_text_chunks(path: str, encoding: str = "auto", chunk_size: int = CHUNK_SIZE, use_mmap: bool = False):
+    """Читає файл блоками по chunk_size байтів і інкрементно декодує їх."""
+    decoder = None
+    for raw in _iter_raw_chunks(path, chunk_size, use_mmap):
+        if decoder is None:
+            name = _detect_encoding(raw) if encoding == "auto" else encoding
+            decoder = codecs.getincrementaldecoder(name)()
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def iter_normalized_chunks(path: str, keep_spaces: bool = True, encoding: str = "auto",
+                           chunk_size: int = CHUNK_SIZE, use_mmap: bool = False):
+    normalizer = TextNormalizer(keep_spaces)
+    for text in iter_text_chunks(path, encoding, chunk_size, use_mmap):
+        cleaned = normalizer.feed(text)
+        if cleaned:
+            yield cleaned
+
+
+def count_file(path: str, keep_spaces: bool = True, max_order: int = 2, encoding: str = "auto",
+               chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> ngram_engine.NGramCounts:
+    """Рахує n-грами файлу з обмеженим обсягом пам'яті (незалежно від розміру корпусу)."""
+    alphabet = FULL_ALPHABET if keep_spaces else sorted(LETTERS)
+    counter = ngram_engine.NGramCounts(alphabet, max_order)
+    for cleaned in iter_normalized_chunks(path, keep_spaces, encoding, chunk_size, use_mmap):
+        counter.update(cleaned)
+    return counter
+
+
+def count_files(paths: list, keep_spaces: bool = True, max_order: int = 2, encoding: str = "auto",
+                chunk_size: int = CHUNK_SIZE, processes: int = None) -> ngram_engine.NGramCounts:
+    """Рахує кожен файл в окремому процесі й об'єднує результати в порядку paths.
+
+    Результат такий самий, як для склеєних файлів; щоб додати новий файл до
+    вже порахованого корпусу, достатньо corpus + count_file(new_path).
+    """
+    if not paths:
+        raise ValueError("Не задано жодного файлу!")
+    worker = partial(count_file, keep_spaces=keep_spaces, max_order=max_order,
+                     encoding=encoding, chunk_size=chunk_size)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return reduce(ngram_engine.NGramCounts.merge, executor.map(worker, paths))
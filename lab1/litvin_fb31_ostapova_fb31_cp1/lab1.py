@@ -1,11 +1,15 @@
 # lab1_final.py
-import re
 import math
 from collections import Counter
 import pandas as pd
 import os
 import random
 
+import numpy as np
+
+import corpus_stream
+import ngram_engine
+
 # ====================================================================================
 # ЧАСТИНА 1: Клас для автоматичного розрахунку H1 та H2
 # ====================================================================================
@@ -22,36 +26,81 @@ class TextStatistics:
         self.alphabet = sorted(list(set(self.text)))
         self.alphabet_size = len(self.alphabet)
 
+        # Текст кодується один раз, далі всі n-грами рахуються через np.bincount
+        self.codes = ngram_engine.encode(self.text, self.alphabet)
+        self.counter = None
+        self._set_counts(
+            ngram_engine.ngram_counts(self.codes, self.alphabet_size, 1),
+            ngram_engine.ngram_counts(self.codes, self.alphabet_size, 2, overlap=True),
+            ngram_engine.ngram_counts(self.codes, self.alphabet_size, 2, overlap=False),
+        )
+
+    @classmethod
+    def from_file(cls, path: str, keep_spaces: bool = True, encoding: str = "auto",
+                  chunk_size: int = corpus_stream.CHUNK_SIZE, use_mmap: bool = False,
+                  max_order: int = 2) -> "TextStatistics":
+        """Потоковий аналіз файлу чанками: пам'ять не залежить від розміру корпусу (self.text = None)."""
+        counter = corpus_stream.count_file(path, keep_spaces, max(2, max_order), encoding, chunk_size, use_mmap)
+        return cls.from_counter(counter, keep_spaces)
+
+    @classmethod
+    def from_files(cls, paths: list, keep_spaces: bool = True, encoding: str = "auto",
+                   processes: int = None, max_order: int = 2) -> "TextStatistics":
+        """Статистика корпусу з кількох файлів: кожен рахується в окремому процесі, кількості об'єднуються."""
+        counter = corpus_stream.count_files(paths, keep_spaces, max(2, max_order), encoding, processes=processes)
+        return cls.from_counter(counter, keep_spaces)
+
+    @classmethod
+    def from_counter(cls, counter: ngram_engine.NGramCounts, keep_spaces: bool = True) -> "TextStatistics":
+        # Алфавіт, як і для тексту, — лише символи, що реально зустрілися
+        observed = np.flatnonzero(counter.counts(1))
+        if not observed.size:
+            raise ValueError("Порожній текст!")
+
+        stats = cls.__new__(cls)
+        stats.text = None
+        stats.codes = None
+        stats.counter = counter
+        stats.keep_spaces = keep_spaces
+        stats.observed = observed
+        stats.alphabet = [counter.alphabet[i] for i in observed]
+        stats.alphabet_size = len(stats.alphabet)
+        stats._set_counts(
+            counter.counts(1)[observed],
+            counter.counts(2, overlap=True)[np.ix_(observed, observed)],
+            counter.counts(2, overlap=False)[np.ix_(observed, observed)],
+        )
+        return stats
+
+    def _set_counts(self, letter_counts, bigram_counts_overlap, bigram_counts_non_overlap):
+        self.letter_counts = letter_counts
+        self.bigram_counts_overlap = bigram_counts_overlap
+        self.bigram_counts_non_overlap = bigram_counts_non_overlap
+
         self.letter_freq = self._letter_frequencies()
         self.bigram_freq_overlap, self.bigram_freq_non_overlap = self._bigram_frequencies()
 
     @staticmethod
     def _clean_text(text: str, keep_spaces: bool) -> str:
-        text = text.lower()
-        text = re.sub(r'[^а-яё ]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        if not keep_spaces:
-            text = text.replace(" ", "")
-        return text.strip()
+        return corpus_stream.normalize(text, keep_spaces)
 
     def _letter_frequencies(self) -> dict:
-        counter = Counter(self.text)
-        total = len(self.text)
-        return {ch: counter[ch] / total for ch in self.alphabet}
+        return ngram_engine.counts_to_frequencies(self.letter_counts, self.alphabet, keep_zero=True)
 
     def _bigram_frequencies(self):
-        n = len(self.text)
-        overlap = Counter(self.text[i:i + 2] for i in range(n - 1) if len(self.text[i:i + 2]) == 2)
-        non_overlap = Counter(self.text[i:i + 2] for i in range(0, n - 1, 2) if len(self.text[i:i + 2]) == 2)
-
-        total_overlap = sum(overlap.values())
-        total_non_overlap = sum(non_overlap.values())
-
-        freq_overlap = {bg: overlap[bg] / total_overlap for bg in overlap}
-        freq_non_overlap = {bg: non_overlap[bg] / total_non_overlap for bg in non_overlap}
-
+        freq_overlap = ngram_engine.counts_to_frequencies(self.bigram_counts_overlap, self.alphabet)
+        freq_non_overlap = ngram_engine.counts_to_frequencies(self.bigram_counts_non_overlap, self.alphabet)
         return freq_overlap, freq_non_overlap
 
+    def ngram_frequencies(self, n: int, overlap: bool = True) -> dict:
+        if self.codes is not None:
+            counts = ngram_engine.ngram_counts(self.codes, self.alphabet_size, n, overlap)
+        elif n <= self.counter.max_order:
+            counts = self.counter.counts(n, overlap)[np.ix_(*[self.observed] * n)]
+        else:
+            raise ValueError(f"Під час потокового читання пораховано n-грами лише до порядку {self.counter.max_order}!")
+        return ngram_engine.counts_to_frequencies(counts, self.alphabet)
+
     @staticmethod
     def _entropy(freqs: dict, n_gram: int = 1) -> float:
         h = -sum(p * math.log2(p) for p in freqs.values() if p > 0)
@@ -78,13 +127,11 @@ class TextStatistics:
         return df
 
     def bigram_matrix(self, overlap: bool = True) -> pd.DataFrame:
-        freq = self.bigram_freq_overlap if overlap else self.bigram_freq_non_overlap
+        counts = self.bigram_counts_overlap if overlap else self.bigram_counts_non_overlap
         symbols = self.alphabet
-        matrix = pd.DataFrame(0.0, index=symbols, columns=symbols)
-        for bg, val in freq.items():
-            if len(bg) == 2:
-                matrix.at[bg[0], bg[1]] = round(val, 5)
-        return matrix
+        total = counts.sum()
+        values = (counts / total).round(5) if total else counts.astype(float)
+        return pd.DataFrame(values, index=symbols, columns=symbols)
 
 # ====================================================================================
 # ЧАСТИНА 2: Функції для інтерактивної оцінки H(n)
@@ -0,0 +1,173 @@
+# ngram_engine.py
+from functools import lru_cache
+
+import numpy as np
+
+# Код, яким позначаються символи поза алфавітом
+UNKNOWN_CODE = 255
+MAX_CODEPOINT = 0x110000
+# Межа сумарного розміру щільних масивів кількостей NGramCounts (int64, 128 МіБ):
+# для алфавіту з пробілом (34 символи) це порядки до 4 включно
+MAX_COUNT_ELEMENTS = 1 << 24
+
+
+def build_lookup(alphabet: list) -> np.ndarray:
+    """Таблиця codepoint -> код символу в алфавіті (UNKNOWN_CODE для решти)."""
+    if len(alphabet) >= UNKNOWN_CODE:
+        raise ValueError("Алфавіт занадто великий для кодування в uint8!")
+    lookup = np.full(MAX_CODEPOINT, UNKNOWN_CODE, dtype=np.uint8)
+    for code, ch in enumerate(alphabet):
+        lookup[ord(ch)] = code
+    return lookup
+
+
+@lru_cache(maxsize=8)
+def cached_lookup(alphabet: tuple) -> np.ndarray:
+    return build_lookup(list(alphabet))
+
+
+def encode(text: str, alphabet: list, lookup: np.ndarray = None) -> np.ndarray:
+    """Переводить очищений текст у масив кодів uint8 за один прохід."""
+    if lookup is None:
+        lookup = cached_lookup(tuple(alphabet))
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    codes = lookup[codepoints]
+    if codes.size and codes.max() == UNKNOWN_CODE:
+        bad = text[int(np.argmax(codes == UNKNOWN_CODE))]
+        raise ValueError(f"Символ {bad!r} відсутній в алфавіті!")
+    return codes
+
+
+def pack_ngrams(codes: np.ndarray, m: int, n: int, overlap: bool = True) -> np.ndarray:
+    """Пакує кожну n-граму в одне число c1*m^(n-1) + ... + cn."""
+    length = len(codes)
+    if length < n:
+        return np.zeros(0, dtype=np.int64)
+    if overlap:
+        count = length - n + 1
+        packed = codes[:count].astype(np.int64)
+        for j in range(1, n):
+            packed *= m
+            packed += codes[j:j + count]
+        return packed
+    windows = codes[:length - length % n].reshape(-1, n)
+    packed = windows[:, 0].astype(np.int64)
+    for j in range(1, n):
+        packed *= m
+        packed += windows[:, j]
+    return packed
+
+
+def ngram_counts(codes: np.ndarray, m: int, n: int = 1, overlap: bool = True) -> np.ndarray:
+    """Кількості n-грам у вигляді масиву форми (m,) * n (np.bincount по упакованих кодах)."""
+    packed = pack_ngrams(codes, m, n, overlap)
+    return np.bincount(packed, minlength=m ** n).reshape((m,) * n)
+
+
+def counts_to_frequencies(counts: np.ndarray, alphabet: list, keep_zero: bool = False) -> dict:
+    """Масив кількостей -> словник {n-грама: частота}, як у Counter-версії."""
+    total = int(counts.sum())
+    if total == 0:
+        return {}
+    flat = counts.ravel()
+    indices = range(flat.size) if keep_zero else np.flatnonzero(flat)
+    n, m = counts.ndim, len(alphabet)
+    result = {}
+    for index in indices:
+        index = int(index)
+        count = int(flat[index])
+        chars = []
+        for _ in range(n):
+            index, code = divmod(index, m)
+            chars.append(alphabet[code])
+        result["".join(reversed(chars))] = count / total
+    return result
+
+
+class NGramCounts:
+    """Кількості n-грам порядків 1..max_order, які можна накопичувати й об'єднувати.
+
+    Для кожного порядку n кількості зберігаються окремо за фазою (позиція
+    початку n-грами mod n): сума фаз дає n-грами з перетином, фаза 0 — без
+    перетину. Разом з першими (head) і останніми (tail) max_order-1 кодами
+    цього достатньо, щоб:
+      * подавати текст чанками (update) з точним підрахунком на межах;
+      * об'єднувати результати різних файлів/процесів (merge) так, ніби
+        тексти було склеєно, — операція асоціативна.
+    """
+
+    def __init__(self, alphabet: list, max_order: int = 2):
+        self.alphabet = list(alphabet)
+        self.m = len(self.alphabet)
+        if max_order < 1:
+            raise ValueError("Порядок n-грам має бути не менше 1!")
+        # Для кожного порядку n зберігається n * m^n лічильників, тож пам'ять росте експоненційно
+        elements = sum(n * self.m ** n for n in range(1, max_order + 1))
+        if elements > MAX_COUNT_ELEMENTS:
+            raise ValueError(f"Порядок {max_order} для алфавіту з {self.m} символів потребує {elements * 8 >> 20} МіБ "
+                             f"лічильників (межа {MAX_COUNT_ELEMENTS * 8 >> 20} МіБ)!")
+        self.max_order = max_order
+        self.length = 0
+        self.head = np.zeros(0, dtype=np.uint8)
+        self.tail = np.zeros(0, dtype=np.uint8)
+        self.phase_counts = {n: np.zeros((n, self.m ** n), dtype=np.int64) for n in range(1, max_order + 1)}
+
+    def _count_new_windows(self, buffer: np.ndarray, start: int, old_length: int, new_length: int,
+                           seam_only: bool = False):
+        """Додає n-грами buffer, що закінчуються після old_length (buffer[0] має глобальну позицію start).
+
+        При seam_only=True — лише ті, що починаються до old_length (перетинають межу).
+        """
+        for n, counts in self.phase_counts.items():
+            first = max(0, old_length - n + 1)
+            if first + n > new_length:
+                continue
+            packed = pack_ngrams(buffer[first - start:new_length - start], self.m, n, overlap=True)
+            if seam_only:
+                packed = packed[:old_length - first]
+            if n > 1:
+                packed += (np.arange(first, first + len(packed)) % n) * self.m ** n
+            counts += np.bincount(packed, minlength=n * self.m ** n).reshape(n, -1)
+
+    def update(self, text: str):
+        codes = encode(text, self.alphabet)
+        if not codes.size:
+            return
+        context = self.max_order - 1
+        buffer = np.concatenate((self.tail, codes))
+        old_length, new_length = self.length, self.length + len(codes)
+        self._count_new_windows(buffer, old_length - len(self.tail), old_length, new_length)
+
+        if len(self.head) < context:
+            self.head = np.concatenate((self.head, codes[:context - len(self.head)]))
+        self.length = new_length
+        self.tail = buffer[max(0, len(buffer) - context):]
+
+    def merge(self, other: "NGramCounts") -> "NGramCounts":
+        """Кількості для тексту self, за яким іде текст other."""
+        if self.alphabet != other.alphabet or self.max_order != other.max_order:
+            raise ValueError("Об'єднувати можна лише кількості з однаковим алфавітом і порядком!")
+        context = self.max_order - 1
+        merged = NGramCounts(self.alphabet, self.max_order)
+        merged.length = self.length + other.length
+        for n in merged.phase_counts:
+            # Фаза n-грами з other зсувається на довжину self
+            merged.phase_counts[n] = self.phase_counts[n] + np.roll(other.phase_counts[n], self.length % n, axis=0)
+
+        # n-грами, що перетинають межу між текстами
+        seam = np.concatenate((self.tail, other.head))
+        merged._count_new_windows(seam, self.length - len(self.tail), self.length, self.length + len(other.head),
+                                  seam_only=True)
+
+        merged.head = np.concatenate((self.head, other.head))[:context]
+        tail = np.concatenate((self.tail, other.tail))
+        merged.tail = tail[max(0, len(tail) - context):]
+        return merged
+
+    __add__ = merge
+
+    def counts(self, n: int, overlap: bool = True) -> np.ndarray:
+        """Кількості n-грам форми (m,) * n."""
+        phase_counts = self.phase_counts[n]
+        flat = phase_counts.sum(axis=0) if overlap else phase_counts[0]
+        return flat.reshape((self.m,) * n)
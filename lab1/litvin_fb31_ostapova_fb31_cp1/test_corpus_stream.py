@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+import corpus_stream
+from lab1 import TextStatistics
+
+RAW = "  Привет,  МИР!\nЁлка -- это   ёлка.\r\n\n Hello 42 ещё раз...  " * 50
+
+
+def chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("keep_spaces", [True, False])
+@pytest.mark.parametrize("size", [1, 2, 5, 64])
+def test_normalizer_in_chunks_matches_whole_text(keep_spaces, size):
+    normalizer = corpus_stream.TextNormalizer(keep_spaces)
+    streamed = "".join(normalizer.feed(chunk) for chunk in chunks(RAW, size))
+    assert streamed == corpus_stream.normalize(RAW, keep_spaces)
+
+
+def test_normalize_matches_regex_cleaning():
+    expected = re.sub(r" +", " ", re.sub(r"[^абвгдежзийклмнопрстуфхцчшщъыьэюяё]", " ", RAW.lower())).strip()
+    assert corpus_stream.normalize(RAW) == expected
+    assert corpus_stream.normalize(RAW, keep_spaces=False) == expected.replace(" ", "")
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1251"])
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("keep_spaces", [True, False])
+def test_count_file_matches_in_memory(tmp_path, encoding, use_mmap, keep_spaces):
+    path = tmp_path / "corpus.txt"
+    path.write_bytes(RAW.encode(encoding))
+    expected = TextStatistics(RAW, keep_spaces)
+    streamed = TextStatistics.from_file(str(path), keep_spaces, chunk_size=7, use_mmap=use_mmap)
+    assert streamed.alphabet == expected.alphabet
+    assert streamed.letter_freq == expected.letter_freq
+    assert streamed.bigram_freq_overlap == expected.bigram_freq_overlap
+    assert streamed.bigram_freq_non_overlap == expected.bigram_freq_non_overlap
+
+
+def test_from_file_rejects_unbounded_order(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text(RAW, encoding="utf-8")
+    assert TextStatistics.from_file(str(path), max_order=3).ngram_frequencies(3) == \
+        TextStatistics(RAW).ngram_frequencies(3)
+    with pytest.raises(ValueError):
+        TextStatistics.from_file(str(path), max_order=5)
+
+
+def test_count_files_matches_concatenated_corpus(tmp_path):
+    parts = [RAW[:100], RAW[100:101], "", RAW[101:]]
+    paths = []
+    for i, part in enumerate(parts):
+        path = tmp_path / f"part{i}.txt"
+        path.write_text(part, encoding="utf-8")
+        paths.append(str(path))
+    whole = tmp_path / "whole.txt"
+    whole.write_text("".join(parts), encoding="utf-8")
+
+    merged = corpus_stream.count_files(paths, keep_spaces=False, max_order=3, processes=2)
+    expected = corpus_stream.count_file(str(whole), keep_spaces=False, max_order=3)
+    for n in range(1, 4):
+        for overlap in (True, False):
+            assert (merged.counts(n, overlap) == expected.counts(n, overlap)).all()
+    with pytest.raises(ValueError):
+        corpus_stream.count_files([])
@@ -0,0 +1,127 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import ngram_engine
+from lab1 import TextStatistics
+
+ALPHABET = sorted(" абвгдеж")
+
+
+def random_text(length: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    return "".join(generator.choice(ALPHABET) for _ in range(length))
+
+
+def naive_counts(text: str, n: int, overlap: bool = True) -> Counter:
+    step = 1 if overlap else n
+    return Counter(text[i:i + n] for i in range(0, len(text) - n + 1, step))
+
+
+def as_counter(counts: np.ndarray) -> Counter:
+    return Counter({gram: round(freq * int(counts.sum()))
+                    for gram, freq in ngram_engine.counts_to_frequencies(counts, ALPHABET).items()})
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 1000])
+def test_update_in_chunks_matches_naive(chunk):
+    text = random_text(500)
+    counter = ngram_engine.NGramCounts(ALPHABET, max_order=4)
+    for start in range(0, len(text), chunk):
+        counter.update(text[start:start + chunk])
+    assert counter.length == len(text)
+    for n in range(1, 5):
+        for overlap in (True, False):
+            assert as_counter(counter.counts(n, overlap)) == naive_counts(text, n, overlap)
+
+
+def test_update_ignores_empty_chunks():
+    counter = ngram_engine.NGramCounts(ALPHABET, max_order=3)
+    for chunk in ["", "аб", "", "в", ""]:
+        counter.update(chunk)
+    assert as_counter(counter.counts(3)) == Counter({"абв": 1})
+
+
+def test_max_order_is_bounded():
+    ngram_engine.NGramCounts(sorted(" абвгдежзийклмнопрстуфхцчшщъыьэюяё"), max_order=4)
+    with pytest.raises(ValueError):
+        ngram_engine.NGramCounts(sorted(" абвгдежзийклмнопрстуфхцчшщъыьэюяё"), max_order=5)
+    with pytest.raises(ValueError):
+        ngram_engine.NGramCounts(ALPHABET, max_order=0)
+
+
+def test_encode_matches_alphabet_index():
+    text = random_text(200, seed=1)
+    assert ngram_engine.encode(text, ALPHABET).tolist() == [ALPHABET.index(ch) for ch in text]
+    with pytest.raises(ValueError, match="'z'"):
+        ngram_engine.encode("абz", ALPHABET)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+@pytest.mark.parametrize("overlap", [True, False])
+@pytest.mark.parametrize("length", [0, 1, 2, 5, 301])
+def test_ngram_counts_matches_naive(n, overlap, length):
+    text = random_text(length, seed=length)
+    codes = ngram_engine.encode(text, ALPHABET)
+    counts = ngram_engine.ngram_counts(codes, len(ALPHABET), n, overlap)
+    assert counts.shape == (len(ALPHABET),) * n
+    assert as_counter(counts) == naive_counts(text, n, overlap)
+
+
+def test_counts_to_frequencies_keeps_zero_on_request():
+    codes = ngram_engine.encode("ааб", ALPHABET)
+    counts = ngram_engine.ngram_counts(codes, len(ALPHABET), 1)
+    assert ngram_engine.counts_to_frequencies(counts, ALPHABET) == {"а": 2 / 3, "б": 1 / 3}
+    with_zero = ngram_engine.counts_to_frequencies(counts, ALPHABET, keep_zero=True)
+    assert list(with_zero) == ALPHABET and with_zero[" "] == 0.0
+    assert ngram_engine.counts_to_frequencies(counts[:0], ALPHABET) == {}
+
+
+def test_text_statistics_matches_counter():
+    stats = TextStatistics("Съешь же ещё этих мягких французских булок, да выпей чаю. " * 10)
+    text = stats.text
+    for freqs, n, overlap in [(stats.letter_freq, 1, True), (stats.bigram_freq_overlap, 2, True),
+                              (stats.bigram_freq_non_overlap, 2, False)]:
+        expected = naive_counts(text, n, overlap)
+        total = sum(expected.values())
+        assert freqs == pytest.approx({gram: count / total for gram, count in expected.items()})
+
+
+def count_text(text: str, max_order: int = 3) -> ngram_engine.NGramCounts:
+    counter = ngram_engine.NGramCounts(ALPHABET, max_order)
+    counter.update(text)
+    return counter
+
+
+def assert_same_counts(left: ngram_engine.NGramCounts, right: ngram_engine.NGramCounts):
+    assert left.length == right.length
+    assert left.head.tolist() == right.head.tolist() and left.tail.tolist() == right.tail.tolist()
+    for n in left.phase_counts:
+        assert np.array_equal(left.phase_counts[n], right.phase_counts[n])
+
+
+@pytest.mark.parametrize("lengths", [(0, 5), (1, 1), (2, 1), (1, 1, 1, 1), (7, 0, 3), (100, 33, 1, 64)])
+def test_merge_matches_concatenated_text(lengths):
+    parts = [random_text(length, seed=i) for i, length in enumerate(lengths)]
+    merged = count_text(parts[0])
+    for part in parts[1:]:
+        merged = merged + count_text(part)
+    text = "".join(parts)
+    assert_same_counts(merged, count_text(text))
+    for n in range(1, 4):
+        for overlap in (True, False):
+            assert as_counter(merged.counts(n, overlap)) == naive_counts(text, n, overlap)
+
+
+def test_merge_is_associative():
+    a, b, c = (count_text(random_text(length, seed=length)) for length in (5, 2, 11))
+    assert_same_counts((a + b) + c, a + (b + c))
+
+
+def test_merge_requires_same_alphabet_and_order():
+    with pytest.raises(ValueError):
+        count_text("аб", 2).merge(count_text("аб", 3))
+    with pytest.raises(ValueError):
+        count_text("аб").merge(ngram_engine.NGramCounts(ALPHABET[:-1], 3))
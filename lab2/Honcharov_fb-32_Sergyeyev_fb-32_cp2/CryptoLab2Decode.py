@@ -1,40 +1,34 @@
-import collections
-import matplotlib.pyplot as plt
-
-RUSSIAN_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
-RUSSIAN_FREQUENCIES = {
-    'о': 0.10983, 'е': 0.08483, 'а': 0.07998, 'и': 0.07367, 'н': 0.067,
-    'т': 0.06318, 'с': 0.05473, 'р': 0.04746, 'в': 0.04533, 'л': 0.04343,
-    'к': 0.03486, 'м': 0.03203, 'д': 0.02977, 'п': 0.02804, 'у': 0.02615,
-    'я': 0.02001, 'ы': 0.01898, 'ь': 0.01735, 'г': 0.01687, 'з': 0.01641,
-    'б': 0.01592, 'ч': 0.0145,  'й': 0.01208, 'х': 0.00966, 'ж': 0.0094,
-    'ш': 0.00718, 'ю': 0.00639, 'ц': 0.00486, 'щ': 0.00361, 'э': 0.00331,
-    'ф': 0.00267, 'ъ': 0.00037
-}
-
-def get_index_of_coincidence(text):
-    n = len(text)
-    if n < 2:
-        return 0.0
-    
-    counts = collections.Counter(text)
-    index = sum(count * (count - 1) for count in counts.values())
-    return index / (n * (n - 1))
-
-key_IC = {}
-
-def find_key_length(ciphertext, min_len=2, max_len=32):
+import os
+
+from analysis_cache import ANALYSIS_CACHE, CachedAnalysis
+from hill_climb import refine_key
+from key_recovery import reference_vector
+from period_analysis import coincidence_profile, detect_period, rank_periods
+from reference_model import RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES, load_model
+from spectrum_report import ReportRenderer, chart
+from streaming_analysis import StreamingPeriodAnalyzer
+import vigenere_codec
+
+# Якщо задано еталонний корпус, частоти беруться з кешованої моделі (будується лише при першому запуску),
+# а знайдений ключ додатково уточнюється за квадраграмами
+REFERENCE_CORPUS = os.environ.get('REFERENCE_CORPUS')
+REFERENCE_MODEL = None
+if REFERENCE_CORPUS:
+    REFERENCE_MODEL = load_model(REFERENCE_CORPUS, RUSSIAN_ALPHABET, max_order=4)
+    RUSSIAN_FREQUENCIES = REFERENCE_MODEL.frequencies(1)
+
+# Каталог і формати діаграм (наприклад PLOT_DIR=plots PLOT_FORMATS=png,svg); без PLOT_DIR matplotlib не імпортується
+PLOT_DIR = os.environ.get('PLOT_DIR')
+PLOT_FORMATS = os.environ.get('PLOT_FORMATS', 'png').split(',')
+
+def find_key_length(analysis, min_len=2, max_len=32):
+    # analysis - CachedAnalysis шифротексту; спектр IC рахується одним векторизованим проходом і кешується,
+    # тож повторний запит, наприклад для побудови діаграми, не переглядає текст
+    spectrum = analysis.ic_spectrum(max_len, min_len)
     best_len = 0
     max_avg_ic = 0.0
 
-    for key_len in range(min_len, max_len + 1):
-        total_ic = 0.0
-        for i in range(key_len):
-            sub_text = ciphertext[i::key_len]
-            total_ic += get_index_of_coincidence(sub_text)
-        
-        avg_ic = total_ic / key_len
-        key_IC[key_len] = avg_ic
+    for key_len, avg_ic in spectrum.items():
         print(f"{key_len}: {avg_ic}")
         if avg_ic > max_avg_ic:
             max_avg_ic = avg_ic
@@ -42,62 +36,65 @@ def find_key_length(ciphertext, min_len=2, max_len=32):
             
     return best_len
 
-def find_key(ciphertext, key_length):
-    key = ''
-    for i in range(key_length):
-        sub_text = ciphertext[i::key_length]
-        best_shift = 0
-        max_corr = 0.0
-        
-        for shift in range(len(RUSSIAN_ALPHABET)):
-            shifted_text = ''
-            for char in sub_text:
-                shifted_index = (RUSSIAN_ALPHABET.find(char) - shift + len(RUSSIAN_ALPHABET)) % len(RUSSIAN_ALPHABET)
-                shifted_text += RUSSIAN_ALPHABET[shifted_index]
-            
-            counts = collections.Counter(shifted_text)
-            current_corr = sum(counts.get(char, 0) / len(shifted_text) * RUSSIAN_FREQUENCIES.get(char, 0) for char in RUSSIAN_ALPHABET)
-
-            if current_corr > max_corr:
-                max_corr = current_corr
-                best_shift = shift
-        
-        key += RUSSIAN_ALPHABET[best_shift]
-        
+def find_key(analysis, key_length, method='correlation'):
+    # Гістограма кожного стовпця рахується один раз, усі 32 зсуви оцінюються через циркулянтну матрицю;
+    # оцінки стовпців кешуються, тож інший метод або сусідній період не перераховують гістограми
+    key, alternatives = analysis.recover_key(
+        key_length, reference_vector(RUSSIAN_FREQUENCIES, RUSSIAN_ALPHABET), method)
+    for i, ranked in enumerate(alternatives):
+        print(f"{i}: " + ", ".join(f"{letter} ({score:.4f})" for letter, score in ranked))
     return key
 
 def decrypt_vigenere(ciphertext, key):
-    plaintext = ''
-    key_index = 0
-    for char in ciphertext:
-        key_char = key[key_index % len(key)]
-        shift = RUSSIAN_ALPHABET.find(key_char)
-        
-        decrypted_index = (RUSSIAN_ALPHABET.find(char) - shift + len(RUSSIAN_ALPHABET)) % len(RUSSIAN_ALPHABET)
-        plaintext += RUSSIAN_ALPHABET[decrypted_index]
-        key_index += 1
-        
-    return plaintext
+    # Символи поза алфавітом (переноси рядків) не зсувають ключ
+    return vigenere_codec.decrypt(ciphertext, key, RUSSIAN_ALPHABET)
 
 encrypted_text = """щоыкцрылжцьштхъогзцуэцъмщкубфющъуытфьбахсюьувчузюмопощквкъмьчтмусуьшюхуцтрцоэитсуряхяьъыежърцяросыотюрщмчщсфьйоыоюыуъоэиътшйдхъьъхефярцйыхявэцьщзхщцыфущкборяэййшдцчмцубжцюхшмяилхэвгшсоьлмтшцытъиоуянюбкрширчюгмчфщцшбвъинзьтьтэчшлцциучеутьхаюятужифкчтщььэщявтчлшообцуафъцгепхщумямщмьйэужйэнмдъптрчрмърйюхьпцйыхрувлейжннчщйувфющмапыэчпьлыюыыцнцйрмйщьтьфььюльйякофахъбъьцьшрэиудыхлвэцюпнжхмьдщгыроюцлпъхзмйямюгьоаыуцхккящхфряшяцнъышйхшчобьуьщцаьцфебшахщоьупдьнфашпэюбоэшкстэлдазувацьжцонпйпнтцжэсцькфнщчжямъяэпсохтпнфтьщрхбыцъхдпрфаывчвкрмьэмцфйзазшяэщдвнпыщехщъершыяшуцикдхжпчяэецчшжищбмгуоуэрглпктхйлййообъсоерхкцйшзахтьбуоуыъчрбюаюяошшнънкъмщмъххтдшнрххйхахщмщьюрмснясцуткэпегщтйщцпйаийвлцввнхшнцдцфутэхэщлсыцшфулуычанхчтюрфаымурщаяьрдоноуюхпюяъяэепмйчфцшцуьогзкжхяиуьфцьпмющсстхощрзарфавурямхорькбяяьъэнснчицйряыэчфрцйэччхъхаафщвржйьцнськцяэтхррсыщутъиьвчыылфйюцууьлпаэящцзжыпнчгяоуьбьнфйэннмцшехцлгщьцыщчжущняэттыуххушйюмтбэпяффйюцуьокыгърархйсъвйафьякаскцаьцтрощкбсьпэксйъосцфускщяшнытлчсупхьфыщцухйзштэчуцьуэюухяилдщшнэпецэзйэъчрятьхчяглттпрфтягрбфгяцуиъноуочьвыьцоуииэйсцжбцфыцыехюнсжотяпруьжстоуйышхърщььйьмщрсзщзъшэямъепюзцдэмяющюстзйэхьжжпяммаянцйрмйуюхзхюящаупылсыушшшчяылчапгюттцьчптщкцитуйпжзсшсййррснъщйапчгяьуртаюыхфосотрувбзйяхднщзпшяцюэнлзннйыфйесюцчкстфудъмыэкгацнцъиноьщьакъщькфтучсцошюфхсьчяпаойымпющьцоййьцудъфмббуьурмюдляяхгичувэкешрштгхфшфысъхморыячуьаэхячзалхчоэмюхяьвэуотбоьокрвэюяфцпысъчъчоъпшсчксъгтпоицачыгшеоэгфмэмюхющцэксъгожущршчукрфйэкднятьщвфцшконфоскъфхаацшамытцдхфоъэъмрццтхдрьшшюсяыщитыьсхофьзььфщйтфцщдрмсюабэрхйдхчрьищшжкцъухшннсцуббчщщрсгпглдщпщбоцшьшрэиудрчуръкюжорхшшфнуьтщотутйялохучоапхдчкйящиьуыбцфящпкпптщйятуроэягецикйгягявэньъкфтмцмъфбъпшылптъфчзъмыпээцыкихъежулкюьэягкпъишгавчбъьълдсняйпрвгюуцгзнлюыхфосоъэсхлдчпрнйщюаювацмдсхяозьфуяэщдвейящихшзхръсцькфсипйымсыотршертхицьййифщщтцчщшйоофояянэюгмфчицькьбъьрнтдюъчгзпчьчюршкхщцмхшчйвлбхузптхсгтзевэацмдчсрлпнмапюьчлрушнадъпышжуфщтйамсжщжувфяьуийюнщлоььзфааыкуымцйящцььувйхуэррчымсюрбхрчтршчрывчткпяыдтднцаъфьуэсяшклъизмлщьюрцхшухчирдщкубфювкйарцщттмдъччрькпъишфьщцттуврхдюучкцтюгщцюлптшнцгглоцфсяцужацшчящцырбхэужднхцьюбтааущздшщлтмйцэвоюэусвцщтжпчьпсуькзсинтящцупугьзттлчрькбйфягнежъыпсьмрафърьпдфифьуыэющоюрццнхоькубфяуцшкхяицйжгяшъкюркуытйсушарьуйзцмшдцйуфуюсщспкйедляяяущыофукньцудымьтъохркьйкдхжмчьпсщросткфйхмжмсьалцсинхйящогбуткцмяыйъцжбэчшсцбснзыяэхэръэяпусьцхтюацыаншлппмъсйвъоапыгжццнуляяяцьыофщсстйьибюцъмаячшзыъчжйутрвацмдйюъехцтофпамюсйтаеймъэапрькчахъчыахалаабюйтщмопотюрькйрчйьнщаымяюааснргтъшфьищхыяыщрачцыяэчьскщюльйякофахъбъьцьшрэиудцшцфчжнхеоърлыууыхрйулртъцлтащьзфсяэастыхйщчоэлжцщтлнфчпезщпьодвшхййчфцшцуьогзкжхяъооооыорыщтъттчсдхртауаынлъизцещьпууьлглъиамамщмьйцюцутэстщгсрарцэрдъинйщзуилщцоптьшслызщуфяцычяунцйяхрбфъщпнтяяытпвыхяошннжнъехнфьбфчилццихйуьуцэпуйзсстхотэваээсянуихъопнсьвэюмффтшлчиоцьъпасццгъипмсъщпдцупхчрщопхзюгъкфщттдхчзьыуаяобутйяэькуооавщнхефйнщськьбпъяьздшикйщзхрсувщсжскохапаюьыиэууыурйашусфэяьфмэифмрвучхоцэнлчищаучорянхщсуэцшдящктаьгшгртъщтрзарырюумчтмьцтчбучувлстюкйпйхтээаущксткофыхуфсцчртмтшолшпчяэряыуцэыфгцтцфяьфшшжеиисоцуфпщщшузнчфтгхпгуугнцйщччсцуооошщнтчшхчгрййбзццшкфпифхниьачящотдядожцюлвэрмчксмцыуюзршъцуъузыхзлосьббуъкчйозцмрюуььудъхйчизмэварнянчттрцхчызбзчаньпдфифзушуачтянупйхчсуцьбъухщздянфаыхтюроуурщыъецйхтэпфхжнтятйлотяпрйгзстхфьыуфцъэъръхтщцфыотьвщюмнфдьтьжутцъччфрцйэпйжнойтпщгрцйщтссоиоэбцыкуеъищчфпщзфамыкхпнпйыгшшфукрфдвхьэцмашюьфыешютчншчобщьъоелтъцяуййафхыущдчщсцюпвюбьфыешхрыфцййафхыужяшрцдофсыччвхуръицмгжцбэябрйтяцамщшнтюубншвыяофулкяфюулджишолшзэафтвэежшзфдяхпюшшяыуцчызлоуувщбяъхтхщбйящршчргюхмюъсыушшюыогэхдчюстымэюухцчкпйзбтатоэуцщхеомччснтрнбьэтежтмосцптюсььзттяиумпзыръкющсжншсдыщуъэъюлчяюъщдгзцчцогръсхяохшпгэфэяцеиытштсппавявхнняыщмящэюухцчкпйзкящпхрщюмэауыусъцжэаэряпнцэиъхщмтюсоюукмпгихыжувьугцнжяшйзулцшсцюжфйэщчсототбьблдлнфоцшзплъоыюйдьцнфьиыхфэбщчйвхсыушшшфыцъупнмумбнуэфпмцусхщфтрзахщягмапънхсьншюабжщздягхионуяфтсшчмдхдряфоапяглгэхфлтщфуэчуэкффыясцотевээяонеертирзтжпащъдцхуоцыпчтчшгщхуэцютюхргжцььджкмсспъюуашячшсхкофяпахбутжрхихчрюъябщьфщфтшрымшзряэтшрсйшдитацюрсцььджщнъцушыхсувэуньшспущутзуъумфыщъмцйоыфющрощыфутызюгщожхуцышчнцшшюьесццгыъштамюшщюяннжянхсьщуввющьчмднъоькьрбаблпъхццдшщьвээцыкфтпйпуубуэюьщнпхяытахэхяубрмдшцкйтхщртовуййшкхйящубьуурццыслпьльзщуыщчтэиирулщхьыяъряшиштшчьтпряфхйчнхйщсьщщоюлзоткчоюъсчпъылздщчсфьйрюцъясттхпъцуфйвэюилрдчиуднщьюааблдктуолшзшюбьблдмьцфтяфбыпрщхчтэыштжмуфэещэежсцжцькььфяглджфмчщыъщшюьвчуцэнфсокубфюсючйозлхуктрцоэрьдянфаыхэюъбилртюджблшррыэщыерхщудхзщифвюлцйчыцибхаюярснэмюдчцяйьшдпдчезяшоцкжхрыугхееиуймхсоъэчгщлйшъчнжхаыпыхьптцлйлущуэщцщнуцяыыоьфузььчрежяцщфошяъпхсцццэибсбецббьбугуэцътрчуьфыюжъжнфшмюхръэаяыайпцхфосурбаблпъхццтршьбваыыужйщлтцьфхяаурймъщыжуфыюшьбуимъифаыхчффасцбвогфтбщрхяфхртмтоьфызщшаасвчтыйдыыхррыэщыажищйхййообяущнщунщцрфуэпяэрхцйхчфбшяъччвэшитхыоосэюъьчрттэыъхшхъгрйьшехяцфашхэмоыиэуетмцячяьвъоюпцохслдъццабьчрмдвфопутцгсщцхцгънърьщюпьоуьгцэиммефьббкщьчтэрсгхзяьфнььдктуыднцюхаясщтдпцлхууъшяуяпнснтчжошшрцоьокхтшцйэхтэчъскипнпъдъхугховшуйдъчцосрбфцтжртютйлотнъяьэрфамхъцрзшюьуишуоэыпооццтпхсщжйсцххькщрацььдзтщофематфюглджишолшзплъощтпдчцтцьфоифчфлмйягцйшчьыэсвщжтшнрсьйоэчньрусхмьуюхгюяьуюййьыыдаъсюабхлххякосыхчфвъмвкнюгццюзсшжувхнуылсенйхпъщщьчтчьйоязлвэшсхдмьшоиэхщртоьмапымчсушуэчуяэттдхчзьльчэюсоуфымйбтпысвюфлэтяуйстпнтфщщхуеэрыдыпнэфъющлоыхотпвеэкъяхелнуъгщпжмптбрцдящйрсмяхяоюруутшйццйылштцсшфъгтмщпюгщьущймянфаъмффвысыуиъцмтьщтхъощэусьръаъзегбктщрйтусыывчзфъащрдриоцяжрюгцзуепйхдщтхшгыуюэещнщчиучфрьццчксмхочтпршъьвъхмютчфппуьаьямюдтфштюмхгъкглчдщъвдамщмььаыужтмосыхсюуьшшесхзштщфопюьгрхгчшчжццюшцысхужххсъцздшчыцнагпуосьцююсухртсинштцшшшяушюраяиытрфуфпщщъхмпуоыуфйывейукххудйятцьэяыщзхчцоталуыфыщрцыхъййафуюргяпнрифцдэчотчанъкфтмйжорярыйцэкушгоуюпрхбйяцбзтцайыгюрухсэкемщыдювчъэргщхтцусхахшдпшвлуцюыыхайьтпщууймщцыдъийычяыцгыхъопкфьычеюжоцттъцэхлвэъдуфтсчсхцжыхврщпкпбцхдщмюьэыгьпдфифзушуатщснеьыъфдыляъэсяпулышйхазюлштбюидрирдтъъзчряъхтязцчщжхэпещэтдерллстнфкьакчапщыфущцычяншкцаощттшатфыюуппхццрцьошъбпыбйпрачязъбююяьньйщудхзщуфяцыдтсшьзьушюмаяхурнхнмюсьнбьфрцйэпйуыъщбоцвкзсифцйтхрюъквэзтщччоьшцыанюлрмю
 ъчошхлвэшяичтянкгбнуэфшсьейящигэхяьэабррсньчцькюргцщчупымчнемщюсуыичтхйдппмтюъофлзмчъчфтмргзшсьужюнхвызнхтьюрзйюъйыахагбсспецйрхчфпшяэяглхьтцыйдйцъбьблптюкосывуфпыюжкзыкчфнщьэпэспксхрлдъццапыяъуытфьхцщбрецрэхйоыоцызжхтьучкьнъопкшатпяаыуххуисояцбэьгрьйюълйыфцъчесьчйъдутсппэвашлхчонптъпьвсоэънфыкытфмрльухщзйэзоцуыььфццоууымамымыэкъхщзйэззсьъышдъсцутьгыджхаыпыхудрхшцднъмвьорьфтчцтсожявяоюлусхфчзбщыхаэблзмядъгощйзпягртачцсруттхъьвнерьрщдъпшюьуишумпщоцосцффщянчтщяытукьюбузъупхъсосмяхяэячуфжрфхнлоъпшяфусьцфмапшсчхюрцртхшфьиюръярнййьыыдавыртььщцтпицмньфьфаышуучрштапгюькыюптэцыоьпнбььющтйпнщвещьэфаяьуеысшфцюцэксцькфппнтгфбыэацбгсыасирзтжпанцкцъирдтийыээбрййшнцоосэюбуюбндшдцячшрхбщмфнсыснтрхщмььвураъгттапышецсбнмыъудхзщбоьтеджхкацьььзфаяьчдядъгемщюсуыщсцтфцягшюрцбчрфтюуйпэчьзлыяьтдщршттлуахцулрсттчцьчйхщьюэеоягсськтрюьэщидшзумрфбыуовцшынсщйтсцщьуилццыузицхаъпхмневящитащоъчгущмрыоцтящущжаящчоэглдмщяпюубрймъгхмъхфээяылмдядацьжегсягншвюнкгрпыюсогжсутшоиэчьеэюянарюъйфжпъбщошлрзтщофцмяычбчшкрыльуьуьзлямшшцыхоуьорюъмцоучортъуъчвчпцттдчирдыфйьбйащкитаежллцэрбботдцмоькдаютьвюсдюаоижмсющюянухыщймюзхтфуйзфтпныфбдаюрйьъхмчирсьжцсфхгщитънътппюръярьфтэрыашхнэфряцбсыпйуыъщбошяойдшныйагхрштщнсйумьсочьфьйъщчитуыйпмтюъфюжжяшрштткьвэрщэбиытьруфалрцьрчяснцаспцыфсцшйч"""
 
-encrypted_text
+def main():
+    # Шифротекст кодується і хешується один раз; усі етапи аналізу працюють з одним CachedAnalysis
+    analysis = CachedAnalysis(encrypted_text, RUSSIAN_ALPHABET)
+    key_length = find_key_length(analysis, max_len=20)
+    print(f"Ймовірна довжина ключа: {key_length}")
+
+    # Перевірка за статистикою збігів D_r (усі зсуви одразу через FFT)
+    coincidences = coincidence_profile(analysis.codes, len(RUSSIAN_ALPHABET), max_shift=200)
+    print(f"Довжина ключа за D_r: {detect_period(coincidences, max_period=40)[0]}")
+
+    # Об'єднаний рейтинг IC + D_r + Казіскі (повтори шукаються через суфіксний масив)
+    print("Рейтинг періодів (IC, D_r, Казіскі):")
+    for entry in rank_periods(analysis.codes, len(RUSSIAN_ALPHABET), max_period=40)[:5]:
+        print(f"  r = {entry['period']}: {entry['score']:.3f} (IC {entry['ic']:.4f}, D_r {entry['dr']:.2f}, Казіскі {entry['kasiski']:.2f})")
+
+    # Оцінка періоду в міру надходження шифротексту частинами по 500 символів
+    stream = StreamingPeriodAnalyzer(len(RUSSIAN_ALPHABET), max_period=40)
+    for start in range(0, len(encrypted_text), 500):
+        stream.feed(encrypted_text[start:start + 500])
+        period, confidence = stream.estimate()
+        print(f"  отримано {stream.length} літер: r = {period}, впевненість {confidence:.2f}")
 
-key_length = find_key_length(encrypted_text, max_len=20)
-print(f"Ймовірна довжина ключа: {key_length}")
+    # Діаграми будуються у фоні й лише якщо задано PLOT_DIR; спектр IC повторно береться з кешу аналізу
+    renderer = ReportRenderer(PLOT_DIR, PLOT_FORMATS) if PLOT_DIR else None
+    if renderer is not None:
+        renderer.add(chart("avg_ic", analysis.ic_spectrum(20, 2),
+                           "avg IC", "key len", "avg IC", highlight=[key_length]))
+        # Кратні знайденої довжини ключа підсвічуються; якщо довжину не знайдено (0), підсвітки немає
+        multiples = range(key_length, 201, key_length) if key_length else ()
+        renderer.add(chart("coincidences", coincidences, "D_r", "r", "D_r", highlight=multiples))
+        renderer.flush()
 
-plt.figure(figsize=(10,6))
-plt.bar(key_IC.keys(), key_IC.values(), color="skyblue", edgecolor="black")
-plt.xlabel("key len", fontsize=12)
-plt.ylabel("avg IC", fontsize=12)
-plt.title("avg IC", fontsize=14)
-plt.xticks(rotation=45, ha="right")
-plt.tight_layout()
-plt.show()
+    found_key = find_key(analysis, key_length)
+    print(f"Знайдений ключ: {found_key}")
+    if REFERENCE_MODEL is not None:
+        found_key, _ = refine_key(analysis.codes, found_key, REFERENCE_MODEL.log_probs(4), RUSSIAN_ALPHABET)
+        print(f"Уточнений ключ: {found_key}")
 
-found_key = find_key(encrypted_text, key_length)
-print(f"Знайдений ключ: {found_key}")
+    decrypted_text = decrypt_vigenere(encrypted_text, found_key)
+    print(f"\nРозшифрований текст:\n{decrypted_text}")
+    print(f"Кеш аналізу: {ANALYSIS_CACHE.info()}")
+    if renderer is not None:
+        print(f"Діаграми: {', '.join(renderer.close())}")
 
-decrypted_text = decrypt_vigenere(encrypted_text, found_key)
-print(f"\nРозшифрований текст:\n{decrypted_text}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import os
 import re
-import matplotlib.pyplot as plt
+
+from spectrum_report import ReportRenderer, chart
+import vigenere_codec
 
 CYRYalphabet = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
 
@@ -27,23 +30,8 @@ def process_text(text):
     return text
 
 def vigenere_encrypt(plaintext: str, key: str) -> str:
-    alphabet = CYRYalphabet
-
-    key_u = ''.join(ch for ch in key.lower() if ch in alphabet)
-    key_len = len(key_u)
-
-    ciphertext = []
-    key_pos = 0
-
-    for ch in plaintext:
-        if ch in alphabet:
-            shift = alphabet.index(key_u[key_pos % key_len])
-            new_ch = alphabet[(alphabet.index(ch) + shift) % len(alphabet)]
-            ciphertext.append(new_ch)
-            key_pos += 1
-        else:
-            ciphertext.append(ch)
-    return "".join(ciphertext)
+    # Символи поза алфавітом лишаються без змін і не зсувають ключ
+    return vigenere_codec.encrypt(plaintext, key, CYRYalphabet)
 
 def main():
     filename = "./text.txt"
@@ -67,14 +55,11 @@ def main():
         frequences[len(textkey)] = index_of_coincidence(textes[textkey])
         print(f"{textkey}: {frequences[len(textkey)]}")
 
-    plt.figure(figsize=(10,6))
-    plt.bar(frequences.keys(), frequences.values(), color="skyblue", edgecolor="black")
-    plt.xlabel("Ключ / Текст", fontsize=12)
-    plt.ylabel("Index of Coincidence", fontsize=12)
-    plt.title("Index of Coincidence", fontsize=14)
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.show()
+    # Діаграма пишеться у файл (Agg, у фоновому потоці) лише якщо задано PLOT_DIR
+    plot_dir = os.environ.get('PLOT_DIR')
+    if plot_dir:
+        with ReportRenderer(plot_dir, os.environ.get('PLOT_FORMATS', 'png').split(',')) as renderer:
+            renderer.add(chart("encrypted_ic", frequences, "Index of Coincidence", "Ключ / Текст", "Index of Coincidence"))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,94 @@
+import collections
+import hashlib
+
+import numpy as np
+
+from key_recovery import SCORINGS, column_histograms, rank_shifts, shift_scores
+from period_analysis import encode_text, ic_spectrum
+from reference_model import RUSSIAN_ALPHABET
+
+
+class AnalysisCache:
+    # LRU-кеш результатів аналізу з обмеженою кількістю записів і лічильниками влучань/промахів
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+# Спільний кеш для всіх шифротекстів процесу
+ANALYSIS_CACHE = AnalysisCache()
+
+
+def digest(array):
+    return hashlib.blake2b(np.ascontiguousarray(array).tobytes(), digest_size=16).hexdigest()
+
+
+class CachedAnalysis:
+    """
+    Аналіз одного шифротексту через спільний кеш: гістограми, спектр IC і оцінки зсувів стовпців
+    зберігаються за ключем (дайджест шифротексту, r, залишок, ...), тож повторні запити
+    (перемальовування спектра, сусідні періоди, інша функція оцінки) не переглядають текст заново.
+    """
+
+    def __init__(self, ciphertext, alphabet=RUSSIAN_ALPHABET, cache=ANALYSIS_CACHE):
+        self.codes = ciphertext if isinstance(ciphertext, np.ndarray) else encode_text(ciphertext, alphabet)
+        self.alphabet = alphabet
+        self.m = len(alphabet)
+        self.cache = cache
+        self.digest = digest(self.codes)
+
+    def column_histogram(self, r, residue):
+        def compute():
+            # Промах - гістограми всіх r стовпців рахуються одним bincount і кладуться в кеш разом
+            histograms = column_histograms(self.codes, r, self.m)
+            for column, histogram in enumerate(histograms):
+                if column != residue:
+                    self.cache.put((self.digest, r, column, 'histogram'), histogram)
+            return histograms[residue]
+        return self.cache.get((self.digest, r, residue, 'histogram'), compute)
+
+    def ic_spectrum(self, max_period=32, min_period=1):
+        # {r: середній IC стовпців}; спектр рахується векторизовано period_analysis.ic_spectrum і кешується цілком
+        key = (self.digest, 'spectrum', self.m, min_period, max_period)
+        spectrum = self.cache.get(key, lambda: ic_spectrum(self.codes, self.m, max_period, min_period))
+        return dict(spectrum)
+
+    def column_shift_scores(self, r, residue, reference, method='correlation'):
+        # Оцінки всіх m зсувів стовпця (key_recovery.shift_scores); еталон входить у ключ своїм дайджестом
+        if method not in SCORINGS:
+            raise ValueError(f"Невідомий метод оцінки: {method}, доступні: {', '.join(SCORINGS)}")
+        key = (self.digest, r, residue, 'shifts', method, digest(np.asarray(reference, dtype=np.float64)))
+        return self.cache.get(key, lambda: shift_scores(self.column_histogram(r, residue)[None, :], reference, method)[0])
+
+    def recover_key(self, period, reference, method='correlation', alternatives=3):
+        # Те саме, що key_recovery.recover_key, але з кешованими оцінками стовпців
+        scores = np.array([self.column_shift_scores(period, residue, reference, method) for residue in range(period)])
+        return rank_shifts(scores, self.alphabet, alternatives)
@@ -0,0 +1,159 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from hill_climb import refine_key
+from key_recovery import SCORINGS, recover_key, reference_vector
+from period_analysis import encode_text, ic_spectrum, select_period
+from reference_model import RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES, ReferenceModel, load_model
+from vigenere_codec import decode_codes, key_codes, shift_codes
+
+# Еталонний розподіл літер і таблиця квадраграм; завантажуються один раз у кожному процесі-обробнику (init_worker)
+_reference = None
+_quadgrams = None
+
+
+def init_worker(model_directory=None, alphabet=RUSSIAN_ALPHABET):
+    # Модель уже збережена батьківським процесом (run_batch), обробник лише відкриває її масиви через mmap.
+    # Таблиця квадраграм переводиться у float64 тут один раз, а не в кожному завданні з уточненням ключа
+    global _reference, _quadgrams
+    frequencies = RUSSIAN_FREQUENCIES
+    if model_directory:
+        model = ReferenceModel(model_directory)
+        frequencies = model.frequencies(1)
+        _quadgrams = np.asarray(model.log_probs(4), dtype=np.float64)
+    _reference = reference_vector(frequencies, alphabet)
+
+
+def iter_jobs(source):
+    # Завдання {'id': ..., 'path' або 'ciphertext': ...} з каталогу (*.txt), JSONL-файлу або stdin ('-').
+    # Рядок, що не є JSON-об'єктом, стає завданням з 'error' і дає запис про помилку, а не зупиняє пакет
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.txt'):
+                yield {'id': name, 'path': os.path.join(source, name)}
+        return
+
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as error:
+                yield {'id': number, 'error': f"Рядок {number}: некоректний JSON ({error})"}
+                continue
+            if not isinstance(job, dict):
+                yield {'id': number, 'error': f"Рядок {number}: завдання має бути JSON-об'єктом"}
+                continue
+            job.setdefault('id', number)
+            yield job
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def crack(job, max_period=32, method='correlation', refine=False, alphabet=RUSSIAN_ALPHABET):
+    # Визначення періоду, відновлення ключа й розшифрування одного шифротексту з часом кожного етапу (мс)
+    timings = {}
+    if 'error' in job:
+        return {'id': job.get('id'), 'error': job['error'], 'timings': timings}
+    started = time.perf_counter()
+
+    def mark(stage):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 3)
+        started = now
+
+    try:
+        if 'path' in job:
+            # open(5) відкрив би дескриптор 5, тому тип шляху перевіряється явно
+            if not isinstance(job['path'], str):
+                raise TypeError("Шлях до шифротексту має бути рядком")
+            with open(job['path'], encoding='utf-8') as f:
+                ciphertext = f.read()
+        else:
+            ciphertext = job['ciphertext']
+        if not isinstance(ciphertext, str):
+            raise TypeError("Шифротекст має бути рядком")
+        codes = encode_text(ciphertext, alphabet)
+        mark('encode')
+        if len(codes) < 4:
+            raise ValueError("Шифротекст занадто короткий")
+
+        spectrum = ic_spectrum(codes, len(alphabet), min(max_period, len(codes) // 2))
+        period = select_period(spectrum)
+        mark('period')
+
+        key, alternatives = recover_key(codes, period, _reference, alphabet, method)
+        mark('key')
+
+        if refine:
+            if _quadgrams is None:
+                raise ValueError("Для уточнення ключа потрібен еталонний корпус (--corpus)")
+            key, _ = refine_key(codes, key, _quadgrams, alphabet)
+            mark('refine')
+
+        plaintext = decode_codes(shift_codes(codes, key_codes(key, alphabet), sign=-1, m=len(alphabet)), alphabet)
+        mark('decrypt')
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        return {'id': job.get('id'), 'error': str(error), 'timings': timings}
+
+    return {'id': job.get('id'), 'period': period, 'ic': spectrum[period], 'key': key,
+            'alternatives': [[letter for letter, _ in ranked] for ranked in alternatives],
+            'plaintext': plaintext, 'timings': timings}
+
+
+def run_batch(jobs, processes=None, corpus_path=None, window=None, **options):
+    # Результати в порядку завдань; одночасно в роботі не більше window завдань, тож вхід читається потоково
+    worker = partial(crack, **options)
+    if window is None:
+        window = 4 * (processes or os.cpu_count() or 1)
+    # Модель будується (або береться з кешу) один раз до запуску пулу, щоб обробники не будували її одночасно
+    alphabet = options.get('alphabet', RUSSIAN_ALPHABET)
+    model_directory = load_model(corpus_path, alphabet, max_order=4).directory if corpus_path else None
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_worker,
+                             initargs=(model_directory, alphabet)) as executor:
+        pending = collections.deque()
+        for job in jobs:
+            pending.append(executor.submit(worker, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетний злам шифру Віженера: каталог *.txt або JSONL ({\"id\", \"ciphertext\"})")
+    parser.add_argument('source', help="каталог, JSONL-файл або '-' для stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL-файл результатів ('-' - stdout)")
+    parser.add_argument('-p', '--processes', type=int, default=None)
+    parser.add_argument('--corpus', default=os.environ.get('REFERENCE_CORPUS'), help="еталонний корпус для частот літер")
+    parser.add_argument('--max-period', type=int, default=32)
+    parser.add_argument('--method', choices=SCORINGS, default='correlation')
+    parser.add_argument('--refine', action='store_true', help="уточнити ключ за квадраграмами (для коротких шифротекстів)")
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        results = run_batch(iter_jobs(args.source), args.processes, args.corpus,
+                            max_period=args.max_period, method=args.method, refine=args.refine)
+        for result in results:
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import math
+import random
+
+import numpy as np
+
+from reference_model import RUSSIAN_ALPHABET
+
+ORDER = 4
+
+
+class QuadgramClimber:
+    """
+    Уточнення ключа Віженера підйомом на пагорб за логарифмом правдоподібності квадраграм відкритого тексту.
+    Для кожної позиції ключа заздалегідь відомі вікна (квадраграми), які містять літери цього стовпця,
+    тож зміна однієї літери ключа перераховує лише їх, причому одразу для всіх m варіантів літери.
+    """
+
+    def __init__(self, codes, period, log_probs, m=len(RUSSIAN_ALPHABET)):
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.period = period
+        self.m = m
+        self.log_probs = np.asarray(log_probs, dtype=np.float64).ravel()
+        if len(self.log_probs) != m ** ORDER:
+            raise ValueError(f"Потрібна таблиця квадраграм розміру {m}^{ORDER}")
+        self.evaluations = 0
+
+        n = len(self.codes)
+        self.windows = []
+        for column in range(period):
+            positions = np.arange(column, n, period)
+            starts = np.unique((positions[:, None] - np.arange(ORDER)).ravel())
+            starts = starts[(starts >= 0) & (starts <= n - ORDER)]
+            window_positions = starts[:, None] + np.arange(ORDER)
+            self.windows.append((window_positions, window_positions % period == column))
+
+    def _pack(self, plain):
+        packed = plain[..., 0]
+        for j in range(1, ORDER):
+            packed = packed * self.m + plain[..., j]
+        return packed
+
+    def decrypt(self, key):
+        return (self.codes - np.resize(np.asarray(key, dtype=np.int64), len(self.codes))) % self.m
+
+    def score(self, key):
+        plain = self.decrypt(key)
+        if len(plain) < ORDER:
+            return 0.0
+        windows = np.lib.stride_tricks.sliding_window_view(plain, ORDER)
+        return float(self.log_probs[self._pack(windows)].sum())
+
+    def column_scores(self, key, column, plain=None):
+        # Сума log P по вікнах стовпця column для кожної з m можливих літер ключа на цій позиції
+        if plain is None:
+            plain = self.decrypt(key)
+        window_positions, in_column = self.windows[column]
+        if not len(window_positions):
+            return np.zeros(self.m)
+        letters = np.arange(self.m)[:, None, None]
+        variants = np.where(in_column, (self.codes[window_positions] - letters) % self.m, plain[window_positions])
+        self.evaluations += self.m
+        return self.log_probs[self._pack(variants)].sum(axis=1)
+
+    def climb(self, key):
+        # Покоординатний підйом: кожна позиція отримує найкращу літеру, поки повний прохід щось змінює
+        key = list(key)
+        plain = self.decrypt(key)
+        improved = True
+        while improved:
+            improved = False
+            for column in range(self.period):
+                scores = self.column_scores(key, column, plain)
+                best = int(np.argmax(scores))
+                if scores[best] > scores[key[column]] + 1e-9:
+                    key[column] = best
+                    plain[column::self.period] = (self.codes[column::self.period] - best) % self.m
+                    improved = True
+        return key, self.score(key)
+
+    def anneal(self, key, iterations=200, temperature=20.0, cooling=0.97, seed=None):
+        # Збурення 1-2 випадкових позицій + підйом; гірший ключ приймається з імовірністю exp(delta / T)
+        rng = random.Random(seed)
+        current, current_score = self.climb(key)
+        best, best_score = list(current), current_score
+        for _ in range(iterations):
+            candidate = list(current)
+            for column in rng.sample(range(self.period), min(self.period, rng.randint(1, 2))):
+                candidate[column] = rng.randrange(self.m)
+            candidate, candidate_score = self.climb(candidate)
+            delta = candidate_score - current_score
+            if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                current, current_score = candidate, candidate_score
+                if current_score > best_score:
+                    best, best_score = list(current), current_score
+            temperature = max(temperature * cooling, 1e-3)
+        return best, best_score
+
+
+def refine_key(codes, key, log_probs, alphabet=RUSSIAN_ALPHABET, iterations=200, seed=None):
+    # Ключ-рядок після статистичного відновлення -> уточнений ключ-рядок і його оцінка
+    climber = QuadgramClimber(codes, len(key), log_probs, len(alphabet))
+    refined, score = climber.anneal([alphabet.index(char) for char in key], iterations, seed=seed)
+    return ''.join(alphabet[code] for code in refined), score
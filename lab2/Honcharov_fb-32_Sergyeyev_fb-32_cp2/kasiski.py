@@ -0,0 +1,63 @@
+import numpy as np
+
+
+def suffix_array(codes):
+    # Суфіксний масив подвоєнням префіксів: на кроці j суфікси впорядковано за першими 2^j літерами.
+    # Повертає (sa, ranks), ranks[j][i] - ранг префікса довжини 2^j суфікса i (потрібні для LCP)
+    rank = np.asarray(codes, dtype=np.int64)
+    n = len(rank)
+    sa = np.argsort(rank, kind='stable')
+    ranks = [rank.astype(np.int32)]
+    step = 1
+    while step < n:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - step] = rank[step:]
+        key = rank * (rank.max() + 2) + second + 1
+        sa = np.argsort(key, kind='stable')
+        sorted_key = key[sa]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        ranks.append(rank.astype(np.int32))
+        step *= 2
+        if rank[sa[-1]] == n - 1:  # усі префікси вже різні
+            break
+    return sa, ranks
+
+
+def lcp_array(sa, ranks):
+    # lcp[i] - довжина спільного префікса суфіксів sa[i] і sa[i+1]; двійковий підйом по рівнях ranks
+    n = len(sa)
+    first, second = sa[:-1], sa[1:]
+    lcp = np.zeros(n - 1, dtype=np.int64)
+    for level in range(len(ranks) - 1, -1, -1):
+        length = 1 << level
+        a, b = first + lcp, second + lcp
+        valid = (a + length <= n) & (b + length <= n)
+        equal = np.zeros(n - 1, dtype=bool)
+        equal[valid] = ranks[level][a[valid]] == ranks[level][b[valid]]
+        lcp[equal] += length
+    return lcp
+
+
+def repeat_distances(codes, min_length=3):
+    # Відстані між сусідніми входженнями кожного повтору довжини >= min_length.
+    # Суфікси з однаковими першими min_length літерами утворюють у суфіксному масиві неперервні групи
+    codes = np.asarray(codes)
+    if len(codes) <= min_length:
+        return np.zeros(0, dtype=np.int64)
+    sa, ranks = suffix_array(codes)
+    lcp = lcp_array(sa, ranks)
+    groups = np.concatenate(([0], np.cumsum(lcp < min_length)))
+    order = np.lexsort((sa, groups))
+    positions, groups = sa[order], groups[order]
+    same = groups[1:] == groups[:-1]
+    return (positions[1:] - positions[:-1])[same]
+
+
+def divisor_scores(distances, max_period=32, min_period=2):
+    # Для кожного r: частка відстаней, кратних r, відносно випадкового рівня 1/r: {r: оцінка}
+    distances = np.asarray(distances)
+    if not len(distances):
+        return {r: 0.0 for r in range(min_period, max_period + 1)}
+    return {r: float(np.count_nonzero(distances % r == 0) * r / len(distances))
+            for r in range(min_period, max_period + 1)}
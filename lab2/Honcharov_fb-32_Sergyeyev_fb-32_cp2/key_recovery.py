@@ -0,0 +1,57 @@
+import numpy as np
+
+from reference_model import RUSSIAN_ALPHABET
+
+SCORINGS = ('correlation', 'chi_square', 'log_likelihood')
+# Мінімальна ймовірність літери: щоб не ділити на нуль (хі-квадрат) і не брати log(0)
+MIN_PROBABILITY = 1e-6
+
+
+def reference_vector(frequencies, alphabet=RUSSIAN_ALPHABET):
+    # Словник частот {літера: частота} -> нормований масив у порядку алфавіту
+    probs = np.array([frequencies.get(char, 0.0) for char in alphabet], dtype=np.float64)
+    probs = np.maximum(probs, MIN_PROBABILITY)
+    return probs / probs.sum()
+
+
+def column_histograms(codes, period, m=len(RUSSIAN_ALPHABET)):
+    # Гістограми літер усіх стовпців за один bincount: рядок i - літери на позиціях i, i+period, ...
+    codes = np.asarray(codes, dtype=np.int64)
+    residues = np.arange(len(codes), dtype=np.int64) % period
+    return np.bincount(residues * m + codes, minlength=period * m).reshape(period, m)
+
+
+def circulant(vector):
+    # C[c, g] = vector[(c - g) mod m]: стовпець g - еталонний розподіл, зсунутий на g
+    m = len(vector)
+    return vector[(np.arange(m)[:, None] - np.arange(m)[None, :]) % m]
+
+
+def shift_scores(histograms, reference, method='correlation'):
+    # Оцінки всіх m зсувів для кожного стовпця одним матричним добутком, форма (period, m); більше - краще
+    #   correlation:    M_i(g) / n_i = sum_t p_t * N_i(t + g) / n_i
+    #   chi_square:     -sum_t (N_i(t + g) - n_i p_t)^2 / (n_i p_t)
+    #   log_likelihood: sum_t N_i(t + g) * log p_t
+    histograms = np.asarray(histograms, dtype=np.float64)
+    lengths = np.maximum(histograms.sum(axis=1, keepdims=True), 1)
+    if method == 'correlation':
+        return histograms @ circulant(reference) / lengths
+    if method == 'chi_square':
+        return lengths - (histograms ** 2) @ circulant(1 / reference) / lengths
+    if method == 'log_likelihood':
+        return histograms @ circulant(np.log(reference))
+    raise ValueError(f"Невідомий метод оцінки: {method}, доступні: {', '.join(SCORINGS)}")
+
+
+def recover_key(codes, period, reference, alphabet=RUSSIAN_ALPHABET, method='correlation', alternatives=3):
+    # Ключ (найкращий зсув для кожного стовпця) і ранжовані альтернативи [(літера, оцінка), ...] для кожної позиції
+    scores = shift_scores(column_histograms(codes, period, len(alphabet)), reference, method)
+    return rank_shifts(scores, alphabet, alternatives)
+
+
+def rank_shifts(scores, alphabet=RUSSIAN_ALPHABET, alternatives=3):
+    # Матриця оцінок (period, m) -> (ключ, альтернативи для кожної позиції)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    key = ''.join(alphabet[shifts[0]] for shifts in order)
+    ranked = [[(alphabet[g], float(scores[i, g])) for g in order[i, :alternatives]] for i in range(len(scores))]
+    return key, ranked
@@ -0,0 +1,166 @@
+from functools import lru_cache
+
+import numpy as np
+
+import kasiski
+from reference_model import RUSSIAN_ALPHABET
+
+UNKNOWN_CODE = 255
+# Обмеження на розмір проміжного масиву індексів при обробці кількох періодів за один bincount
+BLOCK_ELEMENTS = 1 << 24
+
+
+@lru_cache(maxsize=8)
+def _lookup(alphabet):
+    lookup = np.full(0x110000, UNKNOWN_CODE, dtype=np.uint8)
+    for code, char in enumerate(alphabet):
+        lookup[ord(char)] = code
+        lookup[ord(char.upper())] = code
+    return lookup
+
+
+def encode_text(text, alphabet=RUSSIAN_ALPHABET):
+    # Текст -> масив кодів літер uint8; символи поза алфавітом (пробіли, переноси рядків) відкидаються
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    codes = _lookup(alphabet)[codepoints]
+    return codes[codes != UNKNOWN_CODE]
+
+
+def ic_spectrum(codes, m=len(RUSSIAN_ALPHABET), max_period=32, min_period=1):
+    # Середній індекс відповідності стовпців для кожного r у min_period..max_period: {r: avg_ic}
+    # Для групи періодів будується одна гістограма (r, залишок, літера) через np.bincount
+    codes = np.asarray(codes, dtype=np.int64)
+    n = len(codes)
+    positions = np.arange(n, dtype=np.int64)
+    periods = list(range(min_period, max_period + 1))
+    group_size = max(1, BLOCK_ELEMENTS // max(n, 1))
+
+    spectrum = {}
+    for start in range(0, len(periods), group_size):
+        group = periods[start:start + group_size]
+        offsets = np.cumsum([0] + [r * m for r in group])
+        index = np.concatenate([offsets[i] + (positions % r) * m + codes for i, r in enumerate(group)])
+        histogram = np.bincount(index, minlength=offsets[-1])
+
+        for i, r in enumerate(group):
+            counts = histogram[offsets[i]:offsets[i + 1]].reshape(r, m)
+            lengths = counts.sum(axis=1)
+            pairs = lengths * (lengths - 1)
+            coincidences = (counts * (counts - 1)).sum(axis=1)
+            column_ic = np.divide(coincidences, pairs, out=np.zeros(r), where=pairs > 0)
+            spectrum[r] = float(column_ic.mean())
+    return spectrum
+
+
+def _fft_size(n):
+    # Найменше число виду 2^a * 3^b * 5^c, не менше n (на таких довжинах rfft найшвидший)
+    best = 1 << max(0, (n - 1).bit_length())
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def coincidence_profile(codes, m=len(RUSSIAN_ALPHABET), max_shift=None):
+    # D_r - кількість позицій i, для яких c_i == c_(i+r), одразу для всіх r = 1..max_shift: {r: D_r}
+    # D_r = сума за літерами автокореляцій індикаторних векторів; автокореляції рахуються через rfft
+    codes = np.asarray(codes)
+    n = len(codes)
+    if max_shift is None:
+        max_shift = n - 1
+    max_shift = min(max_shift, n - 1)
+    if max_shift < 1:
+        return {}
+
+    size = _fft_size(n + max_shift)
+    power = np.zeros(size // 2 + 1)
+    for letter in np.unique(codes):
+        spectrum = np.fft.rfft((codes == letter).astype(np.float64), size)
+        power += spectrum.real ** 2 + spectrum.imag ** 2
+    autocorrelation = np.rint(np.fft.irfft(power, size)[:max_shift + 1]).astype(np.int64)
+    return {r: int(autocorrelation[r]) for r in range(1, max_shift + 1)}
+
+
+def find_peaks(profile, threshold=3.0):
+    # Зсуви, на яких D_r перевищує середнє більш ніж на threshold стандартних відхилень
+    shifts = np.array(list(profile))
+    values = np.array(list(profile.values()), dtype=np.float64)
+    if len(values) < 2 or values.std() == 0:
+        return []
+    z_scores = (values - values.mean()) / values.std()
+    return [int(r) for r in shifts[z_scores > threshold]]
+
+
+def detect_period(profile, max_period=None, tolerance=0.9):
+    # Для кожного кандидата p - у скільки разів D_r на кратних p вищий за середній рівень.
+    # Кратні справжнього періоду мають майже таку саму оцінку, тому береться найменший p,
+    # оцінка якого не нижча за tolerance від найкращої (select_period). Повертає (період, {p: оцінка})
+    values = np.array([profile[r] for r in sorted(profile)], dtype=np.float64)
+    if not len(values) or values.mean() == 0:
+        return 0, {}
+    if max_period is None:
+        max_period = len(values) // 2
+    baseline = values.mean()
+    scores = {p: float(values[p - 1::p].mean() / baseline) for p in range(1, min(max_period, len(values)) + 1)}
+    return select_period(scores, tolerance), scores
+
+
+def select_period(scores, tolerance=0.9):
+    # Найменший період з оцінкою не нижче tolerance від найкращої (для спектра IC і оцінок D_r)
+    best = max(scores.values())
+    return min(p for p, score in scores.items() if score >= tolerance * best)
+
+
+def _excess(values, quantile=0.25):
+    # Перевищення над фоновим рівнем (квантиль quantile: кратні періоду займають не більше половини кандидатів),
+    # нормоване на максимум, щоб різні методи мали однаковий масштаб
+    baseline = np.quantile(values, quantile)
+    excess = values / baseline - 1 if baseline > 0 else np.zeros(len(values))
+    peak = excess.max()
+    return excess / peak if peak > 0 else excess
+
+
+def rank_periods(codes, m=len(RUSSIAN_ALPHABET), max_period=32, min_period=2, min_repeat=3, tolerance=0.6):
+    # Об'єднаний рейтинг періодів за IC, D_r і методом Казіскі: середнє нормованих перевищень над фоном.
+    # Вага Казіскі зростає з кількістю знайдених повторів (на коротких текстах їх майже немає).
+    # Період, що пояснюється меншим дільником з оцінкою не нижче tolerance від його власної, йде після решти
+    codes = np.asarray(codes)
+    max_period = min(max_period, len(codes) // 2)
+    periods = list(range(min_period, max_period + 1))
+    if not periods:
+        return []
+
+    profile = coincidence_profile(codes, m, max_shift=min(len(codes) - 1, 8 * max_period))
+    distances = kasiski.repeat_distances(codes, min_repeat)
+    methods = {
+        'ic': ic_spectrum(codes, m, max_period, min_period),
+        'dr': detect_period(profile, max_period)[1],
+        'kasiski': kasiski.divisor_scores(distances, max_period, min_period),
+    }
+    weights = {'ic': 1.0, 'dr': 1.0, 'kasiski': min(1.0, len(distances) / (10 * max_period))}
+    return fuse_scores(methods, periods, weights, tolerance)
+
+
+def fuse_scores(methods, periods, weights=None, tolerance=0.6):
+    # methods: {назва: {r: оцінка}} -> рейтинг [{period, score, divisor_of, <назва>: оцінка, ...}]
+    if weights is None:
+        weights = dict.fromkeys(methods, 1.0)
+    excess = {name: _excess(np.array([scores.get(r, 0.0) for r in periods])) for name, scores in methods.items()}
+    fused = sum(weights[name] * values for name, values in excess.items()) / sum(weights.values())
+
+    first = periods[0]
+    ranking = []
+    for i, r in enumerate(periods):
+        divisor_of = next((d for d in periods if d < r and r % d == 0 and fused[d - first] >= tolerance * fused[i]), None)
+        entry = {'period': r, 'score': float(fused[i]), 'divisor_of': divisor_of}
+        entry.update({name: float(methods[name].get(r, 0.0)) for name in methods})
+        ranking.append(entry)
+    ranking.sort(key=lambda entry: (entry['divisor_of'] is not None, -entry['score']))
+    return ranking
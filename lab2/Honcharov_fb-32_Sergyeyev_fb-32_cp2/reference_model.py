@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+RUSSIAN_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+RUSSIAN_FREQUENCIES = {
+    'о': 0.10983, 'е': 0.08483, 'а': 0.07998, 'и': 0.07367, 'н': 0.067,
+    'т': 0.06318, 'с': 0.05473, 'р': 0.04746, 'в': 0.04533, 'л': 0.04343,
+    'к': 0.03486, 'м': 0.03203, 'д': 0.02977, 'п': 0.02804, 'у': 0.02615,
+    'я': 0.02001, 'ы': 0.01898, 'ь': 0.01735, 'г': 0.01687, 'з': 0.01641,
+    'б': 0.01592, 'ч': 0.0145,  'й': 0.01208, 'х': 0.00966, 'ж': 0.0094,
+    'ш': 0.00718, 'ю': 0.00639, 'ц': 0.00486, 'щ': 0.00361, 'э': 0.00331,
+    'ф': 0.00267, 'ъ': 0.00037
+}
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "NGRAM_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ngram_cache")
+)
+CHUNK_SIZE = 1 << 22
+# Літери, яких немає в алфавіті, замінюються на близькі, решта символів відкидається
+DEFAULT_REPLACEMENTS = {'ё': 'е', 'ъ': 'ь'}
+SMOOTHING = 0.01
+
+
+def _file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _write_json(path, data):
+    # Запис через тимчасовий файл у тій самій папці й os.replace: паралельні запуски бачать або старий,
+    # або повний новий файл, а не напівзаписаний
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def corpus_digest(path, cache_dir=DEFAULT_CACHE_DIR):
+    # Хеш корпусу запам'ятовується за (шлях, розмір, mtime), щоб не перечитувати файл при кожному запуску
+    index_path = os.path.join(cache_dir, 'index.json')
+    stat = os.stat(path)
+    entry_key = os.path.abspath(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+        entry = index.get(entry_key)
+        if entry and entry['stamp'] == stamp:
+            return entry['digest']
+
+    digest = _file_digest(path)
+    index[entry_key] = {'stamp': stamp, 'digest': digest}
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_json(index_path, index)
+    return digest
+
+
+def model_key(digest, alphabet, max_order, encoding='utf-8', replacements=None):
+    if replacements is None:
+        replacements = DEFAULT_REPLACEMENTS
+    settings = json.dumps([alphabet, encoding, sorted(replacements.items())], ensure_ascii=False)
+    settings_digest = hashlib.sha256(settings.encode('utf-8')).hexdigest()
+    return f"{digest[:16]}_{settings_digest[:8]}_{max_order}"
+
+
+def make_translation(alphabet, replacements=None):
+    # str.translate: літера -> код (як символ chr(code)), усе інше видаляється
+    if replacements is None:
+        replacements = DEFAULT_REPLACEMENTS
+    table = {}
+    for code, char in enumerate(alphabet):
+        table[ord(char)] = chr(code)
+        table[ord(char.upper())] = chr(code)
+    for source, target in replacements.items():
+        if source not in alphabet and target in alphabet:
+            table[ord(source)] = chr(alphabet.index(target))
+            table[ord(source.upper())] = chr(alphabet.index(target))
+    return table
+
+
+class _DropOthers(dict):
+    def __missing__(self, codepoint):
+        self[codepoint] = None
+        return None
+
+
+def iter_corpus_codes(path, alphabet, encoding='utf-8', replacements=None):
+    table = _DropOthers(make_translation(alphabet, replacements))
+    with open(path, encoding=encoding, errors='ignore') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            codes = chunk.translate(table).encode('latin-1')
+            if codes:
+                yield np.frombuffer(codes, dtype=np.uint8)
+
+
+def count_corpus(path, alphabet, max_order, encoding='utf-8', replacements=None):
+    # Кількості n-грам з перетином для n = 1..max_order; між чанками переносяться max_order-1 кодів
+    m = len(alphabet)
+    counts = {n: np.zeros(m ** n, dtype=np.int64) for n in range(1, max_order + 1)}
+    tail = np.zeros(0, dtype=np.uint8)
+    for codes in iter_corpus_codes(path, alphabet, encoding, replacements):
+        buffer = np.concatenate((tail, codes))
+        for n in counts:
+            # n-грами, що повністю лежать у попередньому tail, вже пораховані
+            start = max(0, len(tail) - n + 1)
+            count = len(buffer) - start - n + 1
+            if count <= 0:
+                continue
+            packed = buffer[start:start + count].astype(np.int64)
+            for j in range(1, n):
+                packed = packed * m + buffer[start + j:start + j + count]
+            if m ** n <= 1 << 22:
+                counts[n] += np.bincount(packed, minlength=m ** n)
+            else:
+                values, occurrences = np.unique(packed, return_counts=True)
+                counts[n][values] += occurrences
+        tail = buffer[max(0, len(buffer) - max_order + 1):]
+    return counts
+
+
+class ReferenceModel:
+    # Збережені на диску кількості та логарифми ймовірностей n-грам; масиви відкриваються через mmap при першому зверненні
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.alphabet = self.meta['alphabet']
+        self.max_order = self.meta['max_order']
+        self.totals = {int(n): total for n, total in self.meta['totals'].items()}
+        self._arrays = {}
+
+    def _array(self, kind, n):
+        if not 1 <= n <= self.max_order:
+            raise ValueError(f"Модель містить n-грами лише порядків 1..{self.max_order}")
+        if (kind, n) not in self._arrays:
+            path = os.path.join(self.directory, f'{kind}_{n}.npy')
+            self._arrays[(kind, n)] = np.load(path, mmap_mode='r').reshape((len(self.alphabet),) * n)
+        return self._arrays[(kind, n)]
+
+    def counts(self, n):
+        return self._array('counts', n)
+
+    def log_probs(self, n):
+        return self._array('logprob', n)
+
+    def probabilities(self, n=1):
+        total = self.totals[n]
+        return np.asarray(self.counts(n), dtype=np.float64) / total if total else np.zeros((len(self.alphabet),) * n)
+
+    def frequencies(self, n=1):
+        # Словник у форматі RUSSIAN_FREQUENCIES: {n-грама: частота}
+        probs = self.probabilities(n).ravel()
+        m = len(self.alphabet)
+        result = {}
+        for index, prob in enumerate(probs):
+            chars = []
+            for _ in range(n):
+                index, code = divmod(index, m)
+                chars.append(self.alphabet[code])
+            result[''.join(reversed(chars))] = float(prob)
+        return result
+
+
+def build_model(corpus_path, alphabet=RUSSIAN_ALPHABET, max_order=5, cache_dir=DEFAULT_CACHE_DIR,
+                encoding='utf-8', replacements=None):
+    digest = corpus_digest(corpus_path, cache_dir)
+    directory = os.path.join(cache_dir, model_key(digest, alphabet, max_order, encoding, replacements))
+
+    # Модель збирається в тимчасовій папці й перейменовується цілою: папка з назвою моделі або відсутня,
+    # або містить усі масиви та meta.json, тож паралельний load_model не відкриє обрізаний .npy
+    temp_directory = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+    try:
+        counts = count_corpus(corpus_path, alphabet, max_order, encoding, replacements)
+        totals = {}
+        for n, flat in counts.items():
+            total = int(flat.sum())
+            totals[n] = total
+            log_probs = np.log((flat + SMOOTHING) / (total + SMOOTHING * flat.size)).astype(np.float32)
+            np.save(os.path.join(temp_directory, f'counts_{n}.npy'),
+                    flat.astype(np.int32 if total < 2 ** 31 else np.int64))
+            np.save(os.path.join(temp_directory, f'logprob_{n}.npy'), log_probs)
+
+        meta = {'alphabet': alphabet, 'max_order': max_order, 'corpus_digest': digest,
+                'corpus_path': os.path.abspath(corpus_path), 'totals': totals, 'smoothing': SMOOTHING}
+        _write_json(os.path.join(temp_directory, 'meta.json'), meta)
+        if os.path.isdir(directory) and not os.path.exists(os.path.join(directory, 'meta.json')):
+            # Незавершена папка від старіших версій, що писали файли на місці
+            shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.replace(temp_directory, directory)
+        except OSError:
+            # Інший процес уже зберіг ту саму модель (папка не порожня): беремо його копію
+            if not os.path.exists(os.path.join(directory, 'meta.json')):
+                raise
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+    return ReferenceModel(directory)
+
+
+def load_model(corpus_path, alphabet=RUSSIAN_ALPHABET, max_order=5, cache_dir=DEFAULT_CACHE_DIR,
+               encoding='utf-8', replacements=None):
+    # Модель з кешу за (хеш корпусу, алфавіт, порядок); будується лише при першому запуску.
+    # meta.json з'являється в папці моделі лише разом з нею (перейменування в build_model)
+    digest = corpus_digest(corpus_path, cache_dir)
+    directory = os.path.join(cache_dir, model_key(digest, alphabet, max_order, encoding, replacements))
+    if os.path.exists(os.path.join(directory, 'meta.json')):
+        return ReferenceModel(directory)
+    return build_model(corpus_path, alphabet, max_order, cache_dir, encoding, replacements)
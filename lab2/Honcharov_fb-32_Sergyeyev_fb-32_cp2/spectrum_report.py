@@ -0,0 +1,85 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+FORMATS = ('png', 'svg')
+MAX_TICKS = 40  # підписів по осі x, решта пропускається
+
+
+def chart(name, data, title, xlabel, ylabel, kind='bar', highlight=()):
+    # Опис діаграми звичайними даними (його можна передати в інший процес): {x: y} -> словник параметрів
+    return {'name': name, 'kind': kind, 'x': [str(x) for x in data], 'y': [float(y) for y in data.values()],
+            'title': title, 'xlabel': xlabel, 'ylabel': ylabel, 'highlight': [str(x) for x in highlight]}
+
+
+def render(charts, directory, formats=('png',)):
+    # Запис діаграм у файли <directory>/<name>.<формат>. matplotlib імпортується лише тут; фігури малюються
+    # безпосередньо на полотні Agg без pyplot, тож рендеринг не потребує дисплея й безпечний у фоновому потоці.
+    # Повертає список шляхів
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Непідтримуваний формат: {fmt}, доступні: {', '.join(FORMATS)}")
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for spec in charts:
+        figure = Figure(figsize=(10, 6))
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        colors = ['tomato' if x in spec['highlight'] else 'skyblue' for x in spec['x']]
+        if spec['kind'] == 'bar':
+            axes.bar(spec['x'], spec['y'], color=colors, edgecolor="black")
+        else:
+            axes.plot(spec['x'], spec['y'], 'b-o')
+        axes.set_xlabel(spec['xlabel'], fontsize=12)
+        axes.set_ylabel(spec['ylabel'], fontsize=12)
+        axes.set_title(spec['title'], fontsize=14)
+        step = max(1, len(spec['x']) // MAX_TICKS)
+        axes.set_xticks(range(0, len(spec['x']), step), spec['x'][::step], rotation=45)
+        figure.tight_layout()
+        for fmt in formats:
+            path = os.path.join(directory, f"{spec['name']}.{fmt}")
+            figure.savefig(path, format=fmt)
+            paths.append(path)
+    return paths
+
+
+class ReportRenderer:
+    """
+    Відкладений рендеринг діаграм: аналіз лише додає описи (add), а файли пишуться пакетами
+    у фоновому потоці (mode='thread') або окремому процесі (mode='process') і не блокують обчислення.
+    """
+
+    def __init__(self, directory, formats=('png',), mode='thread'):
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Невідомий режим рендерингу: {mode}")
+        self.directory = directory
+        self.formats = tuple(formats)
+        self.executor = (ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor)(max_workers=1)
+        self.pending = []
+        self.futures = []
+
+    def add(self, spec):
+        self.pending.append(spec)
+
+    def flush(self):
+        # Передати накопичені діаграми у фоновий обробник одним пакетом
+        if self.pending:
+            self.futures.append(self.executor.submit(render, self.pending, self.directory, self.formats))
+            self.pending = []
+
+    def close(self):
+        # Дочекатися запису всіх файлів; повертає список шляхів
+        self.flush()
+        try:
+            return [path for future in self.futures for path in future.result()]
+        finally:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
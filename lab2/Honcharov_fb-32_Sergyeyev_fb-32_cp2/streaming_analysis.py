@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+
+from period_analysis import detect_period, encode_text, fuse_scores
+from reference_model import RUSSIAN_ALPHABET
+
+
+class StreamingPeriodAnalyzer:
+    """
+    Оцінка періоду шифру Віженера для шифротексту, що надходить частинами.
+    Зберігаються гістограми літер для кожної пари (r, залишок) і лічильники збігів D_s для s = 1..max_shift,
+    тож кожна нова літера оновлює r-ті гістограми й D_s за O(max_period + max_shift), не переглядаючи вже отримане.
+    Пам'ять: sum(r) * m лічильників гістограм і кільцевий буфер останніх max_shift літер.
+    """
+
+    def __init__(self, m=len(RUSSIAN_ALPHABET), max_period=32, min_period=2, max_shift=None, alphabet=RUSSIAN_ALPHABET):
+        self.m = m
+        self.alphabet = alphabet
+        self.min_period = min_period
+        self.max_period = max_period
+        self.max_shift = max_shift or 8 * max_period
+        self.length = 0
+
+        self.periods = np.arange(1, max_period + 1, dtype=np.int64)
+        # Гістограма (r, залишок) займає m лічильників з позиції (residue_offsets[r - 1] + залишок) * m
+        self.residue_offsets = np.concatenate(([0], np.cumsum(self.periods)[:-1]))
+        residues = int(self.periods.sum())
+        self.counts = np.zeros(residues * m, dtype=np.int64)
+        self.column_lengths = np.zeros(residues, dtype=np.int64)
+        self.column_pairs = np.zeros(residues, dtype=np.int64)  # sum_t N_t (N_t - 1) у стовпці
+
+        self.shifts = np.arange(1, self.max_shift + 1, dtype=np.int64)
+        self.coincidences = np.zeros(self.max_shift, dtype=np.int64)
+        self.recent = np.zeros(self.max_shift, dtype=np.int64)  # кільцевий буфер: літера i у recent[i % max_shift]
+
+    def append(self, code):
+        # Одна літера (код): O(max_period) для гістограм і O(max_shift) для D_s
+        position = self.length
+        columns = self.residue_offsets + position % self.periods
+        cells = columns * self.m + code
+        self.column_pairs[columns] += 2 * self.counts[cells]
+        self.counts[cells] += 1
+        self.column_lengths[columns] += 1
+
+        seen = self.shifts <= position
+        self.coincidences += (self.recent[(position - self.shifts) % self.max_shift] == code) & seen
+        self.recent[position % self.max_shift] = code
+        self.length += 1
+
+    def extend(self, codes):
+        # Частина шифротексту (масив кодів) - те саме, що append для кожної літери, але векторизовано
+        codes = np.asarray(codes, dtype=np.int64)
+        if not len(codes):
+            return
+        start = self.length
+        positions = start + np.arange(len(codes), dtype=np.int64)
+
+        for r, offset in zip(self.periods, self.residue_offsets):
+            self.counts[offset * self.m:(offset + r) * self.m] += np.bincount((positions % r) * self.m + codes,
+                                                                              minlength=r * self.m)
+        counts = self.counts.reshape(-1, self.m)
+        self.column_lengths = counts.sum(axis=1)
+        self.column_pairs = (counts * (counts - 1)).sum(axis=1)
+
+        # D_s: нові позиції порівнюються з хвостом попереднього тексту та між собою
+        kept = min(start, self.max_shift)
+        tail = self.recent[(start - kept + np.arange(kept)) % self.max_shift]
+        window = np.concatenate((tail, codes))
+        for s in range(1, min(self.max_shift, len(window) - 1) + 1):
+            first = max(kept, s)
+            self.coincidences[s - 1] += np.count_nonzero(window[first:] == window[first - s:len(window) - s])
+        latest = positions[-self.max_shift:]
+        self.recent[latest % self.max_shift] = codes[-self.max_shift:]
+        self.length += len(codes)
+
+    def feed(self, text):
+        # Фрагмент тексту: символи поза алфавітом відкидаються, як в encode_text
+        self.extend(encode_text(text, self.alphabet))
+
+    def ic_spectrum(self):
+        # {r: середній індекс відповідності стовпців} для поточного префікса, як period_analysis.ic_spectrum
+        pairs = self.column_lengths * (self.column_lengths - 1)
+        column_ic = np.divide(self.column_pairs, pairs, out=np.zeros(len(pairs)), where=pairs > 0)
+        return {int(r): float(column_ic[offset:offset + r].mean())
+                for r, offset in zip(self.periods, self.residue_offsets) if r >= self.min_period}
+
+    def coincidence_profile(self):
+        # {s: D_s} для s < поточної довжини, як period_analysis.coincidence_profile
+        available = min(self.max_shift, self.length - 1)
+        return {s: int(self.coincidences[s - 1]) for s in range(1, available + 1)}
+
+    def ranking(self, tolerance=0.6):
+        # Об'єднаний рейтинг IC + D_r (period_analysis.fuse_scores) для кандидатів, що вміщуються хоча б двічі
+        max_period = min(self.max_period, self.length // 2)
+        periods = list(range(self.min_period, max_period + 1))
+        if not periods:
+            return []
+        methods = {'ic': self.ic_spectrum(), 'dr': detect_period(self.coincidence_profile(), max_period)[1]}
+        return fuse_scores(methods, periods, tolerance=tolerance)
+
+    def estimate(self, tolerance=0.6):
+        # (період p, впевненість від 0 до 1). При справжньому періоді p кандидат r збігається з ним у частці
+        # gcd(r, p) / p стовпців і очікувано має таку частку найкращої оцінки; конкурентом вважається лише
+        # перевищення над цим рівнем (кратні p пояснюються повністю). Впевненість = 1 - найсильніший конкурент
+        ranking = self.ranking(tolerance)
+        if not ranking:
+            return None, 0.0
+        period, best = ranking[0]['period'], ranking[0]['score']
+        if best <= 0:
+            return period, 0.0
+        rival = 0.0
+        for entry in ranking[1:]:
+            shared = math.gcd(entry['period'], period) / period
+            if shared < 1:
+                rival = max(rival, (entry['score'] / best - shared) / (1 - shared))
+        return period, float(min(1.0, max(0.0, 1 - rival)))
@@ -0,0 +1,91 @@
+import collections
+import os
+
+import numpy as np
+import pytest
+
+from analysis_cache import AnalysisCache, CachedAnalysis
+from key_recovery import recover_key, reference_vector
+from period_analysis import encode_text, ic_spectrum
+from reference_model import RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:20000]
+
+CIPHERTEXT = encrypt(PLAINTEXT, 'последнийдозор')
+
+
+def naive_spectrum(text, min_period, max_period):
+    letters = [c for c in text if c in RUSSIAN_ALPHABET]
+    spectrum = {}
+    for r in range(min_period, max_period + 1):
+        total = 0.0
+        for residue in range(r):
+            column = letters[residue::r]
+            n = len(column)
+            pairs = sum(count * (count - 1) for count in collections.Counter(column).values())
+            total += pairs / (n * (n - 1)) if n > 1 else 0.0
+        spectrum[r] = total / r
+    return spectrum
+
+
+def test_ic_spectrum_matches_naive():
+    analysis = CachedAnalysis(CIPHERTEXT, cache=AnalysisCache())
+    spectrum = analysis.ic_spectrum(20, 2)
+    expected = naive_spectrum(CIPHERTEXT, 2, 20)
+    assert spectrum.keys() == expected.keys()
+    assert np.allclose(list(spectrum.values()), list(expected.values()))
+    assert spectrum == ic_spectrum(encode_text(CIPHERTEXT), len(RUSSIAN_ALPHABET), 20, 2)
+    assert max(spectrum, key=spectrum.get) == 14
+
+
+def test_ic_spectrum_is_cached():
+    cache = AnalysisCache()
+    CachedAnalysis(CIPHERTEXT, cache=cache).ic_spectrum(20, 2)
+    assert cache.info()['misses'] == 1
+    # Новий об'єкт для того самого шифротексту влучає в кеш за дайджестом
+    spectrum = CachedAnalysis(CIPHERTEXT, cache=cache).ic_spectrum(20, 2)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Зміна результату не псує кешований спектр
+    spectrum[2] = -1.0
+    assert CachedAnalysis(CIPHERTEXT, cache=cache).ic_spectrum(20, 2)[2] != -1.0
+    CachedAnalysis(CIPHERTEXT[1:], cache=cache).ic_spectrum(20, 2)
+    assert cache.misses == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = AnalysisCache(maxsize=2)
+    for key in 'abc':
+        cache.get(key, lambda: key)
+    assert 'a' not in cache and 'b' in cache and 'c' in cache
+
+
+@pytest.mark.parametrize('method', ['correlation', 'chi_square', 'log_likelihood'])
+def test_recover_key_matches_uncached(method):
+    reference = reference_vector(RUSSIAN_FREQUENCIES)
+    cache = AnalysisCache()
+    analysis = CachedAnalysis(CIPHERTEXT, cache=cache)
+    key, ranked = analysis.recover_key(14, reference, method)
+    expected_key, expected_ranked = recover_key(encode_text(CIPHERTEXT), 14, reference, method=method)
+    assert key == expected_key
+    assert [[letter for letter, _ in column] for column in ranked] == \
+        [[letter for letter, _ in column] for column in expected_ranked]
+    assert np.allclose([[score for _, score in column] for column in ranked],
+                       [[score for _, score in column] for column in expected_ranked])
+    assert key == 'последнийдозор'
+    misses = cache.misses
+    assert analysis.recover_key(14, reference, method) == (key, ranked)
+    assert cache.misses == misses
+
+
+def test_recover_key_matches_brute_force_shifts():
+    reference = reference_vector(RUSSIAN_FREQUENCIES)
+    codes = encode_text(CIPHERTEXT)
+    key, _ = CachedAnalysis(codes, cache=AnalysisCache()).recover_key(5, reference)
+    m = len(RUSSIAN_ALPHABET)
+    for residue in range(5):
+        column = codes[residue::5].tolist()
+        scores = [sum(reference[(c - g) % m] for c in column) for g in range(m)]
+        assert key[residue] == RUSSIAN_ALPHABET[int(np.argmax(scores))]
@@ -0,0 +1,58 @@
+import json
+import os
+
+import numpy as np
+
+import batch_crack
+from reference_model import load_model
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()
+
+
+def test_bad_lines_become_error_records(tmp_path):
+    path_job = tmp_path / 'cipher.txt'
+    path_job.write_text(encrypt(PLAINTEXT, 'дом'), encoding='utf-8')
+    lines = [
+        json.dumps({'id': 'a', 'ciphertext': encrypt(PLAINTEXT, 'кот')}, ensure_ascii=False),
+        '{"ciphertext": ',
+        '[1, 2]',
+        '',
+        json.dumps({'ciphertext': 5}),
+        json.dumps({'path': 0}),
+        json.dumps({'path': str(tmp_path / 'missing.txt')}),
+        json.dumps({'id': 'b', 'path': str(path_job)}),
+    ]
+    jobs_path = tmp_path / 'jobs.jsonl'
+    jobs_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    results = list(batch_crack.run_batch(batch_crack.iter_jobs(str(jobs_path)), processes=1))
+    assert [result['id'] for result in results] == ['a', 2, 3, 5, 6, 7, 'b']
+    assert results[0]['key'] == 'кот' and results[0]['plaintext'] == PLAINTEXT
+    assert results[-1]['key'] == 'дом'
+    for result in results[1:-1]:
+        assert 'error' in result and 'key' not in result
+    assert 'Рядок 2' in results[1]['error'] and 'Рядок 3' in results[2]['error']
+
+
+def test_directory_jobs(tmp_path):
+    for name, key in [('1.txt', 'рим'), ('2.txt', 'мир')]:
+        (tmp_path / name).write_text(encrypt(PLAINTEXT, key), encoding='utf-8')
+    (tmp_path / 'notes.md').write_text('не шифротекст', encoding='utf-8')
+    results = list(batch_crack.run_batch(batch_crack.iter_jobs(str(tmp_path)), processes=1))
+    assert [(result['id'], result['key']) for result in results] == [('1.txt', 'рим'), ('2.txt', 'мир')]
+
+
+def test_worker_opens_model_built_by_parent(tmp_path):
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text(PLAINTEXT * 3, encoding='utf-8')
+    model = load_model(str(corpus), max_order=4, cache_dir=str(tmp_path / 'cache'))
+    batch_crack.init_worker(model.directory)
+    try:
+        assert batch_crack._quadgrams.dtype == np.float64
+        result = batch_crack.crack({'id': 1, 'ciphertext': encrypt(PLAINTEXT, 'кот')}, refine=True)
+        assert result['key'] == 'кот' and 'refine' in result['timings']
+    finally:
+        batch_crack.init_worker()
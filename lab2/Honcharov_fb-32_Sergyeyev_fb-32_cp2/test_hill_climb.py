@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from hill_climb import ORDER, QuadgramClimber, refine_key
+from period_analysis import encode_text
+from reference_model import RUSSIAN_ALPHABET, load_model
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(HERE, 'cleaned_text.txt')
+with open(CORPUS, encoding='utf-8') as f:
+    PLAINTEXT = f.read()[-400:]
+
+M = len(RUSSIAN_ALPHABET)
+KEY = 'последнийдозор'
+
+
+@pytest.fixture(scope='module')
+def log_probs(tmp_path_factory):
+    model = load_model(CORPUS, RUSSIAN_ALPHABET, max_order=ORDER, cache_dir=str(tmp_path_factory.mktemp('ngrams')))
+    return model.log_probs(ORDER)
+
+
+def key_codes(key):
+    return [RUSSIAN_ALPHABET.index(char) for char in key]
+
+
+def naive_score(codes, key, table):
+    plain = [(c - key[i % len(key)]) % M for i, c in enumerate(codes)]
+    total = 0.0
+    for i in range(len(plain) - ORDER + 1):
+        index = 0
+        for c in plain[i:i + ORDER]:
+            index = index * M + c
+        total += table[index]
+    return total
+
+
+def test_score_matches_naive(log_probs):
+    codes = encode_text(encrypt(PLAINTEXT[:120], KEY))
+    climber = QuadgramClimber(codes, len(KEY), log_probs)
+    table = np.asarray(log_probs, dtype=np.float64).ravel()
+    for key in [key_codes(KEY), [0] * len(KEY), list(range(len(KEY)))]:
+        assert climber.score(key) == pytest.approx(naive_score(codes.tolist(), key, table))
+
+
+def test_column_scores_track_full_score(log_probs):
+    codes = encode_text(encrypt(PLAINTEXT[:150], KEY))
+    climber = QuadgramClimber(codes, len(KEY), log_probs)
+    key = key_codes('абвгдежзийклмн')
+    for column in [0, 5, len(KEY) - 1]:
+        scores = climber.column_scores(key, column)
+        full = []
+        for letter in range(M):
+            variant = list(key)
+            variant[column] = letter
+            full.append(climber.score(variant))
+        # Вікна поза стовпцем не залежать від літери, тож різниця стала
+        assert np.ptp(np.array(full) - scores) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_climb_reaches_local_optimum(log_probs):
+    codes = encode_text(encrypt(PLAINTEXT, KEY))
+    climber = QuadgramClimber(codes, len(KEY), log_probs)
+    start = key_codes('абвгдежзийклмн')
+    key, score = climber.climb(start)
+    assert score >= climber.score(start)
+    assert score == pytest.approx(climber.score(key))
+    for column in range(len(KEY)):
+        assert climber.column_scores(key, column).max() <= climber.column_scores(key, column)[key[column]] + 1e-9
+
+
+def test_refine_key_repairs_wrong_letters(log_probs):
+    codes = encode_text(encrypt(PLAINTEXT, KEY))
+    refined, score = refine_key(codes, 'пасладнийдазор', log_probs, iterations=20, seed=1)
+    assert refined == KEY
+    assert score == pytest.approx(QuadgramClimber(codes, len(KEY), log_probs).score(key_codes(KEY)))
+
+
+def test_table_size_is_checked():
+    with pytest.raises(ValueError):
+        QuadgramClimber([0, 1, 2, 3], 2, np.zeros(M ** 3))
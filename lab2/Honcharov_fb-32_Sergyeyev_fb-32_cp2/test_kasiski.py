@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+import kasiski
+from period_analysis import encode_text, fuse_scores, rank_periods
+from reference_model import RUSSIAN_ALPHABET
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:5000]
+
+
+def random_codes(length, m, seed):
+    return np.random.default_rng(seed).integers(0, m, length)
+
+
+def naive_lcp(codes, i, j):
+    length = 0
+    while i + length < len(codes) and j + length < len(codes) and codes[i + length] == codes[j + length]:
+        length += 1
+    return length
+
+
+def naive_distances(codes, min_length):
+    # Для кожного повтору довжини min_length - відстані між сусідніми входженнями
+    positions = {}
+    for i in range(len(codes) - min_length + 1):
+        positions.setdefault(tuple(codes[i:i + min_length]), []).append(i)
+    return sorted(b - a for starts in positions.values() for a, b in zip(starts, starts[1:]))
+
+
+@pytest.mark.parametrize('length,m', [(1, 2), (2, 2), (17, 2), (200, 3), (500, 32)])
+def test_suffix_array_matches_sorted_suffixes(length, m):
+    codes = random_codes(length, m, length)
+    sa, ranks = kasiski.suffix_array(codes)
+    assert sa.tolist() == sorted(range(length), key=lambda i: codes[i:].tolist())
+    lcp = kasiski.lcp_array(sa, ranks)
+    assert lcp.tolist() == [naive_lcp(codes, sa[i], sa[i + 1]) for i in range(length - 1)]
+
+
+@pytest.mark.parametrize('min_length', [1, 3, 5])
+def test_repeat_distances_match_naive(min_length):
+    codes = random_codes(400, 3, min_length)
+    assert sorted(kasiski.repeat_distances(codes, min_length).tolist()) == naive_distances(codes.tolist(), min_length)
+    assert len(kasiski.repeat_distances(codes[:min_length], min_length)) == 0
+
+
+def test_divisor_scores():
+    scores = kasiski.divisor_scores([6, 12, 18, 7], max_period=6)
+    assert scores[6] == pytest.approx(3 * 6 / 4)
+    assert scores[2] == pytest.approx(3 * 2 / 4)
+    assert kasiski.divisor_scores([], 4) == {2: 0.0, 3: 0.0, 4: 0.0}
+
+
+def test_rank_periods_puts_key_length_first():
+    codes = encode_text(encrypt(PLAINTEXT, 'шифрование'))
+    ranking = rank_periods(codes, len(RUSSIAN_ALPHABET), max_period=30)
+    assert ranking[0]['period'] == 10
+    by_period = {entry['period']: entry for entry in ranking}
+    assert by_period[20]['divisor_of'] == 10
+    assert rank_periods(codes[:3], len(RUSSIAN_ALPHABET)) == []
+
+
+def test_fuse_scores_orders_multiples_after_divisor():
+    methods = {'a': {2: 1.0, 3: 5.0, 4: 1.0, 6: 5.0}}
+    ranking = fuse_scores(methods, [2, 3, 4, 5, 6])
+    assert ranking[0]['period'] == 3
+    flags = [entry['divisor_of'] is not None for entry in ranking]
+    assert flags == sorted(flags)
+    assert {entry['period']: entry['divisor_of'] for entry in ranking}[6] == 3
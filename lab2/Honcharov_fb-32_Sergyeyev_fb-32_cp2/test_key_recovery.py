@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from key_recovery import SCORINGS, circulant, column_histograms, recover_key, reference_vector, shift_scores
+from period_analysis import encode_text
+from reference_model import RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:8000]
+
+M = len(RUSSIAN_ALPHABET)
+REFERENCE = reference_vector(RUSSIAN_FREQUENCIES)
+
+
+def naive_score(column, g, reference, method):
+    # Оцінка зсуву g за формулами з shift_scores, по одній літері стовпця
+    shifted = [(c - g) % M for c in column]
+    counts = np.bincount(shifted, minlength=M)
+    n = max(len(column), 1)
+    if method == 'correlation':
+        return sum(reference[t] for t in shifted) / n
+    if method == 'chi_square':
+        return -sum((counts[t] - n * reference[t]) ** 2 / (n * reference[t]) for t in range(M))
+    return sum(np.log(reference[t]) for t in shifted)
+
+
+def test_reference_vector_is_normalized():
+    assert REFERENCE.sum() == pytest.approx(1.0)
+    assert REFERENCE.min() > 0
+    assert np.argmax(REFERENCE) == RUSSIAN_ALPHABET.index('о')
+
+
+def test_circulant_shifts_reference():
+    matrix = circulant(np.arange(5))
+    for g in range(5):
+        assert matrix[:, g].tolist() == np.roll(np.arange(5), g).tolist()
+
+
+def test_column_histograms_match_slices():
+    codes = np.random.default_rng(0).integers(0, M, 103)
+    histograms = column_histograms(codes, 7)
+    for residue in range(7):
+        assert histograms[residue].tolist() == np.bincount(codes[residue::7], minlength=M).tolist()
+
+
+@pytest.mark.parametrize('method', SCORINGS)
+def test_shift_scores_match_naive(method):
+    codes = encode_text(encrypt(PLAINTEXT[:300], 'ключ'))
+    scores = shift_scores(column_histograms(codes, 4), REFERENCE, method)
+    for residue in range(4):
+        column = codes[residue::4].tolist()
+        expected = [naive_score(column, g, REFERENCE, method) for g in range(M)]
+        assert scores[residue] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('method', SCORINGS)
+def test_recover_key(method):
+    codes = encode_text(encrypt(PLAINTEXT, 'последнийдозор'))
+    key, alternatives = recover_key(codes, 14, REFERENCE, method=method)
+    assert key == 'последнийдозор'
+    assert len(alternatives) == 14
+    for letter, ranked in zip(key, alternatives):
+        assert ranked[0][0] == letter and len(ranked) == 3
+        assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        shift_scores(np.zeros((1, M)), REFERENCE, 'entropy')
@@ -0,0 +1,79 @@
+import collections
+import os
+
+import numpy as np
+import pytest
+
+import period_analysis
+from period_analysis import encode_text, ic_spectrum
+from reference_model import RUSSIAN_ALPHABET
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:6000]
+
+M = len(RUSSIAN_ALPHABET)
+CODES = encode_text(encrypt(PLAINTEXT, 'ключик'))
+
+
+def naive_ic(column):
+    n = len(column)
+    pairs = sum(count * (count - 1) for count in collections.Counter(column).values())
+    return pairs / (n * (n - 1)) if n > 1 else 0.0
+
+
+def test_encode_text_drops_other_characters():
+    codes = encode_text("Аб, в\nЯ-z!")
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [0, 1, 2, 31]
+    assert len(encode_text("")) == 0
+
+
+@pytest.mark.parametrize('length', [0, 1, 2, 5, 97])
+def test_ic_spectrum_matches_naive(length):
+    codes = np.random.default_rng(length).integers(0, M, length)
+    spectrum = ic_spectrum(codes, M, 12, 1)
+    assert list(spectrum) == list(range(1, 13))
+    for r, value in spectrum.items():
+        assert value == pytest.approx(np.mean([naive_ic(codes[i::r].tolist()) for i in range(r)]))
+
+
+def test_ic_spectrum_groups_give_same_result(monkeypatch):
+    expected = ic_spectrum(CODES, M, 20, 2)
+    # Мала межа блоку: кожен період рахується окремим bincount
+    monkeypatch.setattr(period_analysis, 'BLOCK_ELEMENTS', 1)
+    assert ic_spectrum(CODES, M, 20, 2) == pytest.approx(expected)
+    assert max(expected, key=expected.get) % 6 == 0
+    assert expected[6] == pytest.approx(np.mean([naive_ic(CODES[i::6].tolist()) for i in range(6)]))
+
+
+def naive_profile(codes, max_shift):
+    codes = list(codes)
+    return {r: sum(codes[i] == codes[i + r] for i in range(len(codes) - r)) for r in range(1, max_shift + 1)}
+
+
+@pytest.mark.parametrize('length', [0, 1, 2, 3, 31, 200])
+def test_coincidence_profile_matches_naive(length):
+    codes = np.random.default_rng(length).integers(0, 4, length)
+    assert period_analysis.coincidence_profile(codes, 4) == naive_profile(codes, max(0, length - 1))
+    assert period_analysis.coincidence_profile(codes, 4, max_shift=10) == naive_profile(codes, min(10, max(0, length - 1)))
+
+
+def test_fft_size_is_smallest_5_smooth():
+    def smooth(n):
+        for p in (2, 3, 5):
+            while n % p == 0:
+                n //= p
+        return n == 1
+    for n in range(1, 500):
+        assert period_analysis._fft_size(n) == next(k for k in range(n, 2 * n + 1) if smooth(k))
+
+
+def test_detect_period_on_vigenere():
+    profile = period_analysis.coincidence_profile(CODES, M, max_shift=200)
+    assert profile == naive_profile(CODES, 200)
+    period, scores = period_analysis.detect_period(profile, max_period=40)
+    assert period == 6
+    assert set(period_analysis.find_peaks(profile)) <= set(range(6, 201, 6))
+    assert period_analysis.detect_period({}) == (0, {})
@@ -0,0 +1,92 @@
+import os
+import threading
+
+import numpy as np
+
+import reference_model
+from reference_model import RUSSIAN_ALPHABET, build_model, load_model
+
+TEXT = 'Съешь же ещё этих мягких французских булок, да выпей чаю. ' * 20
+
+
+def write_corpus(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def naive_counts(text, n):
+    table = reference_model.make_translation(RUSSIAN_ALPHABET)
+    codes = [ord(c) for c in text.translate(reference_model._DropOthers(table))]
+    counts = np.zeros(len(RUSSIAN_ALPHABET) ** n, dtype=np.int64)
+    for i in range(len(codes) - n + 1):
+        index = 0
+        for code in codes[i:i + n]:
+            index = index * len(RUSSIAN_ALPHABET) + code
+        counts[index] += 1
+    return counts
+
+
+def test_counts_match_naive(tmp_path):
+    corpus = write_corpus(tmp_path / 'corpus.txt', TEXT)
+    model = load_model(corpus, max_order=3, cache_dir=str(tmp_path / 'cache'))
+    for n in (1, 2, 3):
+        assert np.array_equal(np.asarray(model.counts(n)).ravel(), naive_counts(TEXT, n))
+    assert model.totals[1] == naive_counts(TEXT, 1).sum()
+
+
+def test_second_load_is_cache_hit(tmp_path, monkeypatch):
+    corpus = write_corpus(tmp_path / 'corpus.txt', TEXT)
+    cache_dir = str(tmp_path / 'cache')
+    first = load_model(corpus, max_order=2, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('модель перераховується замість читання з кешу')
+
+    monkeypatch.setattr(reference_model, 'count_corpus', fail)
+    monkeypatch.setattr(reference_model, '_file_digest', fail)
+    second = load_model(corpus, max_order=2, cache_dir=cache_dir)
+    assert second.directory == first.directory
+    assert np.array_equal(second.counts(2), first.counts(2))
+
+
+def test_changed_corpus_invalidates_cache(tmp_path):
+    corpus = tmp_path / 'corpus.txt'
+    cache_dir = str(tmp_path / 'cache')
+    first = load_model(write_corpus(corpus, TEXT), max_order=1, cache_dir=cache_dir)
+    # Інший розмір файлу - запис в index.json застарів, хеш рахується заново
+    second = load_model(write_corpus(corpus, TEXT + 'ааааа'), max_order=1, cache_dir=cache_dir)
+    assert second.directory != first.directory
+    assert second.totals[1] == first.totals[1] + 5
+    assert second.counts(1)[0] == first.counts(1)[0] + 5
+
+
+def test_cache_contains_only_complete_models(tmp_path):
+    corpus = write_corpus(tmp_path / 'corpus.txt', TEXT)
+    cache_dir = str(tmp_path / 'cache')
+    build_model(corpus, max_order=2, cache_dir=cache_dir)
+    # Повторна побудова поверх готової моделі не ламає її, тимчасові папки не лишаються
+    model = build_model(corpus, max_order=2, cache_dir=cache_dir)
+    assert not [name for name in os.listdir(cache_dir) if name.startswith('.tmp-')]
+    assert sorted(os.listdir(model.directory)) == sorted(
+        ['meta.json'] + [f'{kind}_{n}.npy' for kind in ('counts', 'logprob') for n in (1, 2)])
+
+
+def test_concurrent_builds(tmp_path):
+    corpus = write_corpus(tmp_path / 'corpus.txt', TEXT)
+    cache_dir = str(tmp_path / 'cache')
+    models, errors = [], []
+
+    def run():
+        try:
+            models.append(load_model(corpus, max_order=2, cache_dir=cache_dir))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len({model.directory for model in models}) == 1
+    assert all(np.array_equal(model.counts(2).ravel(), naive_counts(TEXT, 2)) for model in models)
@@ -0,0 +1,37 @@
+import pytest
+
+from spectrum_report import ReportRenderer, chart, render
+
+SPECTRUM = {r: 0.033 + (0.02 if r % 7 == 0 else 0.0) for r in range(2, 30)}
+
+
+def test_chart_is_plain_data():
+    spec = chart("avg_ic", SPECTRUM, "avg IC", "r", "IC", highlight=range(7, 30, 7))
+    assert spec['x'] == [str(r) for r in SPECTRUM]
+    assert spec['y'] == list(SPECTRUM.values())
+    assert spec['highlight'] == ['7', '14', '21', '28']
+    assert chart("empty", SPECTRUM, "t", "x", "y")['highlight'] == []
+
+
+def test_render_writes_files(tmp_path):
+    specs = [chart("avg_ic", SPECTRUM, "avg IC", "r", "IC", highlight=[14]),
+             chart("line", SPECTRUM, "D_r", "r", "D_r", kind='line', highlight=())]
+    paths = render(specs, str(tmp_path / 'plots'), ('png', 'svg'))
+    assert len(paths) == 4
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert f.read(16)
+
+
+def test_render_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        render([chart("avg_ic", SPECTRUM, "t", "x", "y")], str(tmp_path), ('bmp',))
+
+
+def test_background_renderer_collects_paths(tmp_path):
+    with ReportRenderer(str(tmp_path), ('png',)) as renderer:
+        renderer.add(chart("a", SPECTRUM, "t", "x", "y"))
+        renderer.flush()
+        renderer.add(chart("b", SPECTRUM, "t", "x", "y"))
+        paths = renderer.close()
+    assert sorted(paths) == sorted(str(tmp_path / f"{name}.png") for name in 'ab')
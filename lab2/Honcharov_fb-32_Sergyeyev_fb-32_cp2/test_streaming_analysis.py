@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from period_analysis import coincidence_profile, encode_text, ic_spectrum
+from reference_model import RUSSIAN_ALPHABET
+from streaming_analysis import StreamingPeriodAnalyzer
+from vigenere_codec import encrypt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:3000]
+
+M = len(RUSSIAN_ALPHABET)
+CIPHERTEXT = encrypt(PLAINTEXT, 'шифрование')
+CODES = encode_text(CIPHERTEXT)
+
+
+def assert_matches_batch(analyzer, codes):
+    assert analyzer.length == len(codes)
+    assert analyzer.ic_spectrum() == pytest.approx(ic_spectrum(codes, M, analyzer.max_period, analyzer.min_period))
+    assert analyzer.coincidence_profile() == coincidence_profile(codes, M, max_shift=analyzer.max_shift)
+
+
+@pytest.mark.parametrize('size', [1, 7, 160, 500, 3000])
+def test_feed_in_chunks_matches_batch(size):
+    analyzer = StreamingPeriodAnalyzer(M, max_period=20, max_shift=60)
+    for start in range(0, len(CIPHERTEXT), size):
+        analyzer.feed(CIPHERTEXT[start:start + size])
+        assert_matches_batch(analyzer, encode_text(CIPHERTEXT[:start + size]))
+
+
+def test_append_and_extend_can_be_mixed():
+    analyzer = StreamingPeriodAnalyzer(M, max_period=12, max_shift=30)
+    for code in CODES[:50]:
+        analyzer.append(code)
+    assert_matches_batch(analyzer, CODES[:50])
+    analyzer.extend(CODES[50:400])
+    for code in CODES[400:420]:
+        analyzer.append(code)
+    analyzer.extend(CODES[420:420])
+    assert_matches_batch(analyzer, CODES[:420])
+
+
+def test_estimate_finds_key_length():
+    analyzer = StreamingPeriodAnalyzer(M, max_period=30)
+    assert analyzer.estimate() == (None, 0.0)
+    analyzer.feed(CIPHERTEXT)
+    period, confidence = analyzer.estimate()
+    assert period == 10
+    assert 0.0 <= confidence <= 1.0
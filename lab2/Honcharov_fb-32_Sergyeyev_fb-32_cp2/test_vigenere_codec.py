@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+
+import vigenere_codec
+from reference_model import RUSSIAN_ALPHABET
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, 'cleaned_text.txt'), encoding='utf-8') as f:
+    PLAINTEXT = f.read()[:3000]
+
+MIXED = "Привет, мир!\nэто — тест ёжика: абв эюя 123 " * 20
+
+
+def naive_encrypt(text, key, sign=1):
+    # Посимвольний шифр Віженера: символи поза алфавітом переписуються і не зсувають ключ
+    m = len(RUSSIAN_ALPHABET)
+    result, position = [], 0
+    for char in text:
+        if char in RUSSIAN_ALPHABET:
+            shift = RUSSIAN_ALPHABET.index(key[position % len(key)])
+            result.append(RUSSIAN_ALPHABET[(RUSSIAN_ALPHABET.index(char) + sign * shift) % m])
+            position += 1
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+@pytest.mark.parametrize('key', ['а', 'ключ', 'последнийдозор'])
+@pytest.mark.parametrize('text', [PLAINTEXT, MIXED, ''])
+def test_matches_naive_and_round_trips(key, text):
+    ciphertext = vigenere_codec.encrypt(text, key)
+    assert ciphertext == naive_encrypt(text, key)
+    assert vigenere_codec.decrypt(ciphertext, key) == text
+    assert vigenere_codec.decrypt(text, key) == naive_encrypt(text, key, -1)
+
+
+@pytest.mark.parametrize('size', [1, 2, 13, 1000])
+def test_stream_in_chunks_matches_whole_text(size):
+    stream = vigenere_codec.VigenereStream('ключ')
+    streamed = ''.join(stream.process(MIXED[i:i + size]) for i in range(0, len(MIXED), size))
+    assert streamed == vigenere_codec.encrypt(MIXED, 'ключ')
+
+
+def test_key_is_normalized():
+    assert vigenere_codec.key_codes('Ключ 1').tolist() == [RUSSIAN_ALPHABET.index(c) for c in 'ключ']
+    with pytest.raises(ValueError):
+        vigenere_codec.key_codes('key 42')
+
+
+def test_decode_codes():
+    assert vigenere_codec.decode_codes(np.arange(len(RUSSIAN_ALPHABET))) == RUSSIAN_ALPHABET
+
+
+def test_file_round_trip(tmp_path):
+    source, encrypted, decrypted = tmp_path / 'plain.txt', tmp_path / 'enc.txt', tmp_path / 'dec.txt'
+    source.write_text(MIXED, encoding='utf-8')
+    vigenere_codec.encrypt_file(source, encrypted, 'ключ', chunk_size=7)
+    assert encrypted.read_text(encoding='utf-8') == naive_encrypt(MIXED, 'ключ')
+    vigenere_codec.decrypt_file(encrypted, decrypted, 'ключ', chunk_size=5)
+    assert decrypted.read_text(encoding='utf-8') == MIXED
@@ -0,0 +1,78 @@
+from functools import lru_cache
+
+import numpy as np
+
+from reference_model import RUSSIAN_ALPHABET
+
+NOT_A_LETTER = 255
+CHUNK_SIZE = 1 << 22  # символів за одне читання у encrypt_file/decrypt_file
+
+
+@lru_cache(maxsize=8)
+def _letter_lookup(alphabet):
+    # codepoint -> код літери; все, чого немає в алфавіті, залишається без змін і не зсуває ключ
+    lookup = np.full(0x110000, NOT_A_LETTER, dtype=np.uint8)
+    for code, char in enumerate(alphabet):
+        lookup[ord(char)] = code
+    return lookup
+
+
+def key_codes(key, alphabet=RUSSIAN_ALPHABET):
+    codes = [alphabet.index(char) for char in key.lower() if char in alphabet]
+    if not codes:
+        raise ValueError("Ключ не містить жодної літери алфавіту")
+    return np.array(codes, dtype=np.int64)
+
+
+def shift_codes(codes, key, position=0, sign=1, m=len(RUSSIAN_ALPHABET)):
+    # (коди + ключ, розтягнутий на довжину тексту) mod m; position - фаза ключа для першої літери
+    key = np.asarray(key, dtype=np.int64)
+    phases = (position + np.arange(len(codes))) % len(key)
+    return (np.asarray(codes, dtype=np.int64) + sign * key[phases]) % m
+
+
+def decode_codes(codes, alphabet=RUSSIAN_ALPHABET):
+    codepoints = np.array([ord(char) for char in alphabet], dtype=np.uint32)
+    return codepoints[codes].tobytes().decode('utf-32-le')
+
+
+class VigenereStream:
+    # Шифрування/розшифрування тексту частинами: фаза ключа зберігається між викликами process
+    def __init__(self, key, alphabet=RUSSIAN_ALPHABET, decrypt=False):
+        self.alphabet = alphabet
+        self.key = key_codes(key, alphabet)
+        self.sign = -1 if decrypt else 1
+        self.position = 0
+        self.lookup = _letter_lookup(alphabet)
+        self.codepoints = np.array([ord(char) for char in alphabet], dtype=np.uint32)
+
+    def process(self, chunk):
+        codepoints = np.frombuffer(chunk.encode('utf-32-le'), dtype=np.uint32).copy()
+        codes = self.lookup[codepoints]
+        letters = codes != NOT_A_LETTER
+        shifted = shift_codes(codes[letters], self.key, self.position, self.sign, len(self.alphabet))
+        codepoints[letters] = self.codepoints[shifted]
+        self.position = (self.position + len(shifted)) % len(self.key)
+        return codepoints.tobytes().decode('utf-32-le')
+
+
+def encrypt(text, key, alphabet=RUSSIAN_ALPHABET):
+    return VigenereStream(key, alphabet).process(text)
+
+
+def decrypt(text, key, alphabet=RUSSIAN_ALPHABET):
+    return VigenereStream(key, alphabet, decrypt=True).process(text)
+
+
+def _process_file(source_path, target_path, stream, chunk_size, encoding):
+    with open(source_path, encoding=encoding) as source, open(target_path, 'w', encoding=encoding) as target:
+        for chunk in iter(lambda: source.read(chunk_size), ''):
+            target.write(stream.process(chunk))
+
+
+def encrypt_file(source_path, target_path, key, alphabet=RUSSIAN_ALPHABET, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    _process_file(source_path, target_path, VigenereStream(key, alphabet), chunk_size, encoding)
+
+
+def decrypt_file(source_path, target_path, key, alphabet=RUSSIAN_ALPHABET, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    _process_file(source_path, target_path, VigenereStream(key, alphabet, decrypt=True), chunk_size, encoding)
@@ -1,5 +1,4 @@
 from collections import Counter
-import matplotlib.pyplot as plt
 
 alh = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
 
@@ -10,7 +9,22 @@ def ic(text):
     freq = Counter(text)
     return sum(f * (f - 1) for f in freq.values()) / (n * (n - 1))
 
-def method1(text, max_r=30):
+def plot_results(results, ylabel, title, style, path):
+    # matplotlib імпортується лише тут, з бекендом Agg: графік пишеться у файл і не блокує виконання
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 6))
+    plt.plot(list(results.keys()), list(results.values()), style)
+    plt.xlabel("r")
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.grid()
+    plt.savefig(path)
+    plt.close()
+
+def method1(text, max_r=30, plot_path=None):
     results = {}
     for r in range(2, max_r + 1):
         blocks = ['' for _ in range(r)]
@@ -21,16 +35,11 @@ def method1(text, max_r=30):
         results[r] = avg
         print(f"r: {r}, IC: {avg:.6f}")
 
-    plt.figure(figsize=(12, 6))
-    plt.plot(list(results.keys()), list(results.values()), 'b-o')
-    plt.xlabel("r")
-    plt.ylabel("IC")
-    plt.title("Method 1")
-    plt.grid()
-    plt.show()
+    if plot_path:
+        plot_results(results, "IC", "Method 1", 'b-o', plot_path)
     return results
 
-def method2(text, max_r=30):
+def method2(text, max_r=30, plot_path=None):
     results = {}
     n = len(text)
     for r in range(2, max_r + 1):
@@ -40,13 +49,8 @@ def method2(text, max_r=30):
                 count += 1
         results[r] = count
 
-    plt.figure(figsize=(12, 6))
-    plt.plot(list(results.keys()), list(results.values()), 'r-o')
-    plt.xlabel("r")
-    plt.ylabel("D(r)")
-    plt.title("Method 2")
-    plt.grid()
-    plt.show()
+    if plot_path:
+        plot_results(results, "D(r)", "Method 2", 'r-o', plot_path)
     return results
 
 def find_key(text, r):
@@ -6,10 +6,10 @@ with open("text.txt", "r", encoding="utf8") as file:
     cipher_text = ''.join(c for c in cipher_text if c in alh)
 
 print("Method 1:")
-method1(cipher_text)
+method1(cipher_text, plot_path="method1.png")
 
 print("\nMethod 2:")
-method2(cipher_text)
+method2(cipher_text, plot_path="method2.png")
 
 print("\nKey search:")
 r = 14
@@ -1,5 +1,4 @@
-import matplotlib.pyplot as plt
-import numpy as np
+DIAGRAM_FILE = 'coincidences_diagram.png'
 
 
 def calculate_coincidences(text, max_len=30):
@@ -20,52 +19,64 @@ def calculate_coincidences(text, max_len=30):
     return key_lengths, coincidences
 
 
-file_name = 'var_3.txt'
+def plot_coincidences(key_lengths, coincidences, path=DIAGRAM_FILE):
+    # matplotlib підключається лише для побудови діаграми; бекенд Agg пише файл без вікна і не блокує скрипт
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
 
-try:
-    with open(file_name, 'r', encoding='utf-8') as f:
-        ciphertext = f.read()
-except FileNotFoundError:
-    print(f"ПОМИЛКА: Файл '{file_name}' не знайдено")
+    plt.figure(figsize=(14, 7))
+    bars = plt.bar(key_lengths, coincidences, color='grey',
+                   label='Кількість збігів (D_r)')
 
-    exit()
+    plt.title('Аналіз довжини ключа', fontsize=16)
+    plt.xlabel('Можлива довжина ключа', fontsize=12)
+    plt.ylabel('Кількість збігів', fontsize=12)
 
-max_key_length = 30
-key_lengths, coincidences = calculate_coincidences(ciphertext, max_key_length)
+    plt.xticks(np.arange(min(key_lengths), max(key_lengths) + 1, 1.0))
 
-plt.figure(figsize=(14, 7))
-bars = plt.bar(key_lengths, coincidences, color='grey',
-               label='Кількість збігів (D_r)')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
 
-plt.title('Аналіз довжини ключа', fontsize=16)
-plt.xlabel('Можлива довжина ключа', fontsize=12)
-plt.ylabel('Кількість збігів', fontsize=12)
+    try:
+        index_14 = key_lengths.index(14)
+        bars[index_14].set_color('red')
+    except ValueError:
+        print("Попередження: довжина ключа 14 не аналізувалася.")
 
-plt.xticks(np.arange(min(key_lengths), max(key_lengths) + 1, 1.0))
+    try:
+        index_28 = key_lengths.index(28)
+        bars[index_28].set_color('red')
 
-plt.grid(axis='y', linestyle='--', alpha=0.7)
+        max_val = coincidences[index_28]
+        max_r = key_lengths[index_28]
 
-try:
-    index_14 = key_lengths.index(14)
-    bars[index_14].set_color('red')
-except ValueError:
-    print("Попередження: довжина ключа 14 не аналізувалася.")
+        plt.text(max_r, max_val + 5,  # Позиція тексту (трохи вище стовпця)
+                 f'Найвищий пік: r={max_r} ({max_val})',
+                 horizontalalignment='center',
+                 color='blue',
+                 fontweight='bold')
 
-try:
-    index_28 = key_lengths.index(28)
-    bars[index_28].set_color('red')
+    except ValueError:
+        print("Попередження: довжина ключа 28 не аналізувалася.")
 
-    max_val = coincidences[index_28]
-    max_r = key_lengths[index_28]
+    plt.legend()
+    plt.savefig(path)
+    plt.close()
 
-    plt.text(max_r, max_val + 5,  # Позиція тексту (трохи вище стовпця)
-             f'Найвищий пік: r={max_r} ({max_val})',
-             horizontalalignment='center',
-             color='blue',
-             fontweight='bold')
 
-except ValueError:
-    print("Попередження: довжина ключа 28 не аналізувалася.")
+file_name = 'var_3.txt'
+
+try:
+    with open(file_name, 'r', encoding='utf-8') as f:
+        ciphertext = f.read()
+except FileNotFoundError:
+    print(f"ПОМИЛКА: Файл '{file_name}' не знайдено")
+
+    exit()
+
+max_key_length = 30
+key_lengths, coincidences = calculate_coincidences(ciphertext, max_key_length)
 
-plt.legend()
-plt.show()
+plot_coincidences(key_lengths, coincidences)
+print(f"Діаграму збережено у '{DIAGRAM_FILE}'")
@@ -2,7 +2,7 @@
 import os
 from itertools import combinations, product
 from utils import get_top_bigrams, bigram_to_num, modulus, solve_linear_congruence, alphabet
-from scoring import score_as_russian, decrypt_ciphertext
+from scoring import score_as_russian, decrypt_ciphertext, encode_ciphertext
 
 top_russian_bigrams = ['ст', 'но', 'то', 'на', 'ен']
 
@@ -46,8 +46,9 @@ def generate_key_candidates(top_russian_numbers, top_cipher_numbers):
 
 def rank_and_save(keys, cleaned_ciphertext, results_dir):
     rankings = []
+    cipher_nums = encode_ciphertext(cleaned_ciphertext)
     for a, b in keys:
-        plaintext = decrypt_ciphertext(cleaned_ciphertext, a, b)
+        plaintext = decrypt_ciphertext(cleaned_ciphertext, a, b, cipher_nums)
         if plaintext:
             score, metrics = score_as_russian(plaintext)
             rankings.append((score, a, b, plaintext, metrics))
@@ -1,4 +1,5 @@
 # scoring.py
+from collections import Counter
 from utils import alphabet, bigram_to_num, num_to_bigram, modular_inverse, modulus
 
 common_letters = ['о', 'а', 'е', 'и', 'н', 'т']
@@ -15,7 +16,8 @@ def score_as_russian(text, min_length=100):
     if text_length == 0:
         return -float('inf'), {}
       
-    letter_frequencies = {letter: cleaned_text.count(letter) / text_length for letter in alphabet}
+    letter_counts = Counter(cleaned_text)
+    letter_frequencies = {letter: letter_counts[letter] / text_length for letter in alphabet}
   
     common_freq_sum = sum(letter_frequencies.get(letter, 0) for letter in common_letters)
     rare_freq_sum = sum(letter_frequencies.get(letter, 0) for letter in rare_letters)
@@ -26,19 +28,28 @@ def score_as_russian(text, min_length=100):
   
     return score, {'common_freq_sum': common_freq_sum, 'rare_freq_sum': rare_freq_sum, 'overlap_ratio': overlap_ratio}
 
-def decrypt_ciphertext(ciphertext, a, b):
+def encode_ciphertext(ciphertext):
+    cleaned_ciphertext = ''.join(c for c in ciphertext if c in alphabet)
+    cleaned_ciphertext = cleaned_ciphertext[:len(cleaned_ciphertext) // 2 * 2]
+  
+    return [bigram_to_num(cleaned_ciphertext[i:i+2]) for i in range(0, len(cleaned_ciphertext), 2)]
+
+def decryption_table(a, b):
+    # Таблиця на всі 961 біграми: номер біграми шифротексту -> біграма відкритого тексту
     inv_a = modular_inverse(a, modulus)
   
     if inv_a is None:
         return None
       
-    cleaned_ciphertext = ''.join(c for c in ciphertext if c in alphabet)
-    cleaned_ciphertext = cleaned_ciphertext[:len(cleaned_ciphertext) // 2 * 2]
+    return [num_to_bigram((inv_a * (y - b)) % modulus) for y in range(modulus)]
+
+def decrypt_ciphertext(ciphertext, a, b, cipher_nums=None):
+    table = decryption_table(a, b)
   
-    plaintext = ''
-    for i in range(0, len(cleaned_ciphertext), 2):
-        cipher_bigram_num = bigram_to_num(cleaned_ciphertext[i:i+2])
-        plain_bigram_num = (inv_a * (cipher_bigram_num - b)) % modulus
-        plaintext += num_to_bigram(plain_bigram_num)
+    if table is None:
+        return None
+      
+    if cipher_nums is None:
+        cipher_nums = encode_ciphertext(ciphertext)
       
-    return plaintext
+    return ''.join(map(table.__getitem__, cipher_nums))
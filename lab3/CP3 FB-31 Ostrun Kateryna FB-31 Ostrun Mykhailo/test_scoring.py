@@ -0,0 +1,38 @@
+# test_scoring.py
+import os
+import random
+
+from scoring import decrypt_ciphertext, encode_ciphertext
+from utils import alphabet, bigram_to_num, extended_euclid, modular_inverse, modulus, num_to_bigram
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def read(name):
+    with open(os.path.join(HERE, name), encoding='utf-8') as f:
+        return f.read().strip()
+
+def naive_decrypt(ciphertext, a, b):
+    # Побіграмне розшифрування, як до таблиці на всі 961 біграми
+    cleaned = ''.join(c for c in ciphertext if c in alphabet)
+    cleaned = cleaned[:len(cleaned) // 2 * 2]
+    inv_a = modular_inverse(a, modulus)
+    return ''.join(num_to_bigram((inv_a * (bigram_to_num(cleaned[i:i+2]) - b)) % modulus)
+                   for i in range(0, len(cleaned), 2))
+
+def test_decrypts_variant_with_found_key():
+    ciphertext = ''.join(c.lower() for c in read('08.txt') if c.lower() in alphabet)
+    assert decrypt_ciphertext(ciphertext, 17, 94) == read(os.path.join('results', 'decrypted.txt'))
+
+def test_decrypt_matches_naive():
+    rng = random.Random(9)
+    ciphertext = ''.join(rng.choice(alphabet + ' ,') for _ in range(301))
+    cipher_nums = encode_ciphertext(ciphertext)
+    for a in rng.sample(range(1, modulus), 40):
+        b = rng.randrange(modulus)
+        if extended_euclid(a, modulus)[0] != 1:
+            assert decrypt_ciphertext(ciphertext, a, b) is None
+            continue
+        expected = naive_decrypt(ciphertext, a, b)
+        assert decrypt_ciphertext(ciphertext, a, b) == expected
+        assert decrypt_ciphertext(ciphertext, a, b, cipher_nums) == expected
+    assert decrypt_ciphertext(ciphertext, 31, 0) is None
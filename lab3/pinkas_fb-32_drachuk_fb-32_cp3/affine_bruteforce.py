@@ -0,0 +1,104 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=4)
+def encode_bigrams(text, alphabet):
+    # Шифротекст -> масив номерів біграм без перетину (X = x1*n + x2), кодується один раз (результат не змінювати)
+    n = len(alphabet)
+    index = {char: i for i, char in enumerate(alphabet)}
+    codes = np.fromiter((index[char] for char in text), dtype=np.int16, count=len(text))
+    codes = codes[:len(codes) - len(codes) % 2]
+    return codes[0::2] * n + codes[1::2]
+
+
+def decryption_table(a, b, m):
+    # Перестановка на m біграмах: Y -> X = a^(-1) * (Y - b) mod m, будується один раз на ключ
+    return (pow(int(a), -1, m) * (np.arange(m, dtype=np.int64) - b)) % m
+
+
+def decrypt_bigrams(cipher_bigrams, a, b, alphabet):
+    # Розшифрування всього тексту індексуванням таблиці, без побудови рядка по біграмах
+    n = len(alphabet)
+    plain = decryption_table(a, b, n * n)[cipher_bigrams]
+    codepoints = np.array([ord(char) for char in alphabet], dtype=np.uint32)
+    chars = np.empty((len(plain), 2), dtype=np.uint32)
+    chars[:, 0] = codepoints[plain // n]
+    chars[:, 1] = codepoints[plain % n]
+    return chars.tobytes().decode('utf-32-le')
+
+
+def bigram_log_prob_table(reference_text, alphabet, smoothing=0.5):
+    # Логарифми ймовірностей 961 біграми за еталонним (очищеним) текстом, біграми з перетином
+    n = len(alphabet)
+    index = {char: i for i, char in enumerate(alphabet)}
+    codes = np.array([index[char] for char in reference_text if char in index], dtype=np.int64)
+    counts = np.bincount(codes[:-1] * n + codes[1:], minlength=n * n)
+    return np.log((counts + smoothing) / (counts.sum() + smoothing * n * n))
+
+
+def monogram_log_prob_table(freq_letters_lang, alphabet, forbidden_bigrams=(), penalty=-20.0):
+    # Наближення без корпусу: log P(x1 x2) = log p(x1) + log p(x2), заборонені біграми отримують штраф
+    n = len(alphabet)
+    floor = 1e-5
+    letter_log = np.array([math.log(max(freq_letters_lang.get(char, 0.0), floor)) for char in alphabet])
+    table = (letter_log[:, None] + letter_log[None, :]).ravel()
+    for bigram in forbidden_bigrams:
+        if bigram[0] in alphabet and bigram[1] in alphabet:
+            table[alphabet.index(bigram[0]) * n + alphabet.index(bigram[1])] = penalty
+    return table
+
+
+def invertible_keys_a(m):
+    a = np.arange(1, m)
+    return a[np.gcd(a, m) == 1]
+
+
+def score_keys(cipher_bigrams, log_probs, a_values, m):
+    # Оцінки всіх ключів (a, b), b = 0..m-1, для заданих a: X = a^(-1) * (Y - b) mod m
+    Y, weights = np.unique(cipher_bigrams, return_counts=True)
+    a_inv = np.array([pow(int(a), -1, m) for a in a_values], dtype=np.int64)
+    b = np.arange(m, dtype=np.int64)
+    shifted = (Y[None, :].astype(np.int64) - b[:, None]) % m
+    X = (a_inv[:, None, None] * shifted[None, :, :]) % m
+    return log_probs[X] @ weights
+
+
+def score_key(cipher_bigrams, log_probs, a, b, m):
+    Y, weights = np.unique(cipher_bigrams, return_counts=True)
+    X = (pow(int(a), -1, m) * (Y.astype(np.int64) - b)) % m
+    return float(log_probs[X] @ weights)
+
+
+def brute_force(cipher_bigrams, log_probs, m, prefix=256, top_k=20, block=16):
+    """
+    Повний перебір усіх ключів (a, b), gcd(a, m) = 1.
+    Спочатку всі ключі оцінюються на перших prefix біграмах, потім top_k найкращих — на всьому тексті.
+    Повертає список (середній логарифм ймовірності біграми, a, b), найкращі першими.
+    """
+    a_all = invertible_keys_a(m)
+    prefix_bigrams = cipher_bigrams[:prefix]
+
+    best_scores = np.empty(0)
+    best_keys = np.empty((0, 2), dtype=np.int64)
+    for start in range(0, len(a_all), block):
+        a_block = a_all[start:start + block]
+        scores = score_keys(prefix_bigrams, log_probs, a_block, m).ravel()
+        keep = min(top_k, len(scores))
+        top = np.argpartition(scores, -keep)[-keep:]
+        keys = np.stack((a_block[top // m], top % m), axis=1)
+
+        best_scores = np.concatenate((best_scores, scores[top]))
+        best_keys = np.concatenate((best_keys, keys))
+        if len(best_scores) > top_k:
+            order = np.argpartition(best_scores, -top_k)[-top_k:]
+            best_scores, best_keys = best_scores[order], best_keys[order]
+
+    results = []
+    for a, b in best_keys:
+        full_score = score_key(cipher_bigrams, log_probs, a, b, m)
+        results.append((full_score / len(cipher_bigrams), int(a), int(b)))
+    results.sort(reverse=True)
+    return results
@@ -4,6 +4,10 @@ import pandas as pd
 import openpyxl 
 from itertools import product, permutations
 import os
+import sys
+
+import affine_bruteforce
+import lang_detector
 
 def read_text(io_dir, filename):
     path = os.path.join(io_dir, filename)
@@ -155,22 +159,14 @@ def afinne_decrypt(cipher, a, b, alphabet):
     n = len(alphabet)
     m = n**2
 
-    bigrams = []
-    for i in range(0, len(cipher)-1, 2):
-        Y_bigram = cipher[i:i+2]
-        
-        Y = bigram_to_num(Y_bigram, alphabet, n)
-
-        # Припускаємо, що той, хто шифрував повідомлення, не використовував ключ, який допускає неоднозначність розшифрування
-        # Тому, що, наприклад, при неоднозначності 3-ьох біграм з 2-ма розв'язками, у нас, відповідно, буде 6 варіацій розшифрування
-        if gcd(a, m) != 1: # у нас не буде кількох розв'язків, якщо a і m - взаємнопрості
-            return None
-        
-        X = linear_comparison(a, Y - b, m)[0] # беремо перший елемент, бо ф-ція повертає список
-        X_bigram = num_to_bigram(X, alphabet, n)
-        bigrams.append(X_bigram)
+    # Припускаємо, що той, хто шифрував повідомлення, не використовував ключ, який допускає неоднозначність розшифрування
+    # Тому, що, наприклад, при неоднозначності 3-ьох біграм з 2-ма розв'язками, у нас, відповідно, буде 6 варіацій розшифрування
+    if gcd(a, m) != 1: # у нас не буде кількох розв'язків, якщо a і m - взаємнопрості
+        return None
 
-    decrypted = "".join(bigrams)
+    # Шифротекст кодується в масив номерів біграм один раз (кешується), далі для ключа будується таблиця на 961 біграму
+    Y = affine_bruteforce.encode_bigrams(cipher, alphabet)
+    decrypted = affine_bruteforce.decrypt_bigrams(Y, a, b, alphabet)
     return decrypted
 
 def afinne_key_freq_decrypt(X1_bigram, X2_bigram, Y1_bigram, Y2_bigram, alphabet):
@@ -191,59 +187,30 @@ def afinne_key_freq_decrypt(X1_bigram, X2_bigram, Y1_bigram, Y2_bigram, alphabet
         keys.append([a, b])
     return keys
 
-def rus_lang_detector(text, forbidden_bigrams, top_lang_bigrams, freq_letters_lang, alphabet):
-    counts_m, total_count_m = count_ngrams(text, alphabet, n=1)
-    freqs_m = freq_ngrams(counts_m, total_count_m)
-    counts_b, total_count_b = count_ngrams(text, alphabet, n=2, overlap=True)
-    freqs_b = freq_ngrams(counts_b, total_count_b)
-
-    #Критерій заборонених l-грам
-    count_forbidden = 0
-    for bigram in forbidden_bigrams:
-        freq = freqs_b[bigram]
-        if freq > 0.001:
-            count_forbidden += 1
-    
-    if count_forbidden >= 2: # до прикладу ми аналізуємо текст довжини 1001 символу. Одна описка ОК, дві НЕ ОК
-        return False
-    
-    #Критерій частих l-грам
-    sorted_freqs = sorted(freqs_b.items(), key=lambda x: x[1], reverse=True)[:5]
-
-    top_text_bigrams = []
-    for i in range(len(sorted_freqs)):
-        freq = sorted_freqs[i]
-        bigram = freq[0]
-        top_text_bigrams.append(bigram)
-    
-    count_top_lang = 0
-    for bigram in top_text_bigrams:
-        if bigram in top_lang_bigrams:
-            count_top_lang += 1
-
-    if count_top_lang < 2:
-        return False
-
-    # Перевірка частот частих літер
-    # Гіпотеза: сумарна частота 5-ти найчастіших літер в мові - 41%. Відповідно, частота цих літер в тексті буде +-20% від частоти в мові (33-49%)
-    sorted_lang = sorted(freq_letters_lang.items(), key=lambda x: x[1], reverse=True)
-
-    top5_lang_sum = 0
-    for i in range(5):
-        top5_lang_sum += sorted_lang[i][1]
-
-    sorted_text = sorted(freqs_m.items(), key=lambda x: x[1], reverse=True)
-    top5_text_sum = 0
-    for i in range(5):
-        top5_text_sum += sorted_text[i][1]
-
-    low= top5_lang_sum * 0.8
-    high = top5_lang_sum * 1.2
+def rus_lang_detector(text, forbidden_bigrams, top_lang_bigrams, freq_letters_lang, alphabet, margin=None):
+    # Критерії заборонених l-грам, частих l-грам та частот частих літер - див. lang_detector.StreamingLangDetector
+    # margin вмикає ранню відмову за середнім логарифмом ймовірності біграм (за замовчуванням вимкнена)
+    detector = lang_detector.StreamingLangDetector(alphabet, freq_letters_lang, forbidden_bigrams, top_lang_bigrams,
+                                                   margin=margin)
+    return detector.detect_text(text)
+
+def brute_force_keys(text, alphabet, freq_letters_lang, forbidden_bigrams, top_k=20):
+    # Якщо задано еталонний текст (REFERENCE_TEXT), оцінка за його біграмами, інакше - за частотами літер
+    reference_path = os.environ.get("REFERENCE_TEXT")
+    if reference_path:
+        reference = filt_text(read_text(*os.path.split(reference_path)), "output", "reference.txt")
+        log_probs = affine_bruteforce.bigram_log_prob_table(reference, alphabet)
+    else:
+        log_probs = affine_bruteforce.monogram_log_prob_table(freq_letters_lang, alphabet, forbidden_bigrams)
 
-    if low > top5_text_sum or high < top5_text_sum:
-        return False
+    cipher_bigrams = affine_bruteforce.encode_bigrams(text, alphabet)
+    ranked = affine_bruteforce.brute_force(cipher_bigrams, log_probs, len(alphabet) ** 2, top_k=top_k)
 
-    return True
+    print("Повний перебір ключів, найкращі за логарифмом ймовірності:")
+    for score, a, b in ranked[:5]:
+        print(f"a = {a:4d},  b = {b:4d},  score = {score:.4f}")
+    print()
+    return [[a, b] for _, a, b in ranked]
 
 def main():
     # літери ьы поміняні місцями, відповідно до їх розміщення в алфавіті, оскільки шифротекст, як виявилось, чомусь має такий порядок букв
@@ -268,8 +235,20 @@ def main():
     top_ct_bigrams= dict_visualization(output_dir, freqs, ["Bigram", "Freq"], sort=True)
     top_lang_bigrams = ["ст", "но", "то", "на", "ен"]
 
+    forbidden_bigrams = ["аь", "оь", "еь", "иь", "ыь", "эь", "юь", "яь","ьь", "йь", "ьй", "ьы", "яы"]
+    freq_letters_lang = {'о': 0.1148, 'е': 0.0867, 'а': 0.0757, 'н': 0.0673, 'и': 0.0631, 'т': 0.0621, 'с': 0.057, 'л': 0.0491, 'в': 0.0427,
+                        'р': 0.0424, 'м': 0.036, 'к': 0.034, 'д': 0.0312, 'у': 0.0283, 'п': 0.0264, 'я': 0.0216, 'ы': 0.019, 'ь': 0.0188,
+                        'г': 0.0175, 'з': 0.0166, 'б': 0.0164, 'ч': 0.0156, 'й': 0.0118, 'ж': 0.0102, 'х': 0.0091, 'ш': 0.0082, 'ю': 0.0056,
+                        'э': 0.0046, 'ц': 0.0031, 'щ': 0.0031, 'ф': 0.0016, 'ъ': 0.0003}
+
     all_keys = []
-    for b_x1, b_x2 in permutations(top_lang_bigrams, 2):
+    lang_bigram_pairs = permutations(top_lang_bigrams, 2)
+    if "--brute-force" in sys.argv:
+        # Повний перебір усіх 930*961 ключів замість ключів з 5-ти найчастіших біграм
+        all_keys = brute_force_keys(text, alphabet, freq_letters_lang, forbidden_bigrams)
+        lang_bigram_pairs = []
+
+    for b_x1, b_x2 in lang_bigram_pairs:
         for b_y1, b_y2 in permutations(top_ct_bigrams, 2):
             keys = afinne_key_freq_decrypt(b_x1, b_x2, b_y1, b_y2, alphabet)
 
@@ -288,20 +267,21 @@ def main():
 
     print(f"Знайдено {len(all_keys)} ключів\n")
 
-    forbidden_bigrams = ["аь", "оь", "еь", "иь", "ыь", "эь", "юь", "яь","ьь", "йь", "ьй", "ьы", "яы"]
-    freq_letters_lang = {'о': 0.1148, 'е': 0.0867, 'а': 0.0757, 'н': 0.0673, 'и': 0.0631, 'т': 0.0621, 'с': 0.057, 'л': 0.0491, 'в': 0.0427,
-                        'р': 0.0424, 'м': 0.036, 'к': 0.034, 'д': 0.0312, 'у': 0.0283, 'п': 0.0264, 'я': 0.0216, 'ы': 0.019, 'ь': 0.0188,
-                        'г': 0.0175, 'з': 0.0166, 'б': 0.0164, 'ч': 0.0156, 'й': 0.0118, 'ж': 0.0102, 'х': 0.0091, 'ш': 0.0082, 'ю': 0.0056,
-                        'э': 0.0046, 'ц': 0.0031, 'щ': 0.0031, 'ф': 0.0016, 'ъ': 0.0003}
-    
     result = []
     print("Розшифрування за знайденими ключами та аналіз на відповідність текстів російській мові...")
+    # Детектор будується один раз; кожен ключ розшифровує текст блоками, доки критерії не відкинуть його.
+    # З --early-exit неправильні ключі додатково відкидаються за логарифмом ймовірності префікса
+    margin = 0.5 if "--early-exit" in sys.argv else None
+    detector = lang_detector.StreamingLangDetector(alphabet, freq_letters_lang, forbidden_bigrams, top_lang_bigrams,
+                                                   margin=margin)
+    cipher_bigrams = affine_bruteforce.encode_bigrams(text, alphabet)
     for a, b in all_keys:
-        dec_text = afinne_decrypt(text, a, b, alphabet)
-        #print(f"ВТ: {dec_text[:80]}...\n")
+        if gcd(a, len(alphabet)**2) != 1:
+            continue
 
-        detect = rus_lang_detector(dec_text, forbidden_bigrams, top_lang_bigrams, freq_letters_lang, alphabet)
+        detect = detector.detect_key(cipher_bigrams, a, b)
         if detect:
+            dec_text = afinne_decrypt(text, a, b, alphabet)
             print(f"Виявлено потенційний текст: {dec_text[:55]}...\n")
             result.append([dec_text, a, b])
     
@@ -0,0 +1,119 @@
+import numpy as np
+
+import affine_bruteforce
+
+
+def encode_letters(text, alphabet):
+    # Як у filt_text: регістр і ё/ъ зводяться до алфавіту, решта символів (пробіли, розділові знаки) відкидаються
+    index = {char: i for i, char in enumerate(alphabet)}
+    text = text.lower().replace("ё", "е").replace("ъ", "ь")
+    return np.array([index[char] for char in text if char in index], dtype=np.int64)
+
+
+def iter_decrypted_blocks(cipher_bigrams, a, b, alphabet, block=128):
+    # Розшифрування блоками по block біграм: якщо текст відкинуто на початку, решта не розшифровується
+    n = len(alphabet)
+    table = affine_bruteforce.decryption_table(a, b, n * n)
+    for start in range(0, len(cipher_bigrams), block):
+        plain = table[cipher_bigrams[start:start + block]]
+        codes = np.empty(2 * len(plain), dtype=np.int64)
+        codes[0::2] = plain // n
+        codes[1::2] = plain % n
+        yield codes
+
+
+class StreamingLangDetector:
+    """
+    Ті самі критерії, що й у rus_lang_detector, але текст переглядається блоками:
+    після кожного блоку текст відкидається, щойно прийняти його вже неможливо (заборонені біграми,
+    надто часті 5 найчастіших літер), тож рішення збігаються з перевіркою всього тексту.
+    margin вмикає додаткову евристику: відмова, якщо середній логарифм ймовірності біграми
+    префікса нижчий за поріг (швидше, але може відкинути текст, який пройшов би критерії).
+    Частоти n-грам накопичуються через np.bincount у масивах за номерами біграм.
+    """
+
+    def __init__(self, alphabet, freq_letters_lang, forbidden_bigrams, top_lang_bigrams,
+                 forbidden_freq=0.001, max_forbidden=2, min_prefix=256, margin=None):
+        n = len(alphabet)
+        self.alphabet = alphabet
+        self.n = n
+        self.forbidden_freq = forbidden_freq
+        self.max_forbidden = max_forbidden
+        self.min_prefix = min_prefix
+
+        self.forbidden_codes = np.array([alphabet.index(bg[0]) * n + alphabet.index(bg[1]) for bg in forbidden_bigrams
+                                         if bg[0] in alphabet and bg[1] in alphabet], dtype=np.int64)
+        self.is_top_lang = np.zeros(n * n, dtype=bool)
+        for bg in top_lang_bigrams:
+            self.is_top_lang[alphabet.index(bg[0]) * n + alphabet.index(bg[1])] = True
+
+        # Поріг середнього log P(біграми): між очікуваним значенням для мови та для випадкового тексту
+        self.log_probs = None
+        if margin is not None:
+            self.log_probs = affine_bruteforce.monogram_log_prob_table(freq_letters_lang, alphabet)
+            letter_probs = np.array([freq_letters_lang.get(char, 0.0) for char in alphabet])
+            letter_probs /= letter_probs.sum()
+            expected = float(np.outer(letter_probs, letter_probs).ravel() @ self.log_probs)
+            self.min_avg_log_prob = expected - margin * (expected - float(self.log_probs.mean()))
+
+        # Гіпотеза: сумарна частота 5-ти найчастіших літер в тексті +-20% від частоти в мові
+        top5_lang_sum = sum(sorted(freq_letters_lang.values(), reverse=True)[:5])
+        self.top5_low = top5_lang_sum * 0.8
+        self.top5_high = top5_lang_sum * 1.2
+
+    def detect(self, blocks, length):
+        # blocks - послідовні масиви номерів літер, length - довжина всього тексту
+        n = self.n
+        if length < 2:
+            return False
+        forbidden_limit = self.forbidden_freq * (length - 1) # freq > 0.001 <=> count > 0.001 * total_count_b
+        counts_m = np.zeros(n, dtype=np.int64)
+        counts_b = np.zeros(n * n, dtype=np.int64)
+        log_sum = 0.0
+        seen = 0
+        prev = None
+
+        for codes in blocks:
+            if prev is not None:
+                codes_ext = np.concatenate(([prev], codes))
+            else:
+                codes_ext = codes
+            bigrams = codes_ext[:-1] * n + codes_ext[1:]
+            counts_m += np.bincount(codes, minlength=n)
+            counts_b += np.bincount(bigrams, minlength=n * n)
+            prev = codes[-1]
+
+            # Критерій заборонених l-грам: кількості лише зростають, тож відмова остаточна
+            if np.count_nonzero(counts_b[self.forbidden_codes] > forbidden_limit) >= self.max_forbidden:
+                return False
+
+            # Сума 5-ти найбільших кількостей літер теж лише зростає: перевищення верхньої межі остаточне
+            if np.sort(counts_m)[-5:].sum() / length > self.top5_high:
+                return False
+
+            if self.log_probs is not None:
+                log_sum += float(self.log_probs[bigrams].sum())
+                seen += len(bigrams)
+                if seen >= self.min_prefix and log_sum / seen < self.min_avg_log_prob:
+                    return False
+
+        #Критерій частих l-грам (сортування стабільне, як sorted по словнику в порядку алфавіту)
+        top_text_bigrams = np.argsort(-counts_b, kind="stable")[:5]
+        if np.count_nonzero(self.is_top_lang[top_text_bigrams]) < 2:
+            return False
+
+        # Перевірка частот частих літер
+        top5_text_sum = np.sort(counts_m)[::-1][:5].sum() / length
+        if self.top5_low > top5_text_sum or self.top5_high < top5_text_sum:
+            return False
+
+        return True
+
+    def detect_text(self, text):
+        codes = encode_letters(text, self.alphabet)
+        return self.detect([codes], len(codes))
+
+    def detect_key(self, cipher_bigrams, a, b, block=128):
+        # Перевірка ключа без повного розшифрування: неправильні ключі відкидаються після кількох сотень літер
+        blocks = iter_decrypted_blocks(cipher_bigrams, a, b, self.alphabet, block)
+        return self.detect(blocks, 2 * len(cipher_bigrams))
@@ -0,0 +1,91 @@
+import os
+import random
+
+import numpy as np
+
+import affine_bruteforce
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщьыэюя"
+M = len(ALPHABET) ** 2
+FREQ_LETTERS_LANG = {'о': 0.1148, 'е': 0.0867, 'а': 0.0757, 'н': 0.0673, 'и': 0.0631, 'т': 0.0621, 'с': 0.057, 'л': 0.0491,
+                     'в': 0.0427, 'р': 0.0424, 'м': 0.036, 'к': 0.034, 'д': 0.0312, 'у': 0.0283, 'п': 0.0264, 'я': 0.0216,
+                     'ы': 0.019, 'ь': 0.0188, 'г': 0.0175, 'з': 0.0166, 'б': 0.0164, 'ч': 0.0156, 'й': 0.0118, 'ж': 0.0102,
+                     'х': 0.0091, 'ш': 0.0082, 'ю': 0.0056, 'э': 0.0046, 'ц': 0.0031, 'щ': 0.0031, 'ф': 0.0016}
+KEY = (703, 956)
+
+with open(os.path.join(HERE, "output", "clean_11.txt"), encoding="utf-8") as f:
+    CIPHERTEXT = f.read()
+
+
+def naive_score(cipher_bigrams, log_probs, a, b):
+    a_inv = pow(a, -1, M)
+    return sum(log_probs[a_inv * (int(y) - b) % M] for y in cipher_bigrams)
+
+
+def test_encode_bigrams_matches_alphabet_index():
+    bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT[:101], ALPHABET)
+    n = len(ALPHABET)
+    assert bigrams.tolist() == [ALPHABET.index(CIPHERTEXT[i]) * n + ALPHABET.index(CIPHERTEXT[i + 1])
+                                for i in range(0, 100, 2)]
+
+
+def test_invertible_keys_a():
+    assert affine_bruteforce.invertible_keys_a(M).tolist() == [a for a in range(1, M) if np.gcd(a, M) == 1]
+    assert len(affine_bruteforce.invertible_keys_a(M)) == 930
+
+
+def test_score_keys_matches_naive():
+    cipher_bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT, ALPHABET)[:300]
+    log_probs = affine_bruteforce.monogram_log_prob_table(FREQ_LETTERS_LANG, ALPHABET, ["аь", "ьь"])
+    generator = random.Random(8)
+    a_values = np.array([generator.choice(affine_bruteforce.invertible_keys_a(M)) for _ in range(3)])
+    scores = affine_bruteforce.score_keys(cipher_bigrams, log_probs, a_values, M)
+    assert scores.shape == (3, M)
+    for i, a in enumerate(a_values):
+        for b in [0, 1, generator.randrange(M), M - 1]:
+            expected = naive_score(cipher_bigrams, log_probs, int(a), b)
+            assert np.isclose(scores[i, b], expected)
+            assert np.isclose(affine_bruteforce.score_key(cipher_bigrams, log_probs, a, b, M), expected)
+
+
+def test_log_prob_tables():
+    table = affine_bruteforce.monogram_log_prob_table(FREQ_LETTERS_LANG, ALPHABET, ["аь"])
+    n = len(ALPHABET)
+    assert np.isclose(table[ALPHABET.index("о") * n + ALPHABET.index("н")],
+                      np.log(FREQ_LETTERS_LANG["о"]) + np.log(FREQ_LETTERS_LANG["н"]))
+    assert table[ALPHABET.index("а") * n + ALPHABET.index("ь")] == -20.0
+    bigram_table = affine_bruteforce.bigram_log_prob_table("абаб", ALPHABET)
+    assert np.isclose(np.exp(bigram_table).sum(), 1.0)
+    assert bigram_table[1] > bigram_table[0]
+
+
+def test_brute_force_finds_lab_key():
+    cipher_bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT, ALPHABET)
+    log_probs = affine_bruteforce.monogram_log_prob_table(FREQ_LETTERS_LANG, ALPHABET)
+    ranked = affine_bruteforce.brute_force(cipher_bigrams, log_probs, M, top_k=5)
+    assert [score for score, _, _ in ranked] == sorted((score for score, _, _ in ranked), reverse=True)
+    assert (ranked[0][1], ranked[0][2]) == KEY
+    assert np.isclose(ranked[0][0], naive_score(cipher_bigrams, log_probs, *KEY) / len(cipher_bigrams))
+
+
+def naive_decrypt(text, a, b):
+    n = len(ALPHABET)
+    a_inv = pow(a, -1, M)
+    plain = ""
+    for i in range(0, len(text) - 1, 2):
+        x = a_inv * (ALPHABET.index(text[i]) * n + ALPHABET.index(text[i + 1]) - b) % M
+        plain += ALPHABET[x // n] + ALPHABET[x % n]
+    return plain
+
+
+def test_decrypt_bigrams_matches_naive():
+    text = CIPHERTEXT[:401]
+    cipher_bigrams = affine_bruteforce.encode_bigrams(text, ALPHABET)
+    generator = random.Random(9)
+    for _ in range(20):
+        a = int(generator.choice(affine_bruteforce.invertible_keys_a(M)))
+        b = generator.randrange(M)
+        assert affine_bruteforce.decrypt_bigrams(cipher_bigrams, a, b, ALPHABET) == naive_decrypt(text, a, b)
+    table = affine_bruteforce.decryption_table(*KEY, M)
+    assert sorted(table.tolist()) == list(range(M))
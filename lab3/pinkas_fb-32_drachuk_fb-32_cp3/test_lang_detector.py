@@ -0,0 +1,93 @@
+import os
+import random
+from itertools import permutations
+
+import pytest
+
+import affine_bruteforce
+import lab3
+import lang_detector
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщьыэюя"
+TOP_LANG_BIGRAMS = ["ст", "но", "то", "на", "ен"]
+FORBIDDEN_BIGRAMS = ["аь", "оь", "еь", "иь", "ыь", "эь", "юь", "яь", "ьь", "йь", "ьй", "ьы", "яы"]
+FREQ_LETTERS_LANG = {'о': 0.1148, 'е': 0.0867, 'а': 0.0757, 'н': 0.0673, 'и': 0.0631, 'т': 0.0621, 'с': 0.057, 'л': 0.0491,
+                     'в': 0.0427, 'р': 0.0424, 'м': 0.036, 'к': 0.034, 'д': 0.0312, 'у': 0.0283, 'п': 0.0264, 'я': 0.0216,
+                     'ы': 0.019, 'ь': 0.0188, 'г': 0.0175, 'з': 0.0166, 'б': 0.0164, 'ч': 0.0156, 'й': 0.0118, 'ж': 0.0102,
+                     'х': 0.0091, 'ш': 0.0082, 'ю': 0.0056, 'э': 0.0046, 'ц': 0.0031, 'щ': 0.0031, 'ф': 0.0016, 'ъ': 0.0003}
+KEY = (703, 956)
+
+with open(os.path.join(HERE, "output", "clean_11.txt"), encoding="utf-8") as f:
+    CIPHERTEXT = f.read()
+
+
+def reference_detector(text):
+    # Початкова реалізація rus_lang_detector на словниках
+    freqs_m = lab3.freq_ngrams(*lab3.count_ngrams(text, ALPHABET, n=1))
+    freqs_b = lab3.freq_ngrams(*lab3.count_ngrams(text, ALPHABET, n=2, overlap=True))
+    if sum(freqs_b[bigram] > 0.001 for bigram in FORBIDDEN_BIGRAMS) >= 2:
+        return False
+    top_text_bigrams = [bigram for bigram, _ in sorted(freqs_b.items(), key=lambda x: x[1], reverse=True)[:5]]
+    if sum(bigram in TOP_LANG_BIGRAMS for bigram in top_text_bigrams) < 2:
+        return False
+    top5_lang_sum = sum(sorted(FREQ_LETTERS_LANG.values(), reverse=True)[:5])
+    top5_text_sum = sum(sorted(freqs_m.values(), reverse=True)[:5])
+    return top5_lang_sum * 0.8 <= top5_text_sum <= top5_lang_sum * 1.2
+
+
+def candidate_keys():
+    # Ключі, які перевіряє main: з пар 5-ти найчастіших біграм мови й шифротексту, плюс випадкові ключі
+    counts, _ = lab3.count_ngrams(CIPHERTEXT, ALPHABET, n=2)
+    top_ct_bigrams = sorted(counts, key=counts.get, reverse=True)[:5]
+    keys = {KEY}
+    for b_x1, b_x2 in permutations(TOP_LANG_BIGRAMS, 2):
+        for b_y1, b_y2 in permutations(top_ct_bigrams, 2):
+            keys.update(tuple(key) for key in lab3.afinne_key_freq_decrypt(b_x1, b_x2, b_y1, b_y2, ALPHABET) or [])
+    generator = random.Random(11)
+    a_values = affine_bruteforce.invertible_keys_a(len(ALPHABET) ** 2)
+    keys.update((int(generator.choice(a_values)), generator.randrange(len(ALPHABET) ** 2)) for _ in range(200))
+    return sorted(key for key in keys if lab3.gcd(key[0], len(ALPHABET) ** 2) == 1)
+
+
+def make_detector(margin=None):
+    return lang_detector.StreamingLangDetector(ALPHABET, FREQ_LETTERS_LANG, FORBIDDEN_BIGRAMS, TOP_LANG_BIGRAMS,
+                                               margin=margin)
+
+
+def test_decisions_match_reference():
+    detector = make_detector()
+    cipher_bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT, ALPHABET)
+    accepted = []
+    for a, b in candidate_keys():
+        text = lab3.afinne_decrypt(CIPHERTEXT, a, b, ALPHABET)
+        expected = reference_detector(text)
+        assert detector.detect_key(cipher_bigrams, a, b) == expected, (a, b)
+        assert detector.detect_text(text) == expected, (a, b)
+        if expected:
+            accepted.append((a, b))
+    assert accepted == [KEY]
+
+
+@pytest.mark.parametrize('block', [1, 7, 128, 10000])
+def test_block_size_does_not_change_decision(block):
+    detector = make_detector()
+    cipher_bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT, ALPHABET)
+    assert detector.detect_key(cipher_bigrams, *KEY, block=block)
+    assert not detector.detect_key(cipher_bigrams, KEY[0], KEY[1] + 1, block=block)
+
+
+def test_log_prob_cutoff_is_opt_in():
+    cipher_bigrams = affine_bruteforce.encode_bigrams(CIPHERTEXT, ALPHABET)
+    assert make_detector().log_probs is None
+    assert make_detector(margin=0.5).detect_key(cipher_bigrams, *KEY)
+    plain = lab3.afinne_decrypt(CIPHERTEXT, *KEY, ALPHABET)
+    assert lab3.rus_lang_detector(plain, FORBIDDEN_BIGRAMS, TOP_LANG_BIGRAMS, FREQ_LETTERS_LANG, ALPHABET)
+
+
+def test_encode_letters_normalizes_like_filt_text():
+    codes = lang_detector.encode_letters("Ёж, съел\n- ЩИ!", ALPHABET)
+    assert ''.join(ALPHABET[code] for code in codes) == "ежсьелщи"
+    plain = lab3.afinne_decrypt(CIPHERTEXT, *KEY, ALPHABET)
+    spaced = ' '.join(plain[i:i + 7].upper() for i in range(0, len(plain), 7))
+    assert make_detector().detect_text(spaced)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from helpers.modular_arithmetic import modular_inverse
 
 
@@ -11,23 +11,33 @@ class BigramAffineCipher:
         self.alphabet_len = len(alphabet)
         self.idx_to_bigram = {self.bigram_to_int(c1+c2):c1+c2 for c1 in alphabet for c2 in alphabet}
         self.modulus = self.alphabet_len**2
+        self._encoded_ct = None
     
     def bigram_to_int(self, bigram:str)->Optional[int]:
         if len(bigram) != 2:
             return None
         return self.char_to_idx[bigram[0]]*self.alphabet_len+self.char_to_idx[bigram[1]]
     
-    def decrypt(self, ct: str, a: int, b: int) -> str:
-        res = ""
+    def encode(self, ct: str) -> List[int]:
+        # Номери біграм шифротексту; для останнього переданого тексту беруться з кешу
+        if self._encoded_ct is not None and self._encoded_ct[0] == ct:
+            return self._encoded_ct[1]
         if len(ct) < 2:
             raise ValueError("text should have at least 2 chars")
+        if not set(ct) <= self.char_to_idx.keys():
+            raise ValueError("ct contains values not from alphabet")
+        codes = [self.char_to_idx[ct[i]]*self.alphabet_len+self.char_to_idx[ct[i+1]] for i in range(0, len(ct)-1, 2)]
+        self._encoded_ct = (ct, codes)
+        return codes
+
+    def decryption_table(self, a: int, b: int) -> List[str]:
+        # Перестановка на всіх біграмах: номер біграми шифротексту -> біграма відкритого тексту
         a_inv = modular_inverse(a, self.modulus)
         if a_inv is None:
             raise ValueError(f"can not decrypt with key ({a},{b}) because inverse mod {self.modulus} does not exist for {a}")
-        for i in range(0, len(ct)-1, 2):
-            c1 = ct[i]
-            c2 = ct[i+1]
-            if c1 not in self.alphabet or c2 not in self.alphabet:
-                raise ValueError("ct contains values not from alphabet")
-            res += self.idx_to_bigram[(a_inv * (self.bigram_to_int(c1 + c2) - b)) % self.modulus]
-        return res
\ No newline at end of file
+        return [self.idx_to_bigram[(a_inv * (y - b)) % self.modulus] for y in range(self.modulus)]
+
+    def decrypt(self, ct: str, a: int, b: int) -> str:
+        codes = self.encode(ct)
+        table = self.decryption_table(a, b)
+        return "".join(map(table.__getitem__, codes))
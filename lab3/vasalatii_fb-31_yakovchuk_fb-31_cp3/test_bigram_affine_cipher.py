@@ -0,0 +1,63 @@
+import os
+import random
+
+import pytest
+
+from bigram_affine_cipher import BigramAffineCipher
+from helpers.modular_arithmetic import gcd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+alphabet = "абвгдежзийклмнопрстуфхцчшщьыэюя"
+modulus = len(alphabet) ** 2
+
+
+def read(path):
+    with open(os.path.join(HERE, path), encoding="utf-8") as f:
+        return f.read()
+
+
+def naive_decrypt(ct, a, b):
+    # Посимвольне розшифрування, як до таблиці на всі біграми
+    n = len(alphabet)
+    a_inv = pow(a, -1, modulus)
+    res = ""
+    for i in range(0, len(ct) - 1, 2):
+        y = alphabet.index(ct[i]) * n + alphabet.index(ct[i + 1])
+        x = (a_inv * (y - b)) % modulus
+        res += alphabet[x // n] + alphabet[x % n]
+    return res
+
+
+def test_decrypts_variant_with_known_key():
+    ct = "".join(ch for ch in read("cts/03.txt").lower() if ch in alphabet)
+    assert BigramAffineCipher(alphabet).decrypt(ct, 199, 700) == read("decrypted/03_dec_199_700.txt")
+
+
+def test_decrypt_matches_naive():
+    cipher = BigramAffineCipher(alphabet)
+    rng = random.Random(9)
+    ct = "".join(rng.choice(alphabet) for _ in range(301))
+    keys = [(a, rng.randrange(modulus)) for a in rng.sample(range(1, modulus), 40) if gcd(a, modulus) == 1]
+    for a, b in keys:
+        assert cipher.decrypt(ct, a, b) == naive_decrypt(ct, a, b)
+
+
+def test_decryption_table_is_permutation():
+    table = BigramAffineCipher(alphabet).decryption_table(199, 700)
+    assert sorted(table) == sorted(a + b for a in alphabet for b in alphabet)
+
+
+def test_encode_is_cached_per_text():
+    cipher = BigramAffineCipher(alphabet)
+    codes = cipher.encode("абвг")
+    assert codes == [1, 2 * len(alphabet) + 3]
+    assert cipher.encode("абвг") is codes
+    assert cipher.encode("вгаб") == [2 * len(alphabet) + 3, 1]
+
+
+def test_invalid_input():
+    cipher = BigramAffineCipher(alphabet)
+    with pytest.raises(ValueError):
+        cipher.decrypt("абqг", 1, 0)
+    with pytest.raises(ValueError):
+        cipher.decrypt("а", 1, 0)
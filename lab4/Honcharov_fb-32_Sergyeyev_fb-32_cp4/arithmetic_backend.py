@@ -0,0 +1,188 @@
+import math
+import os
+import random
+from collections import Counter
+
+import exponentiation
+import number_theory
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+class BuiltinBackend:
+    #Вбудовані pow(x, a, m) і pow(a, -1, m): обчислення на C без циклів Python
+    name = 'builtin'
+
+    def powmod(self, x, a, m):
+        return pow(x, a, m)
+
+    def invert(self, a, m):
+        try:
+            return pow(a, -1, m)
+        except ValueError:
+            raise ValueError("Обернений елемент не існує") from None
+
+    def gcd(self, a, b):
+        return math.gcd(a, b)
+
+    def is_probable_prime(self, n, rounds=10):
+        #Пробне ділення на малі прості, далі Міллер-Рабін з rounds випадковими основами
+        if n < 2:
+            return False
+        for p in SMALL_PRIMES:
+            if n % p == 0:
+                return n == p
+        s, d = 0, n - 1
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        for _ in range(rounds):
+            x = self.powmod(random.randint(2, n - 2), d, n)
+            if x == 1 or x == n - 1:
+                continue
+            for _ in range(s - 1):
+                x = self.powmod(x, 2, n)
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+    def fixed_exponent(self, e, m):
+        #Функція x -> x^e mod m для ключа, що використовується багато разів
+        return lambda x: self.powmod(x, e, m)
+
+    def fixed_base(self, g, m, max_bits):
+        #Функція a -> g^a mod m для повторюваної основи: таблиця g^(2^(k*i)) (exponentiation.FixedBasePower)
+        return exponentiation.FixedBasePower(g, m, max_bits)
+
+    def next_prime(self, n):
+        #Найменше (імовірно) просте, більше за n
+        if n < 2:
+            return 2
+        candidate = n + 1 if n % 2 == 0 else n + 2
+        while not self.is_probable_prime(candidate):
+            candidate += 2
+        return candidate
+
+class ReferenceBackend(BuiltinBackend):
+    #Ручне двійкове піднесення зліва направо і розширений алгоритм Евкліда (number_theory) з лічильниками
+    #операцій: повільно, але дозволяє порахувати множення за модулем для порівняння алгоритмів
+    name = 'reference'
+
+    def __init__(self):
+        self.counters = Counter()
+
+    def reset(self):
+        self.counters.clear()
+
+    def powmod(self, x, a, m):
+        self.counters['powmod'] += 1
+        y = 1
+        for bit in bin(a)[2:]:
+            y = (y * y) % m
+            self.counters['multiplications'] += 1
+            if bit == '1':
+                y = (y * x) % m
+                self.counters['multiplications'] += 1
+        return y
+
+    def invert(self, a, m):
+        self.counters['inversions'] += 1
+        return number_theory.inverse(a, m)
+
+    def gcd(self, a, b):
+        return number_theory.extended_gcd(a, b)[2]
+
+class WindowBackend(ReferenceBackend):
+    #Ковзне вікно (exponentiation) з тими самими лічильниками, що й 'reference': показує скорочення множень
+    name = 'window'
+
+    def powmod(self, x, a, m):
+        self.counters['powmod'] += 1
+        return exponentiation.sliding_window_pow(x, a, m, counter=self.counters)
+
+    def fixed_exponent(self, e, m):
+        power = exponentiation.FixedExponentPower(e, m)
+        def apply(x):
+            self.counters['powmod'] += 1
+            return power(x, self.counters)
+        return apply
+
+    def fixed_base(self, g, m, max_bits):
+        power = exponentiation.FixedBasePower(g, m, max_bits, counter=self.counters)
+        def apply(a):
+            self.counters['powmod'] += 1
+            return power(a, self.counters)
+        return apply
+
+class Gmpy2Backend(BuiltinBackend):
+    #gmpy2 (GMP): результати переводяться назад в int, щоб ключі й шифротексти лишались звичайними числами
+    name = 'gmpy2'
+
+    def powmod(self, x, a, m):
+        return int(gmpy2.powmod(x, a, m))
+
+    def invert(self, a, m):
+        try:
+            return int(gmpy2.invert(a, m))
+        except ZeroDivisionError:
+            raise ValueError("Обернений елемент не існує") from None
+
+    def gcd(self, a, b):
+        return int(gmpy2.gcd(a, b))
+
+    def is_probable_prime(self, n, rounds=25):
+        return bool(gmpy2.is_prime(n, rounds))
+
+    def next_prime(self, n):
+        return int(gmpy2.next_prime(n))
+
+BACKENDS = {'gmpy2': Gmpy2Backend, 'builtin': BuiltinBackend, 'reference': ReferenceBackend, 'window': WindowBackend}
+
+def get_backend(name=None):
+    #Без назви - gmpy2, якщо встановлений, інакше вбудовані функції
+    if name is None:
+        name = 'gmpy2' if gmpy2 is not None else 'builtin'
+    if name not in BACKENDS:
+        raise ValueError(f"Невідомий бекенд: {name}, доступні: {', '.join(BACKENDS)}")
+    if name == 'gmpy2' and gmpy2 is None:
+        raise ImportError("gmpy2 не встановлено")
+    return BACKENDS[name]()
+
+#Бекенд обирається при імпорті (змінна середовища RSA_BACKEND) і може бути замінений через set_backend
+backend = get_backend(os.environ.get('RSA_BACKEND'))
+
+def set_backend(name):
+    global backend
+    backend = get_backend(name)
+    return backend
+
+def powmod(x, a, m):
+    return backend.powmod(x, a, m)
+
+def invert(a, m):
+    return backend.invert(a, m)
+
+def batch_invert(values, m):
+    #Обернені до всіх values за модулем m: трюк Монтгомері з одним оберненням через бекенд
+    return number_theory.batch_inverse(values, m, backend.invert)
+
+def gcd(a, b):
+    return backend.gcd(a, b)
+
+def fixed_exponent(e, m):
+    return backend.fixed_exponent(e, m)
+
+def fixed_base(g, m, max_bits):
+    return backend.fixed_base(g, m, max_bits)
+
+def is_probable_prime(n, rounds=10):
+    return backend.is_probable_prime(n, rounds)
+
+def next_prime(n):
+    return backend.next_prime(n)
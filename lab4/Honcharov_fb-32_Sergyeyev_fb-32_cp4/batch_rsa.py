@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import arithmetic_backend as arith
+from crypto_utils import hash_function
+
+#Пар (повідомлення, підпис) в одному завданні для пулу; кратне 8, щоб бітові карти частин склеювались по байтах
+CHUNK_SIZE = 1024
+#Менші пакети обробляються в поточному процесі: запуск пулу дорожчий за саму роботу
+MIN_PARALLEL = 2 * CHUNK_SIZE
+
+#Передобчислення для відкритих ключів у процесі-обробнику: (n, e) -> x^e mod n (arith.fixed_exponent)
+_key_powers = {}
+
+def key_power(public_key):
+    power = _key_powers.get(public_key)
+    if power is None:
+        n, e = public_key
+        power = _key_powers[public_key] = arith.fixed_exponent(e, n)
+    return power
+
+class Bitmap:
+    #Компактний масив результатів перевірки: біт i (молодший біт першим) - результат для пари i
+    def __init__(self, data, length):
+        self.data = bytes(data)
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if not -self.length <= i < self.length:
+            raise IndexError("Індекс поза межами бітової карти")
+        i %= self.length
+        return bool(self.data[i >> 3] >> (i & 7) & 1)
+
+    def __iter__(self):
+        return (self[i] for i in range(self.length))
+
+    def count(self):
+        #Кількість справжніх підписів
+        return int.from_bytes(self.data, 'little').bit_count()
+
+    def all(self):
+        return self.count() == self.length
+
+def pack_bits(flags):
+    data = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            data[i >> 3] |= 1 << (i & 7)
+    return data
+
+def verify_chunk(public_key, pairs):
+    #Виконується в процесі-обробнику: хешування і перевірка частини пар, результат - упакована бітова карта
+    power = key_power(public_key)
+    return pack_bits([power(signature) == hash_function(message) for message, signature in pairs])
+
+def encrypt_chunk(public_key, messages):
+    power = key_power(public_key)
+    return [power(message) for message in messages]
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _run(worker, public_key, chunks, processes, executor):
+    #Частини розподіляються між процесами (вбудований pow не відпускає GIL, тож потоки не допомогли б)
+    total = sum(len(chunk) for chunk in chunks)
+    if executor is None and (processes == 1 or total < MIN_PARALLEL):
+        return [worker(public_key, chunk) for chunk in chunks]
+    if executor is not None:
+        return list(executor.map(worker, [public_key] * len(chunks), chunks))
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        return list(pool.map(worker, [public_key] * len(chunks), chunks))
+
+def verify_many(public_key, pairs, processes=None, executor=None):
+    #Перевірка пар (повідомлення, підпис) одним відкритим ключем -> Bitmap; executor - наявний пул процесів
+    chunks = _chunks(pairs)
+    parts = _run(verify_chunk, tuple(public_key), chunks, processes, executor)
+    return Bitmap(b''.join(parts), sum(len(chunk) for chunk in chunks))
+
+def encrypt_many(public_key, messages, processes=None, executor=None):
+    #Шифрування списку чисел одним відкритим ключем -> список шифротекстів у тому ж порядку
+    parts = _run(encrypt_chunk, tuple(public_key), _chunks(messages), processes, executor)
+    return [ciphertext for part in parts for ciphertext in part]
+
+def verify_grouped(items, processes=None, executor=None):
+    #Трійки (відкритий ключ, повідомлення, підпис) для кількох ключів: групування за ключем,
+    #перевірка кожної групи verify_many і збирання бітової карти в початковому порядку
+    items = list(items)
+    groups = {}
+    for index, (public_key, message, signature) in enumerate(items):
+        groups.setdefault(tuple(public_key), []).append(index)
+
+    if executor is None and processes != 1 and len(items) >= MIN_PARALLEL:
+        #Один пул на всі групи: процеси-обробники зберігають передобчислення кожного ключа між частинами
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+            return verify_grouped(items, processes, pool)
+
+    flags = [False] * len(items)
+    for public_key, indices in groups.items():
+        results = verify_many(public_key, [items[i][1:] for i in indices], processes, executor)
+        for index, valid in zip(indices, results):
+            flags[index] = valid
+    return Bitmap(pack_bits(flags), len(items))
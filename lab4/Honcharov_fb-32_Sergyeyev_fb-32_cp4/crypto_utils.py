@@ -1,8 +1,8 @@
 import random
 import hashlib
-import sys
 
-sys.setrecursionlimit(2000)
+import arithmetic_backend as arith
+import number_theory
 
 FIRST_PRIMES = [
     2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 
@@ -13,28 +13,16 @@ FIRST_PRIMES = [
 ]
 
 def modular_exponentiation(x, a, m):
-    binary_a = bin(a)[2:]
-    k = len(binary_a)
-    y = 1
-    for i in range(k):
-        y = (y * y) % m 
-        if binary_a[i] == '1':
-            y = (y * x) % m 
-    return y
+    #x^a mod m через бекенд, обраний при імпорті arithmetic_backend (gmpy2 / builtin);
+    #ручне двійкове піднесення зліва направо з лічильником множень - бекенд 'reference'
+    return arith.powmod(x, a, m)
 
 def extended_euclidean_algorithm(a, b):
-    if b == 0:
-        return 1, 0, a
-    else:
-        x, y, gcd = extended_euclidean_algorithm(b, a % b)
-        return y, x - (a // b) * y, gcd
+    #(x, y, gcd) з a*x + b*y = gcd; ітеративно (number_theory), без обмеження глибини рекурсії
+    return number_theory.extended_gcd(a, b)
 
 def modular_inverse(e, m):
-    x, y, gcd = extended_euclidean_algorithm(e, m)
-    if gcd != 1:
-        raise ValueError("Обернений елемент не існує")
-    else:
-        return x % m
+    return arith.invert(e, m)
 
 def trial_division(n, prime_list):
     for p in prime_list:
@@ -51,6 +39,9 @@ def generate_random_odd_number(bit_length):
     return n
 
 def miller_rabin_test(p, k):
+    #Для p < 4 немає випадкових основ з [2, p - 2], а d = p - 1 = 0 зациклює розклад
+    if p < 4:
+        return p in (2, 3)
     s = 0
     d = p - 1
     while d % 2 == 0:
@@ -79,15 +70,59 @@ def miller_rabin_test(p, k):
             
     return True
 
-def find_prime(bit_length):
+#Межа для малих простих, якими просіюється вікно кандидатів
+SIEVE_LIMIT = 1 << 16
+
+def sieve_primes(limit):
+    #Решето Ератосфена: усі непарні прості, менші за limit
+    is_composite = bytearray(limit)
+    primes = []
+    for p in range(3, limit, 2):
+        if not is_composite[p]:
+            primes.append(p)
+            is_composite[p * p::2 * p] = b'\x01' * len(range(p * p, limit, 2 * p))
+    return primes
+
+SIEVE_PRIMES = sieve_primes(SIEVE_LIMIT)
+
+def sieve_window(base, window):
+    #Просіювання вікна кандидатів base + 2k, k = 0..window-1: composite[k] = 1, якщо кандидат кратний малому простому
+    composite = bytearray(window)
+    ones = b'\x01' * window
+    for p in SIEVE_PRIMES:
+        #base + 2k ≡ 0 (mod p)  =>  k ≡ -base * 2^(-1) (mod p); саме мале просте не відсіюється
+        k = (-(base % p) * ((p + 1) // 2)) % p
+        if base + 2 * k == p:
+            k += p
+        if k < window:
+            composite[k::p] = ones[:(window - 1 - k) // p + 1]
+    return composite
+
+def find_prime(bit_length, verbose=False):
+    #Одна випадкова непарна основа, далі просіювання вікна base + 2k і Міллер-Рабін лише для тих, хто вижив;
+    #verbose - підсумок: скільки кандидатів відсіяло решето і скільки не пройшли тест Міллера-Рабіна
+    if bit_length < 3:
+        raise ValueError("Довжина простого має бути щонайменше 3 біти")
+    window = max(256, 2 * bit_length)
+    upper_bound = 1 << bit_length
+    sieved = rejected = 0
     while True:
-        n = generate_random_odd_number(bit_length)
-        if not trial_division(n, FIRST_PRIMES):
-            continue
-        if miller_rabin_test(n, k=10):
-            return n
-        else:
-            print(f"Число {n} не пройшло тест Міллера-Рабіна")
+        base = generate_random_odd_number(bit_length)
+        while base < upper_bound:
+            composite = sieve_window(base, window)
+            for k in range(window):
+                if composite[k]:
+                    sieved += 1
+                    continue
+                n = base + 2 * k
+                if n >= upper_bound:
+                    break
+                if miller_rabin_test(n, k=10):
+                    if verbose:
+                        print(f"Просте знайдено: відсіяно решетом {sieved}, не пройшли тест Міллера-Рабіна {rejected}")
+                    return n
+                rejected += 1
+            base += 2 * window
 
 def hash_function(message):
     if isinstance(message, str):
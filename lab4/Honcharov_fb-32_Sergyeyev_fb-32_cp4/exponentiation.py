@@ -0,0 +1,139 @@
+#Піднесення до степеня за модулем вікнами: k-арний метод, ковзне вікно і передобчислені таблиці для
+#повторюваного показника (перевірка багатьох підписів одним відкритим ключем) або повторюваної основи.
+#counter (collections.Counter) рахує множення за модулем, включно з піднесеннями до квадрата
+
+#(найбільша довжина показника в бітах, розмір вікна): вікно k вигідне, доки 2^(k-1) передобчислень
+#окупаються зменшенням кількості множень приблизно з bits/2 до bits/(k+1)
+WINDOW_SIZES = ((8, 1), (24, 2), (80, 3), (240, 4), (672, 5), (1792, 6))
+
+def window_size(bits):
+    for limit, k in WINDOW_SIZES:
+        if bits <= limit:
+            return k
+    return 7
+
+def _mul(a, b, m, counter):
+    if counter is not None:
+        counter['multiplications'] += 1
+    return a * b % m
+
+def kary_pow(x, a, m, k=None, counter=None):
+    #k-арний метод зліва направо: таблиця x^0..x^(2^k - 1), далі k піднесень до квадрата і одне множення на цифру
+    if k is None:
+        k = window_size(a.bit_length())
+    x %= m
+    table = [1 % m, x]
+    for _ in range(2, 1 << k):
+        table.append(_mul(table[-1], x, m, counter))
+    digits = []
+    while a:
+        digits.append(a & ((1 << k) - 1))
+        a >>= k
+    y = 1 % m
+    for i, digit in enumerate(reversed(digits)):
+        if i:
+            for _ in range(k):
+                y = _mul(y, y, m, counter)
+        if digit:
+            y = _mul(y, table[digit], m, counter) if i else table[digit]
+    return y
+
+def sliding_windows(a, k):
+    #Розклад показника на вікна зліва направо: [(кількість квадратів перед вікном, непарне значення вікна або 0)]
+    #Вікно починається з одиничного біта, закінчується одиничним бітом і має довжину не більше k
+    windows = []
+    i = a.bit_length() - 1
+    while i >= 0:
+        if not (a >> i) & 1:
+            windows.append((1, 0))
+            i -= 1
+            continue
+        low = max(i - k + 1, 0)
+        while not (a >> low) & 1:
+            low += 1
+        windows.append((i - low + 1, (a >> low) & ((1 << (i - low + 1)) - 1)))
+        i = low - 1
+    return windows
+
+def odd_powers(x, m, k, counter=None):
+    #x, x^3, ..., x^(2^k - 1): 2^(k-1) - 1 множень і одне піднесення до квадрата
+    x %= m
+    table = [x]
+    if k > 1:
+        square = _mul(x, x, m, counter)
+        for _ in range((1 << (k - 1)) - 1):
+            table.append(_mul(table[-1], square, m, counter))
+    return table
+
+def apply_windows(table, windows, m, counter=None):
+    y = None
+    for squarings, value in windows:
+        if y is not None:
+            for _ in range(squarings):
+                y = _mul(y, y, m, counter)
+        if value:
+            y = table[value >> 1] if y is None else _mul(y, table[value >> 1], m, counter)
+    return 1 % m if y is None else y
+
+def sliding_window_pow(x, a, m, k=None, counter=None):
+    #Ковзне вікно: лише непарні степені в таблиці, нульові біти між вікнами - тільки квадрати
+    if k is None:
+        k = window_size(a.bit_length())
+    return apply_windows(odd_powers(x, m, k, counter), sliding_windows(a, k), m, counter)
+
+class FixedExponentPower:
+    #Показник і модуль ключа фіксовані (перевірка підписів, шифрування одним відкритим ключем):
+    #розклад на вікна рахується один раз, для кожної основи лишаються таблиця непарних степенів і множення
+    def __init__(self, exponent, modulus, k=None):
+        self.exponent = exponent
+        self.modulus = modulus
+        self.k = k if k is not None else window_size(exponent.bit_length())
+        self.windows = sliding_windows(exponent, self.k)
+        #Найбільше непарне значення вікна визначає, скільки степенів основи насправді потрібно
+        self.table_size = max((value >> 1 for _, value in self.windows if value), default=0) + 1
+
+    def __call__(self, x, counter=None):
+        m = self.modulus
+        x %= m
+        table = [x]
+        if self.table_size > 1:
+            square = _mul(x, x, m, counter)
+            for _ in range(self.table_size - 1):
+                table.append(_mul(table[-1], square, m, counter))
+        return apply_windows(table, self.windows, m, counter)
+
+class FixedBasePower:
+    #Основа і модуль фіксовані: зберігаються g^(2^(k*i)), і g^a = prod_{j=2^k-1..1} (prod_{i: a_i = j} g_i)^j
+    #(метод Яо) - близько bits/k + 2^k множень без жодного піднесення до квадрата
+    def __init__(self, base, modulus, max_bits, k=None, counter=None):
+        self.modulus = modulus
+        self.max_bits = max_bits
+        self.k = k if k is not None else max(1, window_size(max_bits) - 1)
+        self.powers = [base % modulus]
+        for _ in range(-(-max_bits // self.k) - 1):
+            y = self.powers[-1]
+            for _ in range(self.k):
+                y = _mul(y, y, modulus, counter)
+            self.powers.append(y)
+
+    def __call__(self, a, counter=None):
+        if a.bit_length() > self.max_bits:
+            raise ValueError(f"Показник довший за {self.max_bits} біт, на які розрахована таблиця")
+        m = self.modulus
+        mask = (1 << self.k) - 1
+        buckets = {}
+        i = 0
+        while a:
+            digit = a & mask
+            if digit:
+                buckets[digit] = _mul(buckets[digit], self.powers[i], m, counter) if digit in buckets else self.powers[i]
+            a >>= self.k
+            i += 1
+        #running - добуток кошиків з цифрами >= digit; кожен кошик j входить у result рівно j разів
+        result = running = None
+        for digit in range(mask, 0, -1):
+            if digit in buckets:
+                running = buckets[digit] if running is None else _mul(running, buckets[digit], m, counter)
+            if running is not None:
+                result = running if result is None else _mul(result, running, m, counter)
+        return 1 % m if result is None else result
@@ -0,0 +1,154 @@
+import hashlib
+import hmac
+import io
+import os
+import secrets
+
+from rsa_core import SendKey, ReceiveKey, as_crt_key
+
+#Гібридне шифрування: випадковий сеансовий ключ k передається протоколом SendKey/ReceiveKey (одна операція RSA
+#на повідомлення), а дані довільного розміру шифруються потоково гамою SHAKE-256 і автентифікуються HMAC-SHA256.
+#Формат: MAGIC | довжина k1, k1 | довжина S1, S1 | nonce | розмір частини | шифротекст | тег HMAC
+MAGIC = b'RSH1'
+NONCE_SIZE = 16
+TAG_SIZE = 32
+CHUNK_SIZE = 1 << 16
+#Розмір частини в заголовку ще не автентифікований: більші значення відхиляються до виділення буфера
+MAX_CHUNK_SIZE = 1 << 24
+
+def derive_keys(k, n):
+    #Ключ гами і ключ HMAC з сеансового числа k < n
+    k_bytes = k.to_bytes((n.bit_length() + 7) // 8, 'big')
+    return hashlib.sha256(b'stream' + k_bytes).digest(), hashlib.sha256(b'mac' + k_bytes).digest()
+
+def keystream(key, nonce, index, length):
+    #Гама для частини з номером index: один виклик SHAKE-256 на частину
+    return hashlib.shake_256(key + nonce + index.to_bytes(8, 'big')).digest(length)
+
+def xor(data, gamma):
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(gamma, 'little')).to_bytes(len(data), 'little')
+
+def read_into(source, view):
+    #Заповнити view повністю (або до кінця потоку); повертає кількість прочитаних байтів
+    filled = 0
+    while filled < len(view):
+        count = source.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+def pack_number(x):
+    data = x.to_bytes((x.bit_length() + 7) // 8, 'big')
+    return len(data).to_bytes(2, 'big') + data
+
+def read_exact(source, size):
+    data = source.read(size)
+    if len(data) != size:
+        raise ValueError("Потік обірвався в заголовку")
+    return data
+
+def unpack_number(source):
+    return int.from_bytes(read_exact(source, int.from_bytes(read_exact(source, 2), 'big')), 'big')
+
+def encrypt_stream(source, target, my_private_key, recipient_public_key, chunk_size=CHUNK_SIZE):
+    #source, target - двійкові файлові об'єкти; повертає кількість зашифрованих байтів
+    my_key = as_crt_key(my_private_key)
+    if my_key.n > recipient_public_key[0]:
+        raise ValueError("Протокол SendKey вимагає, щоб модуль відправника не перевищував модуль одержувача")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Розмір частини має бути від 1 до {MAX_CHUNK_SIZE} байт")
+
+    #Сеансовий ключ визначає гаму і ключ HMAC, тому береться з криптографічного генератора
+    k = secrets.randbelow(my_key.n - 1) + 1
+    k1, S1 = SendKey(k, my_key, recipient_public_key)
+    stream_key, mac_key = derive_keys(k, my_key.n)
+    nonce = os.urandom(NONCE_SIZE)
+
+    header = MAGIC + pack_number(k1) + pack_number(S1) + nonce + chunk_size.to_bytes(4, 'big')
+    target.write(header)
+    mac = hmac.new(mac_key, header, hashlib.sha256)
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = index = 0
+    while True:
+        count = read_into(source, view)
+        if not count:
+            break
+        ciphertext = xor(view[:count], keystream(stream_key, nonce, index, count))
+        mac.update(ciphertext)
+        target.write(ciphertext)
+        total += count
+        index += 1
+        if count < chunk_size:
+            break
+    target.write(mac.digest())
+    return total
+
+def decrypt_stream(source, target, my_private_key, sender_public_key):
+    #Розшифрування з перевіркою тегу в кінці; при невдалій перевірці - ValueError (записане в target слід відкинути)
+    if read_exact(source, len(MAGIC)) != MAGIC:
+        raise ValueError("Невідомий формат потоку")
+    k1 = unpack_number(source)
+    S1 = unpack_number(source)
+    nonce = read_exact(source, NONCE_SIZE)
+    chunk_size = int.from_bytes(read_exact(source, 4), 'big')
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Недопустимий розмір частини в заголовку: {chunk_size}")
+
+    k, authentic = ReceiveKey((k1, S1), my_private_key, sender_public_key)
+    if not authentic:
+        raise ValueError("Сеансовий ключ не пройшов автентифікацію")
+    stream_key, mac_key = derive_keys(k, sender_public_key[0])
+    header = MAGIC + pack_number(k1) + pack_number(S1) + nonce + chunk_size.to_bytes(4, 'big')
+    mac = hmac.new(mac_key, header, hashlib.sha256)
+
+    #Останні TAG_SIZE байтів потоку - тег, тому вони утримуються в буфері до наступного читання
+    buffer = bytearray(chunk_size + TAG_SIZE)
+    view = memoryview(buffer)
+    filled = read_into(source, view)
+    total = index = 0
+    while filled == len(buffer):
+        ciphertext = view[:chunk_size]
+        mac.update(ciphertext)
+        target.write(xor(ciphertext, keystream(stream_key, nonce, index, chunk_size)))
+        total += chunk_size
+        index += 1
+        view[:TAG_SIZE] = view[chunk_size:]
+        filled = TAG_SIZE + read_into(source, view[TAG_SIZE:])
+
+    if filled < TAG_SIZE:
+        raise ValueError("Потік обірвався: немає тегу автентичності")
+    count = filled - TAG_SIZE
+    if count:
+        ciphertext = view[:count]
+        mac.update(ciphertext)
+        target.write(xor(ciphertext, keystream(stream_key, nonce, index, count)))
+        total += count
+    if not hmac.compare_digest(mac.digest(), view[count:filled]):
+        raise ValueError("Тег автентичності не збігається: дані пошкоджені або підроблені")
+    return total
+
+def encrypt_file(source_path, target_path, my_private_key, recipient_public_key, chunk_size=CHUNK_SIZE):
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        return encrypt_stream(source, target, my_private_key, recipient_public_key, chunk_size)
+
+def decrypt_file(source_path, target_path, my_private_key, sender_public_key):
+    #Розшифрований файл видаляється, якщо перевірка не пройшла
+    try:
+        with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+            return decrypt_stream(source, target, my_private_key, sender_public_key)
+    except ValueError:
+        os.remove(target_path)
+        raise
+
+def encrypt_bytes(data, my_private_key, recipient_public_key, chunk_size=CHUNK_SIZE):
+    target = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), target, my_private_key, recipient_public_key, chunk_size)
+    return target.getvalue()
+
+def decrypt_bytes(data, my_private_key, sender_public_key):
+    target = io.BytesIO()
+    decrypt_stream(io.BytesIO(data), target, my_private_key, sender_public_key)
+    return target.getvalue()
@@ -0,0 +1,111 @@
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+from crypto_utils import find_prime
+from rsa_core import build_key_pair
+
+def search_prime(bit_length):
+    #Виконується у процесі-воркері, тому без виводу про невдалі кандидати
+    return find_prime(bit_length, verbose=False)
+
+class KeyFactory:
+    #Пул процесів шукає прості p, q, а готові ключові пари тримаються в обмеженому пулі для кожної довжини
+    def __init__(self, pool_size=4, processes=None):
+        self.pool_size = pool_size
+        self.executor = ProcessPoolExecutor(max_workers=processes)
+        self.condition = threading.Condition()
+        self.ready = {}
+        self.spare_primes = {}
+        #Кількість пошуків простого, що ще виконуються, і збої воркерів для кожної довжини
+        self.in_flight = {}
+        self.errors = {}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        #Пошуки, що ще виконуються, не дочікуються: воркери завершуються примусово
+        processes = list((self.executor._processes or {}).values())
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    def prefill(self, bit_length):
+        with self.condition:
+            self._refill(bit_length)
+
+    def _refill(self, bit_length):
+        #Викликається під self.condition: простих, що вже знайдені або шукаються, вистачає на pool_size пар
+        ready = self.ready.setdefault(bit_length, deque())
+        spare = self.spare_primes.setdefault(bit_length, [])
+        missing = 2 * (self.pool_size - len(ready)) - len(spare) - self.in_flight.get(bit_length, 0)
+        for _ in range(missing):
+            self.in_flight[bit_length] = self.in_flight.get(bit_length, 0) + 1
+            future = self.executor.submit(search_prime, bit_length)
+            future.add_done_callback(lambda f: self._on_prime(bit_length, f))
+
+    def _on_prime(self, bit_length, future):
+        with self.condition:
+            self.in_flight[bit_length] -= 1
+            if self.closed:
+                return
+            try:
+                prime = future.result()
+            except CancelledError:
+                return
+            except Exception as error:
+                #Збій воркера (виняток у search_prime, BrokenProcessPool) перевикидається з наступного take
+                #для цієї довжини, інакше take без timeout чекав би на пару, яка ніколи не з'явиться
+                self.errors[bit_length] = error
+                self.condition.notify_all()
+                return
+            spare = self.spare_primes[bit_length]
+            spare.append(prime)
+            if len(spare) < 2:
+                return
+            p, q = spare.pop(), spare.pop()
+            if p == q:
+                spare.append(p)
+                self._refill(bit_length)
+                return
+            self.ready[bit_length].append(build_key_pair(p, q))
+            self.condition.notify_all()
+
+    def take(self, bit_length, min_modulus=None, timeout=None):
+        #Повертає (public_key, private_key) з пулу; min_modulus задає умову n >= min_modulus.
+        #Пара з достатнім n обирається серед готових і тих, що ще генеруються; якщо пул заповнений лише
+        #меншими n, ключі не перегенеровуються - LookupError (пари для протоколу слід брати через take_ordered)
+        with self.condition:
+            while True:
+                error = self.errors.pop(bit_length, None)
+                if error is not None:
+                    raise error
+                if self.closed:
+                    raise RuntimeError("KeyFactory закрито")
+                self._refill(bit_length)
+                ready = self.ready[bit_length]
+                for key_pair in ready:
+                    if min_modulus is None or key_pair[0][0] >= min_modulus:
+                        ready.remove(key_pair)
+                        self._refill(bit_length)
+                        return key_pair
+                if not self.in_flight.get(bit_length):
+                    raise LookupError(f"У пулі немає ключової пари з n >= {min_modulus}")
+                if not self.condition.wait(timeout):
+                    raise TimeoutError("Не вдалося отримати ключову пару з пулу")
+
+    def take_ordered(self, bit_length, count=2, timeout=None):
+        #count ключових пар, впорядкованих за n: n_A <= n_B <= ... без перегенерації
+        key_pairs = [self.take(bit_length, timeout=timeout) for _ in range(count)]
+        key_pairs.sort(key=lambda pair: pair[0][0])
+        return key_pairs
@@ -0,0 +1,68 @@
+#Розширений алгоритм Евкліда без рекурсії (з прискоренням Лемера для великих чисел) і пакетне обернення
+
+#Старші біти, якими оперує крок Лемера, і довжина, з якої він вигідніший за звичайний алгоритм
+#(на коротших числах накладні витрати циклу Python переважують економію на великих діленнях)
+LEHMER_BITS = 60
+LEHMER_MIN_BITS = 3000
+
+def euclid_steps(a, b, x0, y0, x1, y1):
+    #Звичайний алгоритм: інваріанти a = x0*A + y0*B, b = x1*A + y1*B для початкових A, B
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return x0, y0, a
+
+def extended_gcd(a, b):
+    #Повертає (x, y, gcd) з a*x + b*y = gcd для a, b >= 0; стек не росте з довжиною чисел
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    if a < b:
+        a, b, x0, y0, x1, y1 = b, a, 0, 1, 1, 0
+    lehmer = b.bit_length() > LEHMER_MIN_BITS
+    while lehmer and b.bit_length() > LEHMER_BITS:
+        #Частки обчислюються за старшими бітами в малих числах, доки вони однозначні (алгоритм L Кнута);
+        #накопичена матриця [[A, B], [C, D]] застосовується до великих чисел одним кроком
+        shift = a.bit_length() - LEHMER_BITS
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C and bh + D:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            q = a // b
+            a, b = b, a - q * b
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+            y0, y1 = A * y0 + B * y1, C * y0 + D * y1
+    return euclid_steps(a, b, x0, y0, x1, y1)
+
+def inverse(a, m):
+    x, _, g = extended_gcd(a % m, m)
+    if g != 1:
+        raise ValueError("Обернений елемент не існує")
+    return x % m
+
+def batch_inverse(values, m, invert=inverse):
+    #Обернені до всіх values за одним модулем m (трюк Монтгомері): префіксні добутки, одне обернення
+    #і зворотний прохід - 3(n-1) множень замість n обернень
+    values = list(values)
+    if not values:
+        return []
+    prefix = [values[0] % m]
+    for value in values[1:]:
+        prefix.append(prefix[-1] * value % m)
+    running = invert(prefix[-1], m)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = running * prefix[i - 1] % m
+        running = running * values[i] % m
+    inverses[0] = running
+    return inverses
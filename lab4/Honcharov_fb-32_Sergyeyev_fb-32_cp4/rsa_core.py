@@ -1,16 +1,51 @@
 import random
 
+import arithmetic_backend as arith
 from crypto_utils import (
     modular_exponentiation, 
     modular_inverse, 
     find_prime, 
-    hash_function,
-    extended_euclidean_algorithm
+    hash_function
 )
 
+class CRTPrivateKey:
+    #Закритий ключ (d, p, q) з передобчисленими dp, dq, qinv для КТЛ
+    def __init__(self, d, p, q):
+        self.d = d
+        self.p = p
+        self.q = q
+        self.n = p * q
+        self.dp = d % (p - 1)
+        self.dq = d % (q - 1)
+        self.qinv = modular_inverse(q, p)
+
+    def __iter__(self):
+        return iter((self.d, self.p, self.q))
+
+def as_crt_key(private_key):
+    if isinstance(private_key, CRTPrivateKey):
+        return private_key
+    d, p, q = private_key
+    return CRTPrivateKey(d, p, q)
+
+def crt_power(x, private_key):
+    #x^d mod n через КТЛ та рекомбінацію Гарнера
+    key = as_crt_key(private_key)
+    m1 = modular_exponentiation(x % key.p, key.dp, key.p)
+    m2 = modular_exponentiation(x % key.q, key.dq, key.q)
+    h = (key.qinv * (m1 - m2)) % key.p
+    return m2 + h * key.q
+
 def GenerateKeyPair(bit_length=256):
     p = find_prime(bit_length)
     q = find_prime(bit_length)
+
+    print(f"p = {p}")
+    print(f"q = {q}")
+
+    return build_key_pair(p, q)
+
+def build_key_pair(p, q):
     n = p * q
     phi_n = (p - 1) * (q - 1) 
 
@@ -19,17 +54,13 @@ def GenerateKeyPair(bit_length=256):
         e = random.randint(2, phi_n - 1)
         if e % 2 == 0:
             e += 1
-        _, _, gcd = extended_euclidean_algorithm(e, phi_n)
-        if gcd == 1:
+        if arith.gcd(e, phi_n) == 1:
             break 
         
     d = modular_inverse(e, phi_n) 
     
     public_key = (n, e)
-    private_key = (d, p, q) 
-
-    print(f"p = {p}")
-    print(f"q = {q}")
+    private_key = CRTPrivateKey(d, p, q)
 
     return public_key, private_key
 
@@ -39,16 +70,12 @@ def Encrypt(message, public_key):
     return ciphertext
 
 def Decrypt(ciphertext, private_key):
-    d, p, q = private_key
-    n = p * q
-    message = modular_exponentiation(ciphertext, d, n)
+    message = crt_power(ciphertext, private_key)
     return message
 
 def Sign(message, private_key):
-    d, p, q = private_key
-    n = p * q
     hashed_message_int = hash_function(message)
-    signature = modular_exponentiation(hashed_message_int, d, n)
+    signature = crt_power(hashed_message_int, private_key)
     return signature
 
 def Verify(message, signature, public_key):
@@ -58,11 +85,9 @@ def Verify(message, signature, public_key):
     return decrypted_signature_int == hashed_message_int
 
 def SendKey(k, my_private_key, recipient_public_key):
-    d, p, q = my_private_key
-    n = p * q
     n1, e1 = recipient_public_key #
     
-    S = modular_exponentiation(k, d, n)
+    S = crt_power(k, my_private_key)
     k1 = modular_exponentiation(k, e1, n1)
     S1 = modular_exponentiation(S, e1, n1) 
     
@@ -70,12 +95,10 @@ def SendKey(k, my_private_key, recipient_public_key):
 
 def ReceiveKey(k1_S1_pair, my_private_key, sender_public_key):
     k1, S1 = k1_S1_pair
-    d1, p1, q1 = my_private_key
-    n1 = p1 * q1
     n, e = sender_public_key
     
-    k = modular_exponentiation(k1, d1, n1)
-    S = modular_exponentiation(S1, d1, n1)
+    k = crt_power(k1, my_private_key)
+    S = crt_power(S1, my_private_key)
     
     k_from_signature = modular_exponentiation(S, e, n)
     
@@ -1,7 +1,7 @@
 import random
 
+import arithmetic_backend as arith
 from rsa_core import (
-    GenerateKeyPair, 
     Encrypt, 
     Decrypt, 
     Sign, 
@@ -9,76 +9,111 @@ from rsa_core import (
     SendKey, 
     ReceiveKey
 )
+from key_factory import KeyFactory
+from batch_rsa import verify_many
+from hybrid_stream import encrypt_bytes, decrypt_bytes
 
 BIT_LENGTH = 256 
-
-print(f"--- Генерація ключів (біт: {BIT_LENGTH}) ---")
-
-print("Генерація ключів для Абонента А...")
-(n_A, e_A), (d_A, p_A, q_A) = GenerateKeyPair(BIT_LENGTH)
-print("Генерація ключів для Абонента B...")
-(n_B, e_B), (d_B, p_B, q_B) = GenerateKeyPair(BIT_LENGTH)
-
-while n_B < n_A:
-    print("n_B < n_A, перегенерація ключів B...")
-    (n_B, e_B), (d_B, p_B, q_B) = GenerateKeyPair(BIT_LENGTH)
-
-print("\nПараметри RSA Абонента A:")
-print(f"  p_A = {p_A}")
-print(f"  q_A = {q_A}")
-print(f"  n_A = {n_A}")
-print(f"  e_A = {e_A}")
-print(f"  d_A = {d_A}")
-print("\nПараметри RSA Абонента B:")
-print(f"  p_B = {p_B}")
-print(f"  q_B = {q_B}")
-print(f"  n_B = {n_B}")
-print(f"  e_B = {e_B}")
-print(f"  d_B = {d_B}")
-print("-----------------------------------------")
-
-print("\n--- Тест шифрування/розшифрування ---")
-
-M = random.randint(1, n_A - 1)
-print(f"Відкритий текст M = {M}")
-
-C = Encrypt(M, (n_B, e_B))
-print(f"Шифротекст для B: C = {C}")
-
-M_A_decrypted = Decrypt(C, (d_B, p_B, q_B))
-print(f"B розшифровує C: M' = {M_A_decrypted}")
-
-if M == M_A_decrypted:
-    print("УСПІХ: M == M'")
-else:
-    print("ПОМИЛКА: M != M'")
-print("-----------------------------------------")
-
-print("\n--- Тест Цифрового Підпису ---")
-message_text = "aboba"
-print(f"Відкритий текст: '{message_text}'")
-
-signature_A = Sign(message_text, (d_A, p_A, q_A))
-print(f"Підпис Абонента А: S_A = {signature_A}")
-
-is_valid = Verify(message_text, signature_A, (n_A, e_A))
-print(f"Абонент B проверил підпис: {is_valid}")
-print("-----------------------------------------")
-
-print("\n--- Тест протокола розсилки ключів ---")
-
-k_secret = random.randint(1, n_A - 1) 
-print(f"Абонент А генерує секретне значення k = {k_secret}")
-
-k1_S1_pair = SendKey(k_secret, (d_A, p_A, q_A), (n_B, e_B))
-print(f"А відправляє пару (k1, S1): ({k1_S1_pair[0]}, {k1_S1_pair[1]})")
-
-k_received, auth_status = ReceiveKey(k1_S1_pair, (d_B, p_B, q_B), (n_A, e_A))
-
-print(f"Абонент B отримав значення k' = {k_received}")
-print(f"Статус автентифікації: {auth_status}")
-
-if k_secret == k_received and auth_status:
-    print("УСПІХ: Протокол виконаний, ключі співпадають і автентифікація пройдена.")
-else:
-    print("ПОМИЛКА: Протокол не виконаний.")
\ No newline at end of file
+BATCH_SIZE = 100
+HYBRID_SIZE = 1 << 20
+
+def main():
+    print(f"--- Генерація ключів (біт: {BIT_LENGTH}) ---")
+
+    print("Отримання ключів Абонентів А і B з пулу KeyFactory...")
+    #Умова n_A <= n_B виконується впорядкуванням пар з пулу, а не перегенерацією
+    with KeyFactory(pool_size=2) as factory:
+        ((n_A, e_A), private_A), ((n_B, e_B), private_B) = factory.take_ordered(BIT_LENGTH)
+
+    d_A, p_A, q_A = private_A
+    d_B, p_B, q_B = private_B
+
+    print("\nПараметри RSA Абонента A:")
+    print(f"  p_A = {p_A}")
+    print(f"  q_A = {q_A}")
+    print(f"  n_A = {n_A}")
+    print(f"  e_A = {e_A}")
+    print(f"  d_A = {d_A}")
+    print("\nПараметри RSA Абонента B:")
+    print(f"  p_B = {p_B}")
+    print(f"  q_B = {q_B}")
+    print(f"  n_B = {n_B}")
+    print(f"  e_B = {e_B}")
+    print(f"  d_B = {d_B}")
+    print("-----------------------------------------")
+
+    print("\n--- Тест шифрування/розшифрування ---")
+
+    M = random.randint(1, n_A - 1)
+    print(f"Відкритий текст M = {M}")
+
+    C = Encrypt(M, (n_B, e_B))
+    print(f"Шифротекст для B: C = {C}")
+
+    M_A_decrypted = Decrypt(C, private_B)
+    print(f"B розшифровує C: M' = {M_A_decrypted}")
+
+    if M == M_A_decrypted:
+        print("УСПІХ: M == M'")
+    else:
+        print("ПОМИЛКА: M != M'")
+    print("-----------------------------------------")
+
+    print("\n--- Тест Цифрового Підпису ---")
+    message_text = "aboba"
+    print(f"Відкритий текст: '{message_text}'")
+
+    signature_A = Sign(message_text, private_A)
+    print(f"Підпис Абонента А: S_A = {signature_A}")
+
+    is_valid = Verify(message_text, signature_A, (n_A, e_A))
+    print(f"Абонент B проверил підпис: {is_valid}")
+    print("-----------------------------------------")
+
+    print("\n--- Пакетна перевірка підписів ---")
+    messages = [f"{message_text} {i}" for i in range(BATCH_SIZE)]
+    pairs = [(message, Sign(message, private_A)) for message in messages]
+    #Кожен десятий підпис зіпсований
+    pairs = [(message, signature + 1 if i % 10 == 0 else signature) for i, (message, signature) in enumerate(pairs)]
+    results = verify_many((n_A, e_A), pairs)
+    print(f"Справжніх підписів: {results.count()} з {len(results)}")
+    print(f"Збіг з Verify: {list(results) == [Verify(m, s, (n_A, e_A)) for m, s in pairs]}")
+    print("-----------------------------------------")
+
+    print("\n--- Тест протокола розсилки ключів ---")
+
+    k_secret = random.randint(1, n_A - 1) 
+    print(f"Абонент А генерує секретне значення k = {k_secret}")
+
+    k1_S1_pair = SendKey(k_secret, private_A, (n_B, e_B))
+    print(f"А відправляє пару (k1, S1): ({k1_S1_pair[0]}, {k1_S1_pair[1]})")
+
+    k_received, auth_status = ReceiveKey(k1_S1_pair, private_B, (n_A, e_A))
+
+    print(f"Абонент B отримав значення k' = {k_received}")
+    print(f"Статус автентифікації: {auth_status}")
+
+    if k_secret == k_received and auth_status:
+        print("УСПІХ: Протокол виконаний, ключі співпадають і автентифікація пройдена.")
+    else:
+        print("ПОМИЛКА: Протокол не виконаний.")
+    print("-----------------------------------------")
+
+    print("\n--- Гібридне шифрування: сеансовий ключ через SendKey, дані потоком ---")
+    data = random.randbytes(HYBRID_SIZE)
+    package = encrypt_bytes(data, private_A, (n_B, e_B))
+    print(f"Відкритих даних: {len(data)} байт, зашифрований пакет: {len(package)} байт")
+    print(f"B розшифровує пакет: {'УСПІХ' if decrypt_bytes(package, private_B, (n_A, e_A)) == data else 'ПОМИЛКА'}")
+    print("-----------------------------------------")
+
+    print("\n--- Кількість множень за модулем: двійковий метод і ковзне вікно ---")
+    for backend_name in ('reference', 'window'):
+        counters = arith.set_backend(backend_name).counters
+        Decrypt(C, private_B)
+        Verify(message_text, signature_A, (n_A, e_A))
+        SendKey(k_secret, private_A, (n_B, e_B))
+        print(f"  {backend_name}: {counters['multiplications']} множень на {counters['powmod']} піднесень до степеня")
+    arith.set_backend(None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import math
+import random
+
+import pytest
+
+import arithmetic_backend as arith
+import crypto_utils
+
+def is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+@pytest.fixture(params=['builtin', 'reference', 'window', 'gmpy2'])
+def backend(request):
+    if request.param == 'gmpy2':
+        pytest.importorskip('gmpy2')
+    return arith.get_backend(request.param)
+
+@pytest.fixture
+def restore_backend():
+    saved = arith.backend
+    yield
+    arith.backend = saved
+
+def random_operands(count=50, bits=256):
+    rng = random.Random(21)
+    for _ in range(count):
+        m = rng.getrandbits(bits) | 1
+        yield rng.getrandbits(bits + 8), rng.getrandbits(bits), m
+
+def test_powmod_matches_pow(backend):
+    for x, a, m in random_operands():
+        assert backend.powmod(x, a, m) == pow(x, a, m)
+    assert backend.powmod(5, 0, 7) == 1
+    assert backend.powmod(0, 5, 7) == 0
+
+def test_invert_matches_pow(backend):
+    for a, _, m in random_operands():
+        if math.gcd(a, m) == 1:
+            assert backend.invert(a, m) == pow(a, -1, m)
+    with pytest.raises(ValueError):
+        backend.invert(6, 9)
+
+def test_gcd_matches_math(backend):
+    for a, b, _ in random_operands():
+        assert backend.gcd(a, b) == math.gcd(a, b)
+    assert backend.gcd(0, 5) == 5
+
+def test_primality_matches_trial_division(backend):
+    assert [n for n in range(2000) if backend.is_probable_prime(n)] == [n for n in range(2000) if is_prime(n)]
+    #Число Кармайкла і добуток двох 64-бітних простих
+    assert not backend.is_probable_prime(561)
+    assert not backend.is_probable_prime((2 ** 61 - 1) * (2 ** 89 - 1))
+    assert backend.is_probable_prime(2 ** 127 - 1)
+
+def test_next_prime(backend):
+    for n in [0, 1, 2, 3, 14, 89, 1000]:
+        p = backend.next_prime(n)
+        assert p > n and is_prime(p) and not any(is_prime(k) for k in range(n + 1, p))
+
+def test_fixed_exponent_and_base_match_pow(backend):
+    rng = random.Random(3)
+    m = rng.getrandbits(512) | 1
+    g = rng.randrange(2, m)
+    verify = backend.fixed_exponent(65537, m)
+    power = backend.fixed_base(g, m, 512)
+    for _ in range(20):
+        x, a = rng.randrange(m), rng.getrandbits(512)
+        assert verify(x) == pow(x, 65537, m)
+        assert power(a) == pow(g, a, m)
+
+def test_window_backend_counts_fewer_multiplications():
+    rng = random.Random(4)
+    m = rng.getrandbits(1024) | 1
+    x, a = rng.randrange(m), rng.getrandbits(1024)
+    reference, window = arith.get_backend('reference'), arith.get_backend('window')
+    assert window.powmod(x, a, m) == reference.powmod(x, a, m) == pow(x, a, m)
+    assert window.counters['multiplications'] < reference.counters['multiplications']
+    assert window.fixed_exponent(a, m)(x) == pow(x, a, m)
+    assert window.counters['powmod'] == 2
+
+def test_reference_counts_multiplications():
+    reference = arith.get_backend('reference')
+    reference.powmod(3, 0b1011, 1000)
+    #Біт 1: квадрат + множення, біт 0: лише квадрат
+    assert reference.counters['multiplications'] == 7
+    reference.reset()
+    assert not reference.counters
+
+def test_set_backend_routes_crypto_utils(restore_backend):
+    reference = arith.set_backend('reference')
+    assert crypto_utils.modular_exponentiation(7, 65537, 1000003) == pow(7, 65537, 1000003)
+    assert crypto_utils.modular_inverse(65537, 1000002) == pow(65537, -1, 1000002)
+    assert reference.counters['powmod'] == 1 and reference.counters['inversions'] == 1
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        arith.get_backend('fortran')
@@ -0,0 +1,84 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import batch_rsa
+from crypto_utils import find_prime
+from rsa_core import Encrypt, Sign, Verify, build_key_pair
+
+#Хеш SHA-256 має бути меншим за n, тому прості по 160 біт
+@pytest.fixture(scope='module')
+def keys():
+    return [build_key_pair(find_prime(160), find_prime(160)) for _ in range(3)]
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+def signed_pairs(private_key, public_key, count, seed=0):
+    #Справжні підписи вперемішку з підробленими: змінений підпис або чуже повідомлення
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        message = f"повідомлення {seed} {i}"
+        signature = Sign(message, private_key)
+        kind = rng.randrange(3)
+        if kind == 1:
+            signature = (signature + 1) % public_key[0]
+        elif kind == 2:
+            message += '!'
+        pairs.append((message, signature))
+    return pairs
+
+def test_bitmap():
+    flags = [True, False, True, True, False, False, False, True, True, False]
+    bitmap = batch_rsa.Bitmap(batch_rsa.pack_bits(flags), len(flags))
+    assert list(bitmap) == flags and len(bitmap) == 10
+    assert bitmap[-1] is False and bitmap[-2] is True
+    assert bitmap.count() == 5 and not bitmap.all()
+    with pytest.raises(IndexError):
+        bitmap[10]
+    with pytest.raises(IndexError):
+        bitmap[-11]
+    assert batch_rsa.Bitmap(batch_rsa.pack_bits([True] * 9), 9).all()
+
+@pytest.mark.parametrize('count', [0, 1, 7, 8, batch_rsa.CHUNK_SIZE + 3])
+def test_verify_many_matches_verify(keys, count):
+    public_key, private_key = keys[0]
+    pairs = signed_pairs(private_key, public_key, count, count)
+    bitmap = batch_rsa.verify_many(public_key, pairs, processes=1)
+    assert list(bitmap) == [Verify(message, signature, public_key) for message, signature in pairs]
+    assert len(bitmap) == count
+
+def test_verify_many_in_pool(keys, pool, monkeypatch):
+    public_key, private_key = keys[0]
+    pairs = signed_pairs(private_key, public_key, 2 * batch_rsa.CHUNK_SIZE + 5)
+    expected = [Verify(message, signature, public_key) for message, signature in pairs]
+    assert list(batch_rsa.verify_many(public_key, pairs, executor=pool)) == expected
+    #Власний пул функції, коли пакет не менший за MIN_PARALLEL
+    monkeypatch.setattr(batch_rsa, 'MIN_PARALLEL', 16)
+    assert list(batch_rsa.verify_many(list(public_key), pairs[:40], processes=2)) == expected[:40]
+
+def test_encrypt_many_matches_encrypt(keys, pool):
+    public_key, _ = keys[1]
+    rng = random.Random(1)
+    messages = [rng.randrange(public_key[0]) for _ in range(batch_rsa.CHUNK_SIZE + 10)]
+    expected = [Encrypt(message, public_key) for message in messages]
+    assert batch_rsa.encrypt_many(public_key, messages, processes=1) == expected
+    assert batch_rsa.encrypt_many(public_key, messages, executor=pool) == expected
+    assert batch_rsa.encrypt_many(public_key, [], processes=1) == []
+
+def test_verify_grouped_keeps_input_order(keys, pool):
+    items = []
+    for seed, (public_key, private_key) in enumerate(keys):
+        items += [(public_key, message, signature) for message, signature in signed_pairs(private_key, public_key, 50, seed)]
+    random.Random(2).shuffle(items)
+    #Підпис, перевірений чужим ключем, не проходить
+    items.append((keys[0][0], items[0][1], Sign(items[0][1], keys[1][1])))
+    expected = [Verify(message, signature, public_key) for public_key, message, signature in items]
+    assert not expected[-1]
+    assert list(batch_rsa.verify_grouped(items, processes=1)) == expected
+    assert list(batch_rsa.verify_grouped(items, executor=pool)) == expected
+    assert len(batch_rsa.verify_grouped([], processes=1)) == 0
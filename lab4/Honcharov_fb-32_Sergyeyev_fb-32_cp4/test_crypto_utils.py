@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from crypto_utils import SIEVE_PRIMES, find_prime, miller_rabin_test, sieve_primes, sieve_window
+
+def is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+def test_sieve_primes_brute_force():
+    assert sieve_primes(2000) == [p for p in range(3, 2000) if is_prime(p)]
+
+def test_sieve_window_matches_divisibility():
+    for base in [3, 5, 101, random.getrandbits(40) | 1]:
+        composite = sieve_window(base, 300)
+        for k in range(300):
+            n = base + 2 * k
+            assert bool(composite[k]) == any(n % p == 0 and n != p for p in SIEVE_PRIMES)
+
+def test_sieve_window_keeps_small_primes():
+    composite = sieve_window(3, 100)
+    assert all(not composite[(p - 3) // 2] for p in range(3, 203) if is_prime(p))
+
+def test_find_prime_bit_length():
+    for bits in (16, 24, 32):
+        p = find_prime(bits, verbose=False)
+        assert p.bit_length() == bits and is_prime(p)
+
+def test_find_prime_small_bit_lengths():
+    assert find_prime(3) in (5, 7)
+    for bits in (0, 1, 2):
+        with pytest.raises(ValueError):
+            find_prime(bits)
+
+def test_miller_rabin_small_numbers():
+    assert [n for n in range(40) if miller_rabin_test(n, 10)] == [n for n in range(40) if is_prime(n)]
+
+def test_find_prime_output_only_when_verbose(capsys):
+    find_prime(64)
+    assert capsys.readouterr().out == ''
+    find_prime(64, verbose=True)
+    assert len(capsys.readouterr().out.splitlines()) == 1
@@ -0,0 +1,82 @@
+import random
+from collections import Counter
+
+import pytest
+
+import arithmetic_backend as arith
+import exponentiation
+
+def operands(seed=0):
+    #Показники різної довжини, зокрема 0, 1 і степені двійки; модуль 1 і парні модулі
+    rng = random.Random(seed)
+    cases = [(5, 0, 7), (5, 1, 7), (0, 5, 7), (-3, 5, 7), (5, 3, 1), (3, 1 << 100, 1000), (7, (1 << 64) - 1, 1 << 61)]
+    for bits in [2, 8, 25, 81, 300, 1024, 2048]:
+        for _ in range(5):
+            m = rng.getrandbits(bits) | (1 << (bits - 1))
+            cases.append((rng.randrange(m), rng.getrandbits(bits), m))
+    return cases
+
+def test_window_size_grows_with_exponent():
+    sizes = [exponentiation.window_size(bits) for bits in range(0, 4000, 7)]
+    assert sizes == sorted(sizes)
+    assert sizes[0] == 1 and sizes[-1] == 7
+
+@pytest.mark.parametrize('k', [None, 1, 2, 3, 5])
+def test_kary_and_sliding_window_match_pow(k):
+    for x, a, m in operands():
+        assert exponentiation.kary_pow(x, a, m, k) == pow(x, a, m)
+        assert exponentiation.sliding_window_pow(x, a, m, k) == pow(x, a, m)
+
+@pytest.mark.parametrize('k', [1, 2, 4, 7])
+def test_sliding_windows_reconstruct_exponent(k):
+    rng = random.Random(k)
+    for a in [0, 1, 2, 0b1011, (1 << 100) + 1] + [rng.getrandbits(300) for _ in range(20)]:
+        rebuilt = 0
+        for squarings, value in exponentiation.sliding_windows(a, k):
+            assert value == 0 or (value & 1 and value.bit_length() <= k)
+            rebuilt = (rebuilt << squarings) + value
+        assert rebuilt == a
+
+def test_kary_multiplication_count():
+    #k = 1 - двійковий метод без квадрата перед старшим бітом: 1011 -> 3 квадрати і 2 множення
+    counter = Counter()
+    exponentiation.kary_pow(3, 0b1011, 1000, k=1, counter=counter)
+    assert counter['multiplications'] == 5
+
+def test_sliding_window_saves_multiplications():
+    rng = random.Random(1)
+    m = rng.getrandbits(2048) | 1
+    x, a = rng.randrange(m), rng.getrandbits(2048) | (1 << 2047)
+    reference = arith.get_backend('reference')
+    reference.powmod(x, a, m)
+    counter = Counter()
+    assert exponentiation.sliding_window_pow(x, a, m, counter=counter) == pow(x, a, m)
+    assert counter['multiplications'] < 0.8 * reference.counters['multiplications']
+
+def test_fixed_exponent_matches_pow():
+    for x, a, m in operands(1):
+        power = exponentiation.FixedExponentPower(a, m)
+        for base in [x, x + 1, 0, m - 1]:
+            assert power(base) == pow(base, a, m)
+    #Показник 65537 = 2^16 + 1: таблиця з однієї основи, лише квадрати і одне множення
+    counter = Counter()
+    power = exponentiation.FixedExponentPower(65537, 1000003)
+    assert power.table_size == 1
+    assert power(7, counter) == pow(7, 65537, 1000003)
+    assert counter['multiplications'] == 17
+
+@pytest.mark.parametrize('k', [None, 1, 3, 6])
+def test_fixed_base_matches_pow(k):
+    rng = random.Random(2)
+    m = rng.getrandbits(1024) | 1
+    g = rng.randrange(2, m)
+    power = exponentiation.FixedBasePower(g, m, 1024, k)
+    for a in [0, 1, 2, (1 << 1024) - 1] + [rng.getrandbits(bits) for bits in (10, 500, 1024) for _ in range(5)]:
+        counter = Counter()
+        assert power(a, counter) == pow(g, a, m)
+        #Без піднесень до квадрата: не більше одного множення на цифру і двох на значення цифри
+        mask = (1 << power.k) - 1
+        assert counter['multiplications'] <= -(-1024 // power.k) + 2 * mask
+    with pytest.raises(ValueError):
+        power(1 << 1024)
+    assert exponentiation.FixedBasePower(g, 1, 16, k)(5) == 0
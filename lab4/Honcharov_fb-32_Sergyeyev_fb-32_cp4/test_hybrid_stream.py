@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import hybrid_stream
+from crypto_utils import find_prime
+from rsa_core import build_key_pair
+
+@pytest.fixture(scope='module')
+def keys():
+    #Пари впорядковані за n: протокол SendKey вимагає n_A <= n_B
+    return sorted((build_key_pair(find_prime(256), find_prime(256)) for _ in range(2)), key=lambda pair: pair[0][0])
+
+def header_size(package):
+    #MAGIC, два числа з 2-байтовою довжиною, nonce і розмір частини
+    offset = len(hybrid_stream.MAGIC)
+    for _ in range(2):
+        offset += 2 + int.from_bytes(package[offset:offset + 2], 'big')
+    return offset + hybrid_stream.NONCE_SIZE + 4
+
+@pytest.mark.parametrize('size', [0, 1, 31, 32, 33, 1000, 65536 + 7])
+@pytest.mark.parametrize('chunk_size', [1, 5, 32, 1000, hybrid_stream.CHUNK_SIZE])
+def test_round_trip(keys, size, chunk_size):
+    (public_a, private_a), (public_b, private_b) = keys
+    data = os.urandom(size)
+    package = hybrid_stream.encrypt_bytes(data, private_a, public_b, chunk_size)
+    assert len(package) == header_size(package) + size + hybrid_stream.TAG_SIZE
+    assert hybrid_stream.decrypt_bytes(package, private_b, public_a) == data
+
+def test_tampering_is_detected(keys):
+    (public_a, private_a), (public_b, private_b) = keys
+    package = hybrid_stream.encrypt_bytes(os.urandom(300), private_a, public_b, 64)
+    for position in [header_size(package), len(package) - hybrid_stream.TAG_SIZE - 1, len(package) - 1]:
+        tampered = bytearray(package)
+        tampered[position] ^= 1
+        with pytest.raises(ValueError):
+            hybrid_stream.decrypt_bytes(bytes(tampered), private_b, public_a)
+    with pytest.raises(ValueError):
+        hybrid_stream.decrypt_bytes(package[:-1], private_b, public_a)
+
+def test_wrong_sender_is_rejected(keys):
+    (public_a, private_a), (public_b, private_b) = keys
+    package = hybrid_stream.encrypt_bytes(b'data', private_a, public_b)
+    with pytest.raises(ValueError):
+        hybrid_stream.decrypt_bytes(package, private_b, public_b)
+
+def test_header_chunk_size_is_bounded(keys):
+    (public_a, private_a), (public_b, private_b) = keys
+    package = hybrid_stream.encrypt_bytes(b'data', private_a, public_b)
+    offset = header_size(package) - 4
+    forged = package[:offset] + (hybrid_stream.MAX_CHUNK_SIZE + 1).to_bytes(4, 'big') + package[offset + 4:]
+    with pytest.raises(ValueError, match='розмір частини'):
+        hybrid_stream.decrypt_bytes(forged, private_b, public_a)
+    with pytest.raises(ValueError):
+        hybrid_stream.encrypt_bytes(b'data', private_a, public_b, 0)
+
+def test_sender_modulus_must_not_exceed_recipient(keys):
+    (public_a, private_a), (public_b, private_b) = keys
+    with pytest.raises(ValueError):
+        hybrid_stream.encrypt_bytes(b'data', private_b, public_a)
+
+def test_decrypt_file_removes_output_on_failure(keys, tmp_path):
+    (public_a, private_a), (public_b, private_b) = keys
+    source, encrypted, decrypted = tmp_path / 'plain', tmp_path / 'enc', tmp_path / 'dec'
+    source.write_bytes(os.urandom(200000))
+    hybrid_stream.encrypt_file(source, encrypted, private_a, public_b)
+    hybrid_stream.decrypt_file(encrypted, decrypted, private_b, public_a)
+    assert decrypted.read_bytes() == source.read_bytes()
+    encrypted.write_bytes(encrypted.read_bytes()[:-1] + b'\0')
+    with pytest.raises(ValueError):
+        hybrid_stream.decrypt_file(encrypted, decrypted, private_b, public_a)
+    assert not decrypted.exists()
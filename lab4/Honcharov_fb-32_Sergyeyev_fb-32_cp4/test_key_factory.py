@@ -0,0 +1,55 @@
+import math
+import time
+
+import pytest
+
+from key_factory import KeyFactory
+
+def check_key_pair(key_pair, bits):
+    (n, e), private_key = key_pair
+    d, p, q = private_key
+    assert n == p * q and p != q
+    assert p.bit_length() == q.bit_length() == bits
+    assert e * d % math.lcm(p - 1, q - 1) == 1
+
+def test_take_returns_valid_pairs():
+    with KeyFactory(pool_size=2, processes=1) as factory:
+        for _ in range(3):
+            check_key_pair(factory.take(64, timeout=60), 64)
+
+def test_take_ordered_sorts_by_modulus():
+    with KeyFactory(pool_size=3, processes=1) as factory:
+        key_pairs = factory.take_ordered(64, count=3, timeout=60)
+    moduli = [public_key[0] for public_key, _ in key_pairs]
+    assert moduli == sorted(moduli)
+
+def test_take_min_modulus_picks_from_pool():
+    with KeyFactory(pool_size=2, processes=1) as factory:
+        factory.take(64, timeout=60)
+        with factory.condition:
+            assert factory.condition.wait_for(lambda: factory.ready[64], timeout=60)
+            smallest = min(public_key[0] for public_key, _ in factory.ready[64])
+        assert factory.take(64, min_modulus=smallest, timeout=60)[0][0] >= smallest
+
+def test_take_min_modulus_does_not_regenerate():
+    with KeyFactory(pool_size=2, processes=1) as factory:
+        #n двох 64-бітних простих менший за 2^128: пул заповнюється, після чого take не чекає вічно
+        with pytest.raises(LookupError):
+            factory.take(64, min_modulus=1 << 128, timeout=60)
+        assert len(factory.ready[64]) == 2
+
+def test_worker_failure_is_raised_and_recovered():
+    with KeyFactory(pool_size=1, processes=1) as factory:
+        #find_prime відхиляє довжину 2 біти: ValueError у воркері
+        with pytest.raises(ValueError):
+            factory.take(2, timeout=60)
+        #Збій однієї довжини не блокує інші
+        check_key_pair(factory.take(64, timeout=60), 64)
+
+def test_close_terminates_running_search():
+    factory = KeyFactory(pool_size=1, processes=1)
+    factory.prefill(4096)
+    time.sleep(0.5)
+    start = time.monotonic()
+    factory.close()
+    assert time.monotonic() - start < 10
@@ -0,0 +1,67 @@
+import math
+import random
+
+import pytest
+
+import arithmetic_backend as arith
+import crypto_utils
+import number_theory
+
+def fibonacci_pair(count):
+    #Сусідні числа Фібоначчі - найдовший ланцюг ділень для алгоритму Евкліда
+    a, b = 1, 1
+    for _ in range(count):
+        a, b = b, a + b
+    return b, a
+
+def check_bezout(a, b):
+    x, y, g = number_theory.extended_gcd(a, b)
+    assert g == math.gcd(a, b)
+    assert a * x + b * y == g
+
+@pytest.mark.parametrize('bits', [8, 64, 512, number_theory.LEHMER_MIN_BITS + 500])
+def test_extended_gcd_bezout(bits):
+    rng = random.Random(bits)
+    for _ in range(30):
+        a, b = rng.getrandbits(bits), rng.getrandbits(bits)
+        common = rng.getrandbits(bits // 4 + 1)
+        check_bezout(a, b)
+        check_bezout(b, a)
+        check_bezout(a * common, b * common)
+
+def test_extended_gcd_edge_cases():
+    for a, b in [(0, 0), (0, 7), (7, 0), (1, 1), (12, 12), (1, 10 ** 4000), (2 ** 4000, 2 ** 3999)]:
+        check_bezout(a, b)
+
+def test_extended_gcd_has_no_recursion_limit():
+    #Вхід, на якому рекурсивна версія перевищувала б глибину стеку
+    a, b = fibonacci_pair(5000)
+    check_bezout(a, b)
+    x, y, g = crypto_utils.extended_euclidean_algorithm(a, b)
+    assert (a * x + b * y, g) == (1, 1)
+
+def test_inverse_matches_pow():
+    rng = random.Random(1)
+    for bits in [16, 256, 4000]:
+        m = rng.getrandbits(bits) | 1
+        for _ in range(20):
+            a = rng.randrange(-m, 2 * m)
+            if math.gcd(a, m) == 1:
+                assert number_theory.inverse(a, m) == pow(a, -1, m)
+    with pytest.raises(ValueError):
+        number_theory.inverse(6, 9)
+
+def test_batch_inverse_matches_pow():
+    rng = random.Random(2)
+    m = rng.getrandbits(1024) | 1
+    values = [a for a in (rng.randrange(1, m) for _ in range(50)) if math.gcd(a, m) == 1]
+    expected = [pow(a, -1, m) for a in values]
+    assert number_theory.batch_inverse(values, m) == expected
+    assert number_theory.batch_inverse(iter(values), m) == expected
+    assert arith.batch_invert(values, m) == expected
+    assert number_theory.batch_inverse(values[:1], m) == expected[:1]
+    assert number_theory.batch_inverse([], m) == []
+
+def test_batch_inverse_rejects_non_invertible():
+    with pytest.raises(ValueError):
+        number_theory.batch_inverse([2, 3, 5], 9)
@@ -0,0 +1,42 @@
+import random
+
+from crypto_utils import find_prime, hash_function
+from rsa_core import CRTPrivateKey, build_key_pair, crt_power, Decrypt, Encrypt, Sign, Verify, SendKey, ReceiveKey
+
+def make_keys(bits=256):
+    #n довший за 256 біт SHA-256, інакше хеш не поміщається в модуль
+    return build_key_pair(find_prime(bits, verbose=False), find_prime(bits, verbose=False))
+
+def test_crt_matches_plain_power():
+    (n, e), private_key = make_keys()
+    d, p, q = private_key
+    for _ in range(50):
+        x = random.randrange(n)
+        assert crt_power(x, private_key) == pow(x, d, n)
+        #Звичайний кортеж (d, p, q) теж приймається
+        assert crt_power(x, (d, p, q)) == pow(x, d, n)
+
+def test_decrypt_and_sign_match_pow():
+    (n, e), private_key = make_keys()
+    d = private_key.d
+    for _ in range(20):
+        m = random.randrange(n)
+        c = Encrypt(m, (n, e))
+        assert c == pow(m, e, n)
+        assert Decrypt(c, private_key) == m == pow(c, d, n)
+    message = "aboba"
+    signature = Sign(message, private_key)
+    assert signature == pow(hash_function(message), d, n)
+    assert Verify(message, signature, (n, e))
+    assert not Verify(message, signature + 1, (n, e))
+
+def test_crt_key_unpacks_as_tuple():
+    key = CRTPrivateKey(7, 11, 13)
+    assert tuple(key) == (7, 11, 13)
+    assert key.n == 143 and key.dp == 7 % 10 and key.dq == 7 % 12
+    assert key.qinv * 13 % 11 == 1
+
+def test_send_receive_key():
+    (public_a, private_a), (public_b, private_b) = sorted((make_keys(), make_keys()), key=lambda pair: pair[0][0])
+    k = random.randrange(1, public_a[0])
+    assert ReceiveKey(SendKey(k, private_a, public_b), private_b, public_a) == (k, True)
@@ -7,10 +7,97 @@ import random
 from primality_tests import is_prime
 
 
+# Межа для малих простих, якими просіюється вікно кандидатів
+SIEVE_LIMIT = 1 << 16
+
+
+def sieve_primes(limit: int) -> list[int]:
+    """
+    Решето Ератосфена: усі непарні прості, менші за limit
+    
+    Args:
+        limit: верхня межа (не включно)
+    
+    Returns:
+        Список непарних простих чисел
+    """
+    is_composite = bytearray(limit)
+    primes = []
+    for number in range(3, limit, 2):
+        if not is_composite[number]:
+            primes.append(number)
+            is_composite[number * number::2 * number] = b"\x01" * len(range(number * number, limit, 2 * number))
+    return primes
+
+
+SIEVE_PRIMES = sieve_primes(SIEVE_LIMIT)
+
+
+def sieve_window(base: int, window: int) -> bytearray:
+    """
+    Просіювання вікна кандидатів base + 2k, k = 0..window-1
+    
+    Args:
+        base: непарна основа вікна
+        window: кількість кандидатів у вікні
+    
+    Returns:
+        bytearray: composite[k] = 1, якщо кандидат кратний малому простому
+    """
+    composite = bytearray(window)
+    ones = b"\x01" * window
+    for prime in SIEVE_PRIMES:
+        # base + 2k ≡ 0 (mod p)  =>  k ≡ -base * 2^(-1) (mod p); саме мале просте не відсіюється
+        k = (-(base % prime) * ((prime + 1) // 2)) % prime
+        if base + 2 * k == prime:
+            k += prime
+        if k < window:
+            composite[k::prime] = ones[:(window - 1 - k) // prime + 1]
+    return composite
+
+
+def search_prime_from(base: int, test_type: str = "miller_rabin", upper_bound: int | None = None) -> int | None:
+    """
+    Інкрементний пошук простого числа починаючи з base
+    
+    Кандидати base, base + 2, base + 4, ... просіюються вікнами, а
+    імовірнісний тест запускається лише для тих, що пройшли решето.
+    
+    Args:
+        base: початкове число
+        test_type: тип тесту простоти
+        upper_bound: якщо задано, пошук зупиняється на цій межі (не включно)
+    
+    Returns:
+        Найменше просте >= base, або None якщо його немає до upper_bound
+    """
+    if base <= 2:
+        return 2 if upper_bound is None or upper_bound > 2 else None
+    if base % 2 == 0:
+        base += 1
+    window = max(256, 2 * base.bit_length())
+    
+    while upper_bound is None or base < upper_bound:
+        composite = sieve_window(base, window)
+        for k in range(window):
+            if composite[k]:
+                continue
+            candidate = base + 2 * k
+            if upper_bound is not None and candidate >= upper_bound:
+                return None
+            if is_prime(candidate, test_type):
+                return candidate
+        base += 2 * window
+    return None
+
+
 def generate_random_prime(bit_length: int, test_type: str = "miller_rabin") -> int:
     """
     Генерація випадкового простого числа заданої довжини
     
+    Обирається одна випадкова непарна основа, далі вікно кандидатів
+    просіюється малими простими (див. search_prime_from).
+    
     Args:
         bit_length: довжина числа в бітах (мінімум 8)
         test_type: тип тесту простоти
@@ -22,15 +109,12 @@ def generate_random_prime(bit_length: int, test_type: str = "miller_rabin") -> i
         raise ValueError("Довжина має бути мінімум 8 біт")
     
     while True:
-        # Генеруємо випадкове число потрібної довжини
-        candidate = random.randrange(2**(bit_length - 1), 2**bit_length)
+        # Генеруємо випадкову непарну основу потрібної довжини
+        base = random.randrange(2**(bit_length - 1), 2**bit_length) | 1
         
-        # Робимо непарним
-        if candidate % 2 == 0:
-            candidate += 1
-        
-        # Перевіряємо на простоту
-        if is_prime(candidate, test_type):
+        # Шукаємо просте, не виходячи за межі bit_length біт
+        candidate = search_prime_from(base, test_type, upper_bound=2**bit_length)
+        if candidate is not None:
             return candidate
 
 
@@ -108,9 +192,4 @@ def find_next_prime(start: int, test_type: str = "miller_rabin") -> int:
     Returns:
         Найменше просте >= start
     """
-    candidate = start if start % 2 == 1 else start + 1
-    
-    while True:
-        if is_prime(candidate, test_type):
-            return candidate
-        candidate += 2
+    return search_prime_from(start, test_type)
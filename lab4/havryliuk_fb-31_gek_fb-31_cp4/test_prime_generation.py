@@ -0,0 +1,29 @@
+from prime_generation import SIEVE_PRIMES, find_next_prime, generate_random_prime, sieve_primes, sieve_window
+
+
+def is_prime(n: int) -> bool:
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+
+def test_sieve_primes_brute_force():
+    assert sieve_primes(2000) == [p for p in range(3, 2000) if is_prime(p)]
+
+
+def test_sieve_window_matches_divisibility():
+    base = (1 << 30) + 1
+    composite = sieve_window(base, 500)
+    for k in range(500):
+        n = base + 2 * k
+        assert bool(composite[k]) == any(n % p == 0 for p in SIEVE_PRIMES)
+
+
+def test_find_next_prime_brute_force():
+    for start in [0, 1, 2, 3, 4, 90, 1000, 7919, 65520, 65537, 100000]:
+        expected = next(n for n in range(max(start, 2), start + 1000) if is_prime(n))
+        assert find_next_prime(start) == expected
+
+
+def test_generate_random_prime_bit_length():
+    for bits in (16, 24, 32):
+        p = generate_random_prime(bits)
+        assert p.bit_length() == bits and is_prime(p)
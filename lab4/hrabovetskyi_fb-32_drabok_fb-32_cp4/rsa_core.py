@@ -2,6 +2,34 @@ import random
 from rsa_math import generate_prime, extended_gcd, mod_inverse
 
 
+class CRTPrivateKey:
+    """Закритий ключ (d, p, q) з передобчисленими dp, dq, qinv для КТЛ."""
+
+    def __init__(self, d, p, q):
+        self.d = d
+        self.p = p
+        self.q = q
+        self.n = p * q
+        self.dp = d % (p - 1)
+        self.dq = d % (q - 1)
+        self.qinv = mod_inverse(q, p)
+
+    def __iter__(self):
+        """Розпакування як звичайного кортежу (d, p, q)."""
+        return iter((self.d, self.p, self.q))
+
+
+def crt_power(x, private_key_full):
+    """x^d mod n через КТЛ з рекомбінацією Гарнера."""
+    key = private_key_full
+    if not isinstance(key, CRTPrivateKey):
+        key = CRTPrivateKey(*key)
+    m1 = pow(x, key.dp, key.p)
+    m2 = pow(x, key.dq, key.q)
+    h = (key.qinv * (m1 - m2)) % key.p
+    return m2 + h * key.q
+
+
 def GenerateKeyPair(bits=256):
     """
     Генерація ключових пар для RSA.
@@ -21,7 +49,7 @@ def GenerateKeyPair(bits=256):
 
     d = mod_inverse(e, phi)
 
-    return ((d, p, q), (n, e))
+    return (CRTPrivateKey(d, p, q), (n, e))
 
 
 def Encrypt(message, public_key):
@@ -33,17 +61,13 @@ def Encrypt(message, public_key):
 
 
 def Decrypt(ciphertext, private_key_full):
-    """Розшифрування: M = C^d mod n"""
-    d, p, q = private_key_full
-    n = p * q
-    return pow(ciphertext, d, n)
+    """Розшифрування: M = C^d mod n (через КТЛ)"""
+    return crt_power(ciphertext, private_key_full)
 
 
 def Sign(message, private_key_full):
-    """Цифровий підпис: S = M^d mod n"""
-    d, p, q = private_key_full
-    n = p * q
-    return pow(message, d, n)
+    """Цифровий підпис: S = M^d mod n (через КТЛ)"""
+    return crt_power(message, private_key_full)
 
 
 def Verify(message, signature, public_key):
@@ -1,12 +1,14 @@
 import random
 
 def extended_gcd(a, b):
-    """Розширений алгоритм Евкліда."""
-    if a == 0:
-        return b, 0, 1
-    else:
-        gcd, x, y = extended_gcd(b % a, a)
-        return gcd, y - (b // a) * x, x
+    """Розширений алгоритм Евкліда (ітеративний, без рекурсії)."""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
 
 
 def mod_inverse(a, m):
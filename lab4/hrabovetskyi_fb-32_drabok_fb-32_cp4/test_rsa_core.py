@@ -0,0 +1,50 @@
+import math
+import random
+
+from rsa_core import CRTPrivateKey, GenerateKeyPair, crt_power, Decrypt, Encrypt, Sign, Verify
+from rsa_math import extended_gcd, mod_inverse
+
+
+def test_crt_matches_plain_power():
+    private_key, (n, e) = GenerateKeyPair(128)
+    d, p, q = private_key
+    for _ in range(50):
+        x = random.randrange(n)
+        assert crt_power(x, private_key) == pow(x, d, n)
+        assert crt_power(x, (d, p, q)) == pow(x, d, n)
+
+
+def test_decrypt_and_sign_match_pow():
+    private_key, (n, e) = GenerateKeyPair(128)
+    d = private_key.d
+    for _ in range(20):
+        m = random.randrange(n)
+        assert Decrypt(Encrypt(m, (n, e)), private_key) == m
+        signature = Sign(m, private_key)
+        assert signature == pow(m, d, n)
+        assert Verify(m, signature, (n, e))
+
+
+def test_crt_key_unpacks_as_tuple():
+    key = CRTPrivateKey(7, 11, 13)
+    assert tuple(key) == (7, 11, 13)
+    assert key.qinv * 13 % 11 == 1
+
+
+def test_extended_gcd_matches_math_gcd():
+    rng = random.Random(4)
+    pairs = [(0, 0), (0, 5), (5, 0), (12, 18)]
+    pairs += [(rng.getrandbits(bits), rng.getrandbits(bits)) for bits in (8, 256, 2048) for _ in range(20)]
+    # Сусідні числа Фібоначчі: рекурсивна версія перевищувала б глибину стеку
+    a, b = 1, 1
+    for _ in range(5000):
+        a, b = b, a + b
+    pairs.append((b, a))
+    for a, b in pairs:
+        g, x, y = extended_gcd(a, b)
+        assert g == math.gcd(a, b)
+        assert a * x + b * y == g
+    m = rng.getrandbits(512) | 1
+    for a in (rng.randrange(1, m) for _ in range(20)):
+        if math.gcd(a, m) == 1:
+            assert mod_inverse(a, m) == pow(a, -1, m)
@@ -15,10 +15,14 @@ def display_data(label, value):
 # Розширений алгоритм Евкліда
 # ------------------------------------------------------------
 def extended_gcd(a_val, b_val):
-    if a_val == 0:
-        return b_val, 0, 1
-    gcd_val, x1_val, y1_val = extended_gcd(b_val % a_val, a_val)
-    return gcd_val, y1_val - (b_val // a_val) * x1_val, x1_val
+    # Ітеративний варіант: a_val * x + b_val * y = gcd без рекурсії
+    x0_val, y0_val, x1_val, y1_val = 1, 0, 0, 1
+    while b_val:
+        quotient = a_val // b_val
+        a_val, b_val = b_val, a_val - quotient * b_val
+        x0_val, x1_val = x1_val, x0_val - quotient * x1_val
+        y0_val, y1_val = y1_val, y0_val - quotient * y1_val
+    return a_val, x0_val, y0_val
 
 
 # ------------------------------------------------------------
@@ -75,22 +79,67 @@ def check_prime(n_val, test_rounds=40):
     return True
 
 
+# ------------------------------------------------------------
+# Решето Ератосфена: усі непарні прості, менші за limit
+# ------------------------------------------------------------
+# Межа для малих простих, якими просіюється вікно кандидатів
+SIEVE_LIMIT = 1 << 16
+
+
+def sieve_primes(limit):
+    is_composite = bytearray(limit)
+    primes_list = []
+    for p_val in range(3, limit, 2):
+        if not is_composite[p_val]:
+            primes_list.append(p_val)
+            is_composite[p_val * p_val::2 * p_val] = b"\x01" * len(range(p_val * p_val, limit, 2 * p_val))
+    return primes_list
+
+
+SIEVE_PRIMES = sieve_primes(SIEVE_LIMIT)
+
+
+# ------------------------------------------------------------
+# Просіювання вікна кандидатів base + 2k, k = 0..window-1
+# ------------------------------------------------------------
+def sieve_window(base, window):
+    # composite[k] = 1, якщо кандидат кратний малому простому
+    composite = bytearray(window)
+    ones = b"\x01" * window
+    for p_val in SIEVE_PRIMES:
+        # base + 2k ≡ 0 (mod p)  =>  k ≡ -base * 2^(-1) (mod p); саме мале просте не відсіюється
+        k_start = (-(base % p_val) * ((p_val + 1) // 2)) % p_val
+        if base + 2 * k_start == p_val:
+            k_start += p_val
+        if k_start < window:
+            composite[k_start::p_val] = ones[:(window - 1 - k_start) // p_val + 1]
+    return composite
+
+
 # ------------------------------------------------------------
 # Генерація простого числа заданої довжини
 # ------------------------------------------------------------
 def generate_prime_number(bit_length):
-    # Невеликий набір малих простих для попереднього відсіву кандидатів
-    small_primes = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    # Одна випадкова непарна основа; вікно кандидатів просіюється одразу,
+    # а тест Міллера-Рабіна запускається лише для кандидатів, що вижили
+    window_size = max(256, 2 * bit_length)
+    upper_bound = 1 << bit_length
     while True:
-        candidate = random.getrandbits(bit_length)
+        base_val = random.getrandbits(bit_length)
         # Забезпечуємо старший біт = 1 (довжина в бітах) і непарність
-        candidate |= (1 << (bit_length - 1)) | 1
-
-        if any(candidate % p == 0 for p in small_primes):
-            continue
+        base_val |= (1 << (bit_length - 1)) | 1
 
-        if check_prime(candidate):
-            return candidate
+        while base_val < upper_bound:
+            composite = sieve_window(base_val, window_size)
+            for k_val in range(window_size):
+                if composite[k_val]:
+                    continue
+                candidate = base_val + 2 * k_val
+                if candidate >= upper_bound:
+                    break
+                if check_prime(candidate):
+                    return candidate
+            base_val += 2 * window_size
 
 
 # ------------------------------------------------------------
@@ -159,6 +208,36 @@ def number_to_text(num_val):
         return "[неможливо конвертувати в текст]"
 
 
+# ------------------------------------------------------------
+# Закритий ключ з передобчисленими параметрами КТЛ
+# ------------------------------------------------------------
+class CRTPrivateKey:
+    def __init__(self, private_exp, prime_p, prime_q):
+        self.d = private_exp
+        self.p = prime_p
+        self.q = prime_q
+        # dp = d mod (p-1), dq = d mod (q-1), qinv = q^(-1) mod p обчислюються один раз
+        self.dp = private_exp % (prime_p - 1)
+        self.dq = private_exp % (prime_q - 1)
+        self.qinv = modular_inverse(prime_q, prime_p)
+
+    # Розпаковується як кортеж: exp_d, prime_p, prime_q = private_key
+    def __iter__(self):
+        return iter((self.d, self.p, self.q))
+
+
+# ------------------------------------------------------------
+# Піднесення до степеня d через КТЛ (рекомбінація Гарнера)
+# ------------------------------------------------------------
+def crt_power_mod(number, private_key):
+    if not isinstance(private_key, CRTPrivateKey):
+        private_key = CRTPrivateKey(*private_key)
+    m_p = power_mod(number, private_key.dp, private_key.p)
+    m_q = power_mod(number, private_key.dq, private_key.q)
+    h_val = (private_key.qinv * (m_p - m_q)) % private_key.p
+    return m_q + h_val * private_key.q
+
+
 # ------------------------------------------------------------
 # Генерація ключової пари RSA
 # ------------------------------------------------------------
@@ -181,7 +260,7 @@ def GenerateKeyPair(bit_size=256):
         public_exp = random.randrange(3, euler_phi - 1, 2)
 
     private_exp = modular_inverse(public_exp, euler_phi)
-    return (public_exp, modulus_n), (private_exp, prime_p, prime_q)
+    return (public_exp, modulus_n), CRTPrivateKey(private_exp, prime_p, prime_q)
 
 
 # ------------------------------------------------------------
@@ -195,13 +274,11 @@ def Encrypt(number, public_key):
 
 
 def Decrypt(cipher_number, private_key):
-    exp_d, prime_p, prime_q = private_key
-    return power_mod(cipher_number, exp_d, prime_p * prime_q)
+    return crt_power_mod(cipher_number, private_key)
 
 
 def Sign(number, private_key):
-    exp_d, prime_p, prime_q = private_key
-    return power_mod(number, exp_d, prime_p * prime_q)
+    return crt_power_mod(number, private_key)
 
 
 def Verify(number, signature_value, public_key):
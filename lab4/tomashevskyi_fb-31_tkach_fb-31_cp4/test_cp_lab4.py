@@ -0,0 +1,46 @@
+import math
+import random
+
+from cp_lab4 import CRTPrivateKey, GenerateKeyPair, crt_power_mod, Decrypt, Encrypt, Sign, Verify, extended_gcd, modular_inverse
+
+
+def test_crt_matches_plain_power():
+    (e, n), private_key = GenerateKeyPair(128)
+    d, p, q = private_key
+    for _ in range(50):
+        x = random.randrange(n)
+        assert crt_power_mod(x, private_key) == pow(x, d, n)
+        assert crt_power_mod(x, (d, p, q)) == pow(x, d, n)
+
+
+def test_decrypt_and_sign_match_pow():
+    (e, n), private_key = GenerateKeyPair(128)
+    for _ in range(20):
+        m = random.randrange(n)
+        assert Decrypt(Encrypt(m, (e, n)), private_key) == m
+        signature = Sign(m, private_key)
+        assert signature == pow(m, private_key.d, n)
+        assert Verify(m, signature, (e, n))
+
+
+def test_crt_key_unpacks_as_tuple():
+    assert tuple(CRTPrivateKey(7, 11, 13)) == (7, 11, 13)
+
+
+def test_extended_gcd_matches_math_gcd():
+    generator = random.Random(4)
+    pairs = [(0, 0), (0, 5), (5, 0), (12, 18)]
+    pairs += [(generator.getrandbits(bits), generator.getrandbits(bits)) for bits in (8, 256, 2048) for _ in range(20)]
+    # Сусідні числа Фібоначчі: рекурсивна версія перевищувала б глибину стеку
+    a_val, b_val = 1, 1
+    for _ in range(5000):
+        a_val, b_val = b_val, a_val + b_val
+    pairs.append((b_val, a_val))
+    for a_val, b_val in pairs:
+        gcd_val, x_val, y_val = extended_gcd(a_val, b_val)
+        assert gcd_val == math.gcd(a_val, b_val)
+        assert a_val * x_val + b_val * y_val == gcd_val
+    modulus = generator.getrandbits(512) | 1
+    for a_val in (generator.randrange(1, modulus) for _ in range(20)):
+        if math.gcd(a_val, modulus) == 1:
+            assert modular_inverse(a_val, modulus) == pow(a_val, -1, modulus)
@@ -0,0 +1,23 @@
+from cp_lab4 import SIEVE_PRIMES, generate_prime_number, sieve_primes, sieve_window
+
+
+def is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+
+def test_sieve_primes_brute_force():
+    assert sieve_primes(2000) == [p for p in range(3, 2000) if is_prime(p)]
+
+
+def test_sieve_window_matches_divisibility():
+    base = (1 << 30) + 1
+    composite = sieve_window(base, 500)
+    for k in range(500):
+        n = base + 2 * k
+        assert bool(composite[k]) == any(n % p == 0 for p in SIEVE_PRIMES)
+
+
+def test_generate_prime_number_bit_length():
+    for bits in (16, 24, 32):
+        p = generate_prime_number(bits)
+        assert p.bit_length() == bits and is_prime(p)
@@ -0,0 +1,27 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip("requests")
+
+from web import extended_gcd, mod_inverse
+
+
+def test_extended_gcd_matches_math_gcd():
+    rng = random.Random(4)
+    pairs = [(0, 0), (0, 5), (5, 0), (12, 18)]
+    pairs += [(rng.getrandbits(bits), rng.getrandbits(bits)) for bits in (8, 256, 2048) for _ in range(20)]
+    # Сусідні числа Фібоначчі: рекурсивна версія перевищувала б глибину стеку
+    a, b = 1, 1
+    for _ in range(5000):
+        a, b = b, a + b
+    pairs.append((b, a))
+    for a, b in pairs:
+        g, x, y = extended_gcd(a, b)
+        assert g == math.gcd(a, b)
+        assert a * x + b * y == g
+    m = rng.getrandbits(512) | 1
+    for a in (rng.randrange(1, m) for _ in range(20)):
+        if math.gcd(a, m) == 1:
+            assert mod_inverse(a, m) == pow(a, -1, m)
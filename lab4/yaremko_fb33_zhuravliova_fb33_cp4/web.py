@@ -13,10 +13,13 @@ def power_mod(a, b, n):
     return pow(a, b, n)
 
 def extended_gcd(a, b):
-    if a == 0:
-        return (b, 0, 1)
-    g, x1, y1 = extended_gcd(b % a, a)
-    return (g, y1 - (b // a) * x1, x1)
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return (a, x0, y0)
 
 def mod_inverse(a, m):
     g, x, _ = extended_gcd(a, m)